@@ -0,0 +1,96 @@
+"""Server memory per connection with pooled versus per-connection receive buffers.
+
+Opens ``--connections`` connections to an in-process AsyncTCPServer and
+reports the memory traced (tracemalloc) per connection once they are
+idle, while every connection holds a partial record, and after each has
+finished an echo round trip. The pooled numbers include the buffers the
+pool keeps for reuse, shown separately as ``pool free list``. Then times
+``--records`` echoed records on one connection: checking buffers in and
+out costs throughput on a busy connection, which is why servers only use
+a pool when given one.
+
+Raise ``ulimit -n`` for large runs: each connection takes two descriptors.
+Run with ``python -m benchmarks.buffer_pool --connections 5000``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import socket
+import time
+import tracemalloc
+
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+from python_tls_implementation.tls.buffer_pool import RECORD_BUFFER_SIZE, BufferPool
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+
+
+async def memory(pool: BufferPool | None, connections: int, record: bytes) -> dict[str, float]:
+    server = AsyncTCPServer(port=0, buffer_pool=pool)
+    await server.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    # Plain blocking client sockets: they complete in the listen backlog and cost almost nothing
+    clients = [socket.create_connection((server.host, server.port)) for _ in range(connections)]
+
+    async def settle() -> float:
+        await asyncio.sleep(0.5)
+        gc.collect()
+        return (tracemalloc.get_traced_memory()[0] - baseline) / connections
+
+    result = {'idle': await settle()}
+    for client in clients:
+        client.sendall(record[:100])
+    result['partial'] = await settle()
+    for client in clients:
+        client.sendall(record[100:])
+    await settle()
+    # The echoes are already sitting in the client sockets, so these reads don't block the loop
+    for client in clients:
+        client.recv(len(record), socket.MSG_WAITALL)
+    result['after echo'] = await settle()
+    if pool is not None:
+        result['pool free list'] = pool.free * pool.buffer_size / connections
+    for client in clients:
+        client.close()
+    await server.shutdown(1.0)
+    return result
+
+
+async def echo_rate(pool: BufferPool | None, records: int, record: bytes) -> float:
+    server = AsyncTCPServer(port=0, buffer_pool=pool)
+    await server.start()
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    start = time.perf_counter()
+    batch = 64
+    for _ in range(records // batch):
+        writer.write(record * batch)
+        await reader.readexactly(len(record) * batch)
+    elapsed = time.perf_counter() - start
+    writer.close()
+    await server.shutdown(1.0)
+    return records // batch * batch / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--fragment-size', type=int, default=4096)
+    parser.add_argument('--buffer-size', type=int, default=RECORD_BUFFER_SIZE,
+                        help='pool buffer size; also the most a pooled connection reads per call')
+    args = parser.parse_args()
+
+    record = TLSPlaintext(type=ContentType.application_data, fragment=b'x' * args.fragment_size).to_bytes()
+    for name, make_pool in (('per-connection', lambda: None),
+                            ('pooled', lambda: BufferPool(buffer_size=args.buffer_size))):
+        tracemalloc.start()
+        result = asyncio.run(memory(make_pool(), args.connections, record))
+        tracemalloc.stop()
+        rate = asyncio.run(echo_rate(make_pool(), args.records, record))
+        print(f"{name:<15} bytes/connection: " + '  '.join(f"{phase} {value:>8,.0f}" for phase, value in result.items())
+              + f"  echo {rate:>9,.0f} records/s")
+
+
+if __name__ == '__main__':
+    main()
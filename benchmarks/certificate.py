@@ -0,0 +1,94 @@
+"""Cost and size of the server Certificate message, built per handshake versus cached.
+
+Generates an RSA leaf and intermediate (``--key-size`` bits), then times
+encoding the Certificate message from scratch, compressing it per handshake,
+and looking the ready frame up in a CertificateCache. Also prints the
+message size per compression algorithm (RFC 8879); brotli and zstd only
+show up when their packages are installed.
+
+Run with ``python -m benchmarks.certificate``.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import time
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import Encoding
+from cryptography.x509.oid import NameOID
+
+from python_tls_implementation.tls.handshake.certificate import (
+    AVAILABLE_ALGORITHMS,
+    Certificate,
+    CertificateCache,
+    CertificateEntry,
+    CompressedCertificate,
+)
+
+
+def _certificate(subject: str, issuer: str, key: rsa.RSAPrivateKey, signing_key: rsa.RSAPrivateKey,
+                 ca: bool) -> bytes:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)]))
+        .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)]))
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=90))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    )
+    if not ca:
+        builder = builder.add_extension(
+            x509.SubjectAlternativeName([x509.DNSName(subject), x509.DNSName(f'www.{subject}')]), critical=False)
+    return builder.sign(signing_key, hashes.SHA256()).public_bytes(Encoding.DER)
+
+
+def certificate_chain(key_size: int) -> list[bytes]:
+    root_key, intermediate_key, leaf_key = (
+        rsa.generate_private_key(public_exponent=65537, key_size=key_size) for _ in range(3))
+    return [
+        _certificate('example.com', 'Example Intermediate CA', leaf_key, intermediate_key, ca=False),
+        _certificate('Example Intermediate CA', 'Example Root CA', intermediate_key, root_key, ca=True),
+    ]
+
+
+def per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--key-size', type=int, default=2048)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    chain = certificate_chain(args.key_size)
+    cache = CertificateCache()
+    cached = cache.get(chain)
+    offered = [int(algorithm) for algorithm in AVAILABLE_ALGORITHMS]
+
+    def encode() -> bytes:
+        return Certificate(certificate_list=[CertificateEntry(cert_data=cert) for cert in chain]).to_bytes()
+
+    print(f"Certificate message: {len(cached.frame.to_bytes()):,} bytes")
+    for algorithm, frame in cached.compressed.items():
+        print(f"  {algorithm.name:<7} {len(frame.to_bytes()):>6,} bytes")
+    print(f"{'encode per handshake':<28} {per_call(encode, args.iterations) * 1e6:>8.1f} us")
+    for algorithm in AVAILABLE_ALGORITHMS:
+        body = cached.frame.body
+        elapsed = per_call(lambda: CompressedCertificate.compress(body, algorithm).to_bytes(), args.iterations // 10)
+        print(f"{'encode + ' + algorithm.name + ' per handshake':<28} {elapsed * 1e6:>8.1f} us")
+    elapsed = per_call(lambda: cache.get(chain).frame_for(offered).to_bytes(), args.iterations)
+    print(f"{'cached lookup':<28} {elapsed * 1e6:>8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
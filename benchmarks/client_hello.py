@@ -0,0 +1,84 @@
+"""Eager ClientHello.parse versus the lazy ClientHelloView for a browser-shaped hello.
+
+The lazy case indexes the hello and reads SNI, ALPN, supported_versions and
+key_share, which is what a server needs to pick a configuration.
+
+Run with ``python -m benchmarks.client_hello``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import time
+
+from benchmarks.corpus import vector
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+
+
+def browser_client_hello(server_name: str = 'www.example.com') -> ClientHello:
+    name = server_name.encode('ascii')
+    groups = (0x001d, 0x0017, 0x0018)
+    signature_algorithms = (0x0403, 0x0804, 0x0401, 0x0503, 0x0805, 0x0501, 0x0806, 0x0601)
+    extensions = [
+        (ExtensionType.server_name, vector(b'\x00' + vector(name))),
+        (ExtensionType.status_request, b'\x01\x00\x00\x00\x00'),
+        (ExtensionType.supported_groups, vector(struct.pack(f'!{len(groups)}H', *groups))),
+        (ExtensionType.signature_algorithms,
+         vector(struct.pack(f'!{len(signature_algorithms)}H', *signature_algorithms))),
+        (ExtensionType.application_layer_protocol_negotiation, vector(b'\x02h2\x08http/1.1')),
+        (ExtensionType.signed_certificate_timestamp, b''),
+        (ExtensionType.key_share, vector(struct.pack('!HH', 0x001d, 32) + os.urandom(32))),
+        (ExtensionType.psk_key_exchange_modes, b'\x01\x01'),
+        (ExtensionType.supported_versions, vector(b'\x03\x04\x03\x03', 1)),
+        (ExtensionType.padding, bytes(200)),
+    ]
+    return ClientHello(
+        random_value=os.urandom(32),
+        legacy_session_id=os.urandom(32),
+        cipher_suites=[0x1301, 0x1302, 0x1303, 0xc02b, 0xc02f, 0xc02c, 0xc030, 0xcca9, 0xcca8, 0xc013, 0xc014],
+        extensions=[Extension(extension_type=extension_type, data=data) for extension_type, data in extensions],
+    )
+
+
+def _best_rate(operation, body: bytes, count: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            operation(body)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def eager(body: bytes) -> None:
+    ClientHello.parse(body)
+
+
+def lazy(body: bytes) -> None:
+    view = ClientHelloView(body)
+    view.server_name
+    view.alpn_protocols
+    view.supported_versions
+    view.key_shares
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    body = browser_client_hello()._body_bytes()
+    eager_rate = _best_rate(eager, body, args.count, args.repeat)
+    lazy_rate = _best_rate(lazy, body, args.count, args.repeat)
+    print(f"ClientHello body: {len(body)} bytes")
+    print(f"eager ClientHello.parse: {eager_rate:>12,.0f} hellos/s  {1e6 / eager_rate:6.2f} us")
+    print(f"lazy ClientHelloView:    {lazy_rate:>12,.0f} hellos/s  {1e6 / lazy_rate:6.2f} us")
+    print(f"speedup: {lazy_rate / eager_rate:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
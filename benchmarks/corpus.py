@@ -0,0 +1,136 @@
+"""Deterministic inputs for the codec benchmarks: records of various shapes and browser-shaped ClientHellos.
+
+The hellos follow the extension lists and sizes current Chrome and Firefox
+send (including the 1216-byte X25519MLKEM768 key share). Chrome's carries
+GREASE values (RFC 8701) in the cipher suites, groups, key shares, versions
+and as the first and last extension.
+"""
+from __future__ import annotations
+
+import random
+import struct
+
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSInnerPlaintext, TLSPlaintext
+
+X25519 = 0x001d
+SECP256R1 = 0x0017
+SECP384R1 = 0x0018
+X25519MLKEM768 = 0x11ec
+GREASE = (0x0a0a, 0x3a3a, 0x6a6a, 0xdada)
+
+_random = random.Random(0x7715)
+
+
+def vector(data: bytes, length_size: int = 2) -> bytes:
+    """``data`` prefixed with its length, as in TLS ``opaque x<0..2^N-1>`` vectors."""
+    return len(data).to_bytes(length_size, 'big') + data
+
+
+def _bytes(length: int) -> bytes:
+    return _random.randbytes(length)
+
+
+def _u16_list(values: tuple[int, ...]) -> bytes:
+    return vector(struct.pack(f'!{len(values)}H', *values))
+
+
+def _key_shares(shares: tuple[tuple[int, int], ...]) -> bytes:
+    return vector(b''.join(struct.pack('!HH', group, length) + _bytes(length) for group, length in shares))
+
+
+def _hello(cipher_suites: list[int], extensions: list[tuple[ExtensionType | int, bytes]]) -> ClientHello:
+    return ClientHello(
+        random_value=_bytes(32),
+        legacy_session_id=_bytes(32),
+        cipher_suites=cipher_suites,
+        extensions=[Extension(extension_type=extension_type, data=data) for extension_type, data in extensions],
+    )
+
+
+def chrome_client_hello(server_name: str = 'www.google.com') -> ClientHello:
+    signature_algorithms = (0x0403, 0x0804, 0x0401, 0x0503, 0x0805, 0x0501, 0x0806, 0x0601)
+    return _hello(
+        [GREASE[0], 0x1301, 0x1302, 0x1303, 0xc02b, 0xc02f, 0xc02c, 0xc030, 0xcca9, 0xcca8, 0xc013, 0xc014,
+         0x009c, 0x009d, 0x002f, 0x0035],
+        [
+            (GREASE[1], b''),
+            (ExtensionType.server_name, vector(b'\x00' + vector(server_name.encode('ascii')))),
+            (ExtensionType.extended_master_secret, b''),
+            (ExtensionType.renegotiation_info, b'\x00'),
+            (ExtensionType.supported_groups, _u16_list((GREASE[2], X25519MLKEM768, X25519, SECP256R1, SECP384R1))),
+            (ExtensionType.ec_point_formats, b'\x01\x00'),
+            (ExtensionType.session_ticket, b''),
+            (ExtensionType.application_layer_protocol_negotiation, vector(b'\x02h2\x08http/1.1')),
+            (ExtensionType.status_request, b'\x01\x00\x00\x00\x00'),
+            (ExtensionType.signature_algorithms, _u16_list(signature_algorithms)),
+            (ExtensionType.signed_certificate_timestamp, b''),
+            (ExtensionType.key_share, _key_shares(((GREASE[2], 1), (X25519MLKEM768, 1216), (X25519, 32)))),
+            (ExtensionType.psk_key_exchange_modes, b'\x01\x01'),
+            (ExtensionType.supported_versions, vector(struct.pack('!3H', GREASE[3], 0x0304, 0x0303), 1)),
+            (ExtensionType.compress_certificate, b'\x02\x00\x02'),
+            (GREASE[3], b'\x00'),
+        ],
+    )
+
+
+def firefox_client_hello(server_name: str = 'www.mozilla.org', resumed: bool = False) -> ClientHello:
+    signature_algorithms = (0x0403, 0x0503, 0x0603, 0x0804, 0x0805, 0x0806, 0x0401, 0x0501, 0x0601,
+                            0x0203, 0x0201)
+    extensions = [
+        (ExtensionType.server_name, vector(b'\x00' + vector(server_name.encode('ascii')))),
+        (ExtensionType.extended_master_secret, b''),
+        (ExtensionType.renegotiation_info, b'\x00'),
+        (ExtensionType.supported_groups,
+         _u16_list((X25519MLKEM768, X25519, SECP256R1, SECP384R1, 0x0019, 0x0100, 0x0101))),
+        (ExtensionType.ec_point_formats, b'\x01\x00'),
+        (ExtensionType.session_ticket, b''),
+        (ExtensionType.application_layer_protocol_negotiation, vector(b'\x02h2\x08http/1.1')),
+        (ExtensionType.status_request, b'\x01\x00\x00\x00\x00'),
+        (ExtensionType.key_share, _key_shares(((X25519MLKEM768, 1216), (X25519, 32), (SECP256R1, 65)))),
+        (ExtensionType.supported_versions, vector(b'\x03\x04\x03\x03', 1)),
+        (ExtensionType.signature_algorithms, _u16_list(signature_algorithms)),
+        (ExtensionType.psk_key_exchange_modes, b'\x01\x01'),
+        (ExtensionType.record_size_limit, b'\x40\x01'),
+        (ExtensionType.compress_certificate, b'\x06\x00\x01\x00\x02\x00\x03'),
+    ]
+    if resumed:
+        identity = _bytes(192)
+        extensions.append((ExtensionType.early_data, b''))
+        extensions.append((ExtensionType.pre_shared_key,
+                           vector(vector(identity) + struct.pack('!I', 0x12345678)) + vector(vector(_bytes(32), 1))))
+    return _hello([0x1301, 0x1303, 0x1302, 0xc02b, 0xc02f, 0xcca9, 0xcca8, 0xc02c, 0xc030, 0xc00a, 0xc009,
+                   0xc013, 0xc014, 0x009c, 0x009d, 0x002f, 0x0035], extensions)
+
+
+def client_hellos() -> dict[str, ClientHello]:
+    return {
+        'chrome': chrome_client_hello(),
+        'firefox': firefox_client_hello(),
+        'firefox_resumed': firefox_client_hello(resumed=True),
+    }
+
+
+def plaintext_records() -> dict[str, TLSPlaintext]:
+    return {
+        'small': TLSPlaintext(type=ContentType.application_data, fragment=_bytes(64)),
+        'large': TLSPlaintext(type=ContentType.application_data, fragment=_bytes(2 ** 14)),
+    }
+
+
+def ciphertext_records() -> dict[str, TLSCiphertext]:
+    return {
+        'small': TLSCiphertext(opaque_type=ContentType.application_data, encrypted_record=_bytes(64 + 17)),
+        'large': TLSCiphertext(opaque_type=ContentType.application_data, encrypted_record=_bytes(2 ** 14 + 17)),
+    }
+
+
+def inner_plaintexts() -> dict[str, TLSInnerPlaintext]:
+    return {
+        'small': TLSInnerPlaintext(content=_bytes(64), type=ContentType.application_data),
+        'large': TLSInnerPlaintext(content=_bytes(2 ** 14), type=ContentType.application_data),
+        # Padded up to a fixed record size, as with traffic-analysis padding
+        'padded': TLSInnerPlaintext(content=_bytes(512), type=ContentType.application_data,
+                                    zeros_padding_length=4096 - 512 - 1),
+    }
@@ -0,0 +1,104 @@
+"""Event-loop latency for established connections during a handshake storm.
+
+A ticker coroutine stands in for an established connection: it wakes every
+``--interval`` seconds and records how late it ran. Meanwhile ``--handshakes``
+server handshakes are driven from ClientHello to ServerHello with the key
+exchange run inline on the loop, in a thread pool or in a process pool.
+
+Run with ``python -m benchmarks.handshake_offload --group secp256r1``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import struct
+import time
+
+from benchmarks.loadgen import LatencyHistogram
+from python_tls_implementation.tcp.handshake_executor import HandshakeExecutor
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+from python_tls_implementation.tls.handshake.server_handshake import ServerHandshake
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.key_share import KeyShareKeyPair, NamedGroup
+
+
+def client_hello_frame(group: NamedGroup) -> HandshakeFrame:
+    public_bytes = KeyShareKeyPair.generate(group).public_bytes
+    key_share = struct.pack('!HH', group, len(public_bytes)) + public_bytes
+    client_hello = ClientHello(
+        random_value=os.urandom(32),
+        cipher_suites=[0x1301, 0x1302, 0x1303],
+        extensions=[
+            Extension(extension_type=ExtensionType.supported_versions, data=b'\x02\x03\x04'),
+            Extension(extension_type=ExtensionType.key_share, data=struct.pack('!H', len(key_share)) + key_share),
+        ],
+    )
+    return HandshakeFrame.from_message(client_hello)
+
+
+async def ticker(interval: float, histogram: LatencyHistogram, done: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not done.is_set():
+        deadline = loop.time() + interval
+        await asyncio.sleep(interval)
+        histogram.record(loop.time() - deadline)
+
+
+async def storm(frame: HandshakeFrame, group: NamedGroup, handshakes: int, concurrency: int,
+                executor: HandshakeExecutor | None) -> None:
+    remaining = iter(range(handshakes))
+
+    async def worker() -> None:
+        for _ in remaining:
+            handshake = ServerHandshake(groups=(group,))
+            if executor is None:
+                handshake.resume(handshake.receive_client_hello(frame).run())
+                # Let the loop run between handshakes, as a real server would between reads
+                await asyncio.sleep(0)
+            else:
+                await executor.handshake(handshake, frame)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def bench(frame: HandshakeFrame, args: argparse.Namespace,
+                executor: HandshakeExecutor | None) -> tuple[float, LatencyHistogram]:
+    histogram = LatencyHistogram()
+    done = asyncio.Event()
+    tick = asyncio.create_task(ticker(args.interval, histogram, done))
+    start = time.perf_counter()
+    await storm(frame, NamedGroup[args.group], args.handshakes, args.concurrency, executor)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    return elapsed, histogram
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--group', choices=[group.name for group in NamedGroup], default='x25519')
+    parser.add_argument('--handshakes', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--interval', type=float, default=0.001)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    frame = client_hello_frame(NamedGroup[args.group])
+    modes = {
+        'inline': None,
+        'threads': HandshakeExecutor(max_workers=args.workers),
+        'processes': HandshakeExecutor(max_workers=args.workers, processes=True),
+    }
+    for name, executor in modes.items():
+        elapsed, histogram = asyncio.run(bench(frame, args, executor))
+        if executor is not None:
+            executor.shutdown()
+        print(f"{name:<10} {args.handshakes / elapsed:>8,.0f} handshakes/s  loop lag "
+              f"p50 {histogram.percentile(50) * 1e3:>6.2f} ms  p99 {histogram.percentile(99) * 1e3:>6.2f} ms  "
+              f"max {histogram.max * 1e3:>6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
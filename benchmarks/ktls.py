@@ -0,0 +1,79 @@
+"""Bulk send throughput over loopback TCP: records sealed in Python versus kernel TLS.
+
+Each case sends ``--megabytes`` of application data, either from memory
+(``write``) or from a temporary file (``sendfile``), to a receiver thread
+that drains the ciphertext without decrypting it. Kernel cases are skipped
+when the "tls" ULP is not available.
+
+Run with ``python -m benchmarks.ktls``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from python_tls_implementation.tcp.ktls import kernel_tls_available, protected_streams
+from python_tls_implementation.tls.protection import CIPHER_SUITES, CipherSuite
+
+
+def _drain(sock: socket.socket, received: list[int]) -> None:
+    buffer = bytearray(2 ** 20)
+    total = 0
+    while count := sock.recv_into(buffer):
+        total += count
+    received.append(total)
+
+
+def bench(cipher_suite: CipherSuite, kernel: bool, send) -> tuple[float, int]:
+    parameters = CIPHER_SUITES[cipher_suite]
+    keys = (os.urandom(parameters.key_length), os.urandom(parameters.iv_length), 0)
+    with socket.create_server(('127.0.0.1', 0)) as server, \
+            socket.create_connection(server.getsockname()) as sender:
+        receiver, _ = server.accept()
+        received: list[int] = []
+        thread = threading.Thread(target=_drain, args=(receiver, received))
+        with receiver:
+            thread.start()
+            _, writer = protected_streams(sender, cipher_suite, keys, keys, kernel=kernel)
+            start = time.perf_counter()
+            send(writer)
+            sender.shutdown(socket.SHUT_WR)
+            thread.join()
+            elapsed = time.perf_counter() - start
+    return elapsed, received[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--megabytes', type=int, default=256)
+    parser.add_argument('--cipher-suite', choices=[suite.name for suite in CipherSuite],
+                        default=CipherSuite.TLS_AES_128_GCM_SHA256.name)
+    args = parser.parse_args()
+
+    cipher_suite = CipherSuite[args.cipher_suite]
+    size = args.megabytes * 2 ** 20
+    data = os.urandom(2 ** 20) * args.megabytes
+    modes = [False, True] if kernel_tls_available() else [False]
+    if len(modes) == 1:
+        print("kernel TLS unavailable, running the Python path only")
+
+    with tempfile.TemporaryFile() as file:
+        file.write(data)
+        file.flush()
+        cases = {
+            'write': lambda writer: writer.write(data),
+            'sendfile': lambda writer: writer.sendfile(file, 0, size),
+        }
+        for kernel in modes:
+            for name, send in cases.items():
+                elapsed, wire_bytes = bench(cipher_suite, kernel, send)
+                print(f"{'kernel' if kernel else 'python':<7} {name:<9} {size / elapsed / 1e6:>8,.0f} MB/s  "
+                      f"{wire_bytes / size:.4f} wire bytes per payload byte")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""Loopback load generator for the record-echo servers.
+
+Drives ``--connections`` concurrent connections against ``--host``/``--port``
+(or against a server it starts itself with ``--serve``) using asyncio tasks,
+threads or processes. Each connection repeatedly sends a payload drawn from
+``--payloads`` as application_data records and waits for the echo.
+
+Closed loop (the default) sends the next request as soon as the previous
+response arrives. Open loop (``--rate``) schedules requests at a fixed total
+rate and measures latency from the scheduled send time, so a stalled server
+shows up as queueing delay instead of silently lowering the offered load.
+
+Reports connect, handshake, first-byte and full-response latency percentiles,
+bytes/sec, and errors by kind. ``handshake`` is empty for plain TCP servers
+and is where a TLS handshake will be timed.
+
+Run with ``python -m benchmarks.loadgen --serve --connections 64 --duration 10``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import random
+import socket
+import threading
+import time
+from collections import Counter
+
+from python_tls_implementation.tcp.async_client import open_record_connection
+from python_tls_implementation.tcp.server import TCPServer
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+from python_tls_implementation.tls.record_writer import RecordWriter
+
+PHASES = ('connect', 'handshake', 'first_byte', 'response')
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies with ~1.5% relative error and fixed memory.
+
+    Values are bucketed in microseconds: 64 linear sub-buckets per power of
+    two, up to about 2**37 us (38 hours), so histograms from many workers
+    can be merged by adding counts.
+    """
+
+    SUB_BUCKETS = 64
+    MAX_EXPONENT = 30
+
+    def __init__(self):
+        self.counts: list[int] = [0] * (self.SUB_BUCKETS * (self.MAX_EXPONENT + 2))
+        self.total: int = 0
+        self.max: float = 0.0
+
+    def _index(self, microseconds: int) -> int:
+        if microseconds < self.SUB_BUCKETS:
+            return microseconds
+        # Values in [64 << e, 128 << e) share exponent e and land in one of 64 sub-buckets
+        exponent = microseconds.bit_length() - 7
+        index = exponent * self.SUB_BUCKETS + (microseconds >> exponent)
+        return min(len(self.counts) - 1, index)
+
+    def _value(self, index: int) -> float:
+        if index < self.SUB_BUCKETS:
+            return float(index)
+        exponent, sub_bucket = divmod(index - self.SUB_BUCKETS, self.SUB_BUCKETS)
+        # Upper edge of the bucket, so percentiles never under-report
+        return float(((sub_bucket + self.SUB_BUCKETS + 1) << exponent) - 1)
+
+    def record(self, seconds: float) -> None:
+        self.counts[self._index(max(0, int(seconds * 1e6)))] += 1
+        self.total += 1
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: LatencyHistogram) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in seconds below which ``percent`` of the samples fall."""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._value(index) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        summary = {'count': self.total}
+        for percent in PERCENTILES:
+            summary[f'p{percent:g}'] = self.percentile(percent)
+        summary['max'] = self.max
+        return summary
+
+
+class LoadResults:
+    """Latency histograms per phase plus throughput and error counters; mergeable across workers."""
+
+    def __init__(self):
+        self.latency: dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        self.requests: int = 0
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.errors: Counter[str] = Counter()
+        self.elapsed: float = 0.0
+
+    def error(self, exc: BaseException) -> None:
+        self.errors[type(exc).__name__] += 1
+
+    def merge(self, other: LoadResults) -> None:
+        for phase, histogram in other.latency.items():
+            self.latency[phase].merge(histogram)
+        self.requests += other.requests
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.errors.update(other.errors)
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+    def to_dict(self) -> dict:
+        elapsed = self.elapsed or 1.0
+        return {
+            'elapsed': self.elapsed,
+            'requests': self.requests,
+            'requests_per_sec': self.requests / elapsed,
+            'bytes_per_sec': (self.bytes_sent + self.bytes_received) / elapsed,
+            'errors': dict(self.errors),
+            'latency': {phase: histogram.summary() for phase, histogram in self.latency.items()},
+        }
+
+
+class LoadConfig:
+    """What every connection does; picklable so process workers can receive it."""
+
+    def __init__(self, host: str, port: int, connections: int, duration: float,
+                 payloads: list[tuple[int, float]], rate: float | None = None,
+                 requests_per_connection: int = 0, timeout: float = 10.0, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.connections = connections
+        self.duration = duration
+        self.payloads = payloads
+        self.rate = rate
+        self.requests_per_connection = requests_per_connection
+        self.timeout = timeout
+        self.seed = seed
+
+    def payload_chooser(self, index: int):
+        rng = random.Random(self.seed * 100_003 + index)
+        sizes = [size for size, _ in self.payloads]
+        weights = [weight for _, weight in self.payloads]
+        blobs = {size: rng.randbytes(size) for size in sizes}
+        return lambda: blobs[rng.choices(sizes, weights)[0]]
+
+    def interval(self) -> float | None:
+        """Gap between scheduled sends on one connection in open-loop mode."""
+        return self.connections / self.rate if self.rate else None
+
+
+def parse_payloads(spec: str) -> list[tuple[int, float]]:
+    """'64:0.9,65536:0.1' -> [(64, 0.9), (65536, 0.1)]; a bare size gets weight 1."""
+    payloads = []
+    for item in spec.split(','):
+        size, _, weight = item.partition(':')
+        payloads.append((int(size), float(weight or 1)))
+    return payloads
+
+
+async def _async_connection(config: LoadConfig, index: int, deadline: float, results: LoadResults) -> None:
+    choose = config.payload_chooser(index)
+    interval = config.interval()
+    # Spread the connections' schedules evenly over one interval
+    scheduled = time.perf_counter() + (interval * index / config.connections if interval else 0.0)
+    while time.perf_counter() < deadline:
+        writer = None
+        try:
+            start = time.perf_counter()
+            reader, writer = await open_record_connection(config.host, config.port,
+                                                          connect_timeout=config.timeout)
+            results.latency['connect'].record(time.perf_counter() - start)
+
+            sent = 0
+            while time.perf_counter() < deadline and (not config.requests_per_connection
+                                                      or sent < config.requests_per_connection):
+                payload = choose()
+                if interval:
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    start, scheduled = scheduled, scheduled + interval
+                else:
+                    start = time.perf_counter()
+                writer.write(payload)
+                await writer.drain()
+                received = 0
+                while received < len(payload):
+                    record = await asyncio.wait_for(reader.read_record(), config.timeout)
+                    if record is None:
+                        raise ConnectionResetError("Server closed the connection")
+                    if not received:
+                        results.latency['first_byte'].record(time.perf_counter() - start)
+                    received += len(record.fragment)
+                results.latency['response'].record(time.perf_counter() - start)
+                results.requests += 1
+                results.bytes_sent += len(payload)
+                results.bytes_received += received
+                sent += 1
+        except (OSError, asyncio.TimeoutError, ValueError) as e:
+            results.error(e)
+            await asyncio.sleep(0.01)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+async def run_async(config: LoadConfig, first_index: int = 0, count: int | None = None) -> LoadResults:
+    results = LoadResults()
+    count = config.connections if count is None else count
+    start = time.perf_counter()
+    deadline = start + config.duration
+    await asyncio.gather(*(_async_connection(config, first_index + i, deadline, results) for i in range(count)))
+    results.elapsed = time.perf_counter() - start
+    return results
+
+
+def _thread_connection(config: LoadConfig, index: int, deadline: float, results: LoadResults,
+                       lock: threading.Lock) -> None:
+    choose = config.payload_chooser(index)
+    interval = config.interval()
+    scheduled = time.perf_counter() + (interval * index / config.connections if interval else 0.0)
+    local = LoadResults()
+    while time.perf_counter() < deadline:
+        try:
+            start = time.perf_counter()
+            with socket.create_connection((config.host, config.port), timeout=config.timeout) as sock:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                local.latency['connect'].record(time.perf_counter() - start)
+                reader = BufferedSocketReader(sock)
+                writer = RecordWriter()
+                sent = 0
+                while time.perf_counter() < deadline and (not config.requests_per_connection
+                                                          or sent < config.requests_per_connection):
+                    payload = choose()
+                    if interval:
+                        delay = scheduled - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                        start, scheduled = scheduled, scheduled + interval
+                    else:
+                        start = time.perf_counter()
+                    view = memoryview(payload)
+                    for offset in range(0, len(view), TLSPlaintext.MAX_FRAGMENT_LENGTH):
+                        writer.write_record(ContentType.application_data,
+                                            view[offset:offset + TLSPlaintext.MAX_FRAGMENT_LENGTH])
+                    writer.flush(sock)
+                    received = 0
+                    while received < len(payload):
+                        record = reader.read_record()
+                        if record is None:
+                            raise ConnectionResetError("Server closed the connection")
+                        if not received:
+                            local.latency['first_byte'].record(time.perf_counter() - start)
+                        received += len(record.fragment)
+                    local.latency['response'].record(time.perf_counter() - start)
+                    local.requests += 1
+                    local.bytes_sent += len(payload)
+                    local.bytes_received += received
+                    sent += 1
+        except (OSError, ValueError) as e:
+            local.error(e)
+            time.sleep(0.01)
+    with lock:
+        results.merge(local)
+
+
+def run_threads(config: LoadConfig) -> LoadResults:
+    results = LoadResults()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + config.duration
+    threads = [
+        threading.Thread(target=_thread_connection, args=(config, index, deadline, results, lock), daemon=True)
+        for index in range(config.connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.elapsed = time.perf_counter() - start
+    return results
+
+
+def _process_main(config: LoadConfig, first_index: int, count: int) -> LoadResults:
+    return asyncio.run(run_async(config, first_index, count))
+
+
+def run_processes(config: LoadConfig, processes: int) -> LoadResults:
+    """Split the connections over ``processes`` workers, each running its share on an event loop."""
+    processes = max(1, min(processes, config.connections))
+    shares = [config.connections // processes + (index < config.connections % processes)
+              for index in range(processes)]
+    starts = [sum(shares[:index]) for index in range(processes)]
+    results = LoadResults()
+    with multiprocessing.get_context('fork').Pool(processes) as pool:
+        for partial in pool.starmap(_process_main, [(config, start, share) for start, share in zip(starts, shares)]):
+            results.merge(partial)
+    return results
+
+
+def _serve(host: str, port: int, workers: int) -> None:
+    TCPServer(host, port).run(idle_timeout=None, workers=workers)
+
+
+def start_local_server(host: str, workers: int) -> tuple[multiprocessing.Process, int]:
+    """Start an echo TCPServer in a child process on a free port and wait until it accepts."""
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        port = probe.getsockname()[1]
+    process = multiprocessing.get_context('fork').Process(target=_serve, args=(host, port, workers), daemon=True)
+    process.start()
+    deadline = time.monotonic() + 10.0
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1.0).close()
+            return process, port
+        except OSError:
+            if time.monotonic() > deadline or not process.is_alive():
+                process.terminate()
+                raise RuntimeError(f"Local server on {host}:{port} did not start")
+            time.sleep(0.05)
+
+
+def print_report(results: LoadResults) -> None:
+    report = results.to_dict()
+    print(f"requests: {report['requests']:,} in {report['elapsed']:.1f}s "
+          f"({report['requests_per_sec']:,.0f} req/s, {report['bytes_per_sec'] / 1e6:,.1f} MB/s)")
+    print(f"{'phase':<11}{'count':>10}" + ''.join(f"{f'p{p:g}':>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for phase, summary in report['latency'].items():
+        print(f"{phase:<11}{summary['count']:>10,}"
+              + ''.join(f"{summary[f'p{p:g}'] * 1e3:>8.2f}ms" for p in PERCENTILES)
+              + f"{summary['max'] * 1e3:>8.2f}ms")
+    if report['errors']:
+        print("errors: " + ', '.join(f"{kind}={count}" for kind, count in report['errors'].most_common()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8443)
+    parser.add_argument('--serve', action='store_true', help="start a local echo server on a free port")
+    parser.add_argument('--server-workers', type=int, default=1)
+    parser.add_argument('--mode', choices=('asyncio', 'threads', 'processes'), default='asyncio')
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--rate', type=float, help="total requests/sec for open-loop load (default: closed loop)")
+    parser.add_argument('--payloads', type=parse_payloads, default=parse_payloads('64:0.9,65536:0.1'),
+                        help="size:weight list, e.g. 64:0.9,65536:0.1")
+    parser.add_argument('--requests-per-connection', type=int, default=0,
+                        help="reconnect after this many requests (0 keeps connections open)")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.serve:
+        server, args.port = start_local_server(args.host, args.server_workers)
+    config = LoadConfig(args.host, args.port, args.connections, args.duration, args.payloads,
+                        rate=args.rate, requests_per_connection=args.requests_per_connection, timeout=args.timeout)
+    try:
+        if args.mode == 'threads':
+            results = run_threads(config)
+        elif args.mode == 'processes':
+            results = run_processes(config, args.processes)
+        else:
+            results = asyncio.run(run_async(config))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    if args.json:
+        print(json.dumps(results.to_dict(), indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Record protection throughput (MB/s on one core) for each AEAD cipher suite.
+
+Run with ``python -m benchmarks.protection``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from python_tls_implementation.tls.fragmenter import RecordFragmenter
+from python_tls_implementation.tls.protection import CIPHER_SUITES, CipherSuite, RecordProtection
+from python_tls_implementation.tls.record import ContentType
+
+
+def _protection_pair(cipher_suite: CipherSuite) -> tuple[RecordProtection, RecordProtection]:
+    parameters = CIPHER_SUITES[cipher_suite]
+    key, iv = os.urandom(parameters.key_length), os.urandom(parameters.iv_length)
+    return RecordProtection(cipher_suite, key, iv), RecordProtection(cipher_suite, key, iv)
+
+
+def bench(cipher_suite: CipherSuite, payload: bytes, record_size: int, repeat: int) -> tuple[float, float]:
+    inners = list(RecordFragmenter(max_fragment_length=record_size).inner_plaintexts(ContentType.application_data, payload))
+    best_seal = best_open = float('inf')
+    for _ in range(repeat):
+        sealer, opener = _protection_pair(cipher_suite)
+
+        start = time.perf_counter()
+        records = sealer.seal_many(inners)
+        best_seal = min(best_seal, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        opener.open_many(records)
+        best_open = min(best_open, time.perf_counter() - start)
+
+    megabytes = len(payload) / 1e6
+    return megabytes / best_seal, megabytes / best_open
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--megabytes', type=int, default=16)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--record-sizes', type=int, nargs='+', default=[1024, 16384])
+    args = parser.parse_args()
+
+    payload = os.urandom(args.megabytes * 2 ** 20)
+    print(f"{'cipher suite':>30} {'record':>7} {'seal MB/s':>10} {'open MB/s':>10}")
+    for cipher_suite in CipherSuite:
+        for record_size in args.record_sizes:
+            seal, open_ = bench(cipher_suite, payload, record_size, args.repeat)
+            print(f"{cipher_suite.name:>30} {record_size:>7} {seal:>10,.0f} {open_:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Time to first byte and bulk throughput with fixed versus dynamic record sizes.
+
+TTFB: a fresh connection sends a ``--response-kb`` response through a
+paced link thread (``--link-mbps``, forwarded in 1448-byte segments) and
+the receiver notes when the first and last complete records arrive; a
+record can only be decrypted once all of it is in. Throughput: ``--megabytes``
+of data sealed and sent straight over loopback.
+
+Run with ``python -m benchmarks.record_sizing``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import threading
+import time
+from typing import Callable
+
+from python_tls_implementation.tcp.ktls import PythonTLSWriter
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tls.fragmenter import RecordFragmenter, RecordSizer
+from python_tls_implementation.tls.protection import RecordProtection, CipherSuite
+from python_tls_implementation.tls.record import TLSCiphertext
+
+SEGMENT = 1448
+CIPHER_SUITE = CipherSuite.TLS_AES_128_GCM_SHA256
+
+
+def _fragmenters() -> dict[str, Callable[[], RecordFragmenter]]:
+    small = RecordSizer.DEFAULT_SMALL_SIZE
+    return {
+        'fixed 16 KB': lambda: RecordFragmenter(),
+        f'fixed {small} B': lambda: RecordFragmenter(max_fragment_length=small),
+        'dynamic': lambda: RecordFragmenter(sizer=RecordSizer()),
+    }
+
+
+def _link(source: socket.socket, destination: socket.socket, mbps: float) -> None:
+    """Forward bytes one segment at a time at ``mbps`` megabits per second."""
+    interval = SEGMENT * 8 / (mbps * 1e6)
+    next_send = time.perf_counter()
+    while data := source.recv(SEGMENT):
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        destination.sendall(data)
+        next_send = max(next_send, time.perf_counter()) + interval * len(data) / SEGMENT
+    destination.shutdown(socket.SHUT_WR)
+
+
+def _writer(sock: socket.socket, fragmenter: RecordFragmenter) -> PythonTLSWriter:
+    protection = RecordProtection(CIPHER_SUITE, os.urandom(16), os.urandom(12))
+    return PythonTLSWriter(sock, protection, fragmenter)
+
+
+def time_to_first_byte(fragmenter: RecordFragmenter, response: bytes, mbps: float) -> tuple[float, float]:
+    sender, link_in = socket.socketpair()
+    link_out, receiver = socket.socketpair()
+    link = threading.Thread(target=_link, args=(link_in, link_out, mbps))
+    with sender, link_in, link_out, receiver:
+        link.start()
+        reader = BufferedSocketReader(receiver, record_type=TLSCiphertext)
+        start = time.perf_counter()
+        threading.Thread(target=lambda: (_writer(sender, fragmenter).write(response),
+                                         sender.shutdown(socket.SHUT_WR))).start()
+        reader.read_record()
+        first = time.perf_counter() - start
+        while reader.read_record() is not None:
+            pass
+        last = time.perf_counter() - start
+        link.join()
+    return first, last
+
+
+def throughput(fragmenter: RecordFragmenter, data: bytes) -> float:
+    sender, receiver = socket.socketpair()
+
+    def drain() -> None:
+        buffer = bytearray(2 ** 20)
+        while receiver.recv_into(buffer):
+            pass
+
+    thread = threading.Thread(target=drain)
+    with sender, receiver:
+        thread.start()
+        start = time.perf_counter()
+        _writer(sender, fragmenter).write(data)
+        sender.shutdown(socket.SHUT_WR)
+        thread.join()
+        return len(data) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--response-kb', type=int, default=64)
+    parser.add_argument('--link-mbps', type=float, default=20.0)
+    parser.add_argument('--megabytes', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    response = os.urandom(args.response_kb * 1024)
+    data = os.urandom(2 ** 20) * args.megabytes
+    print(f"{'records':<14} {'TTFB':>9} {'last byte':>10} {'bulk':>12}")
+    for name, make in _fragmenters().items():
+        first, last = min(time_to_first_byte(make(), response, args.link_mbps) for _ in range(args.repeat))
+        rate = max(throughput(make(), data) for _ in range(args.repeat))
+        print(f"{name:<14} {first * 1e3:>7.2f}ms {last * 1e3:>8.2f}ms {rate / 1e6:>7,.0f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Records/sec for the slotted wire path versus the validated (strict) pydantic path.
+
+Run with ``python -m benchmarks.records``.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+from python_tls_implementation.tls.record_reader import RecordReader
+from python_tls_implementation.tls.wire import PlaintextRecord
+
+
+def _build_stream(count: int, fragment_size: int) -> bytes:
+    fragment = b'\xab' * fragment_size
+    return b''.join(
+        PlaintextRecord(ContentType.application_data, fragment=fragment).to_bytes() for _ in range(count)
+    )
+
+
+def bench_parse(stream: bytes, strict: bool, repeat: int) -> float:
+    best = float('inf')
+    records = 0
+    for _ in range(repeat):
+        reader = RecordReader(TLSPlaintext, buffer_size=len(stream), strict=strict)
+        start = time.perf_counter()
+        reader.feed(stream)
+        records = sum(1 for _ in reader)
+        best = min(best, time.perf_counter() - start)
+    return records / best
+
+
+def bench_serialize(count: int, fragment_size: int, strict: bool, repeat: int) -> float:
+    fragment = b'\xab' * fragment_size
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if strict:
+            for _ in range(count):
+                TLSPlaintext(type=ContentType.application_data, fragment=fragment).to_bytes()
+        else:
+            for _ in range(count):
+                PlaintextRecord(ContentType.application_data, fragment=fragment).to_bytes()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 1024, 16384])
+    args = parser.parse_args()
+
+    print(f"{'fragment':>9} {'operation':>10} {'fast rec/s':>14} {'strict rec/s':>14} {'speedup':>8}")
+    for size in args.sizes:
+        stream = _build_stream(args.records, size)
+        results = {
+            'parse': (bench_parse(stream, False, args.repeat), bench_parse(stream, True, args.repeat)),
+            'serialize': (bench_serialize(args.records, size, False, args.repeat),
+                          bench_serialize(args.records, size, True, args.repeat)),
+        }
+        for operation, (fast, strict) in results.items():
+            print(f"{size:>9} {operation:>10} {fast:>14,.0f} {strict:>14,.0f} {fast / strict:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
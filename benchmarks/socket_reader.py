@@ -0,0 +1,75 @@
+"""Receiving a bulk download of 16 KB records: recv(1024) plus reassembly versus BufferedSocketReader.
+
+A sender thread writes the records into one end of a socketpair; the
+reader side is timed and its recv calls counted.
+
+Run with ``python -m benchmarks.socket_reader``.
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+import threading
+import time
+
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tls.record import ContentType
+from python_tls_implementation.tls.record_reader import RecordReader
+from python_tls_implementation.tls.wire import PlaintextRecord
+
+
+def _send(sock: socket.socket, stream: bytes) -> None:
+    sock.sendall(stream)
+    sock.shutdown(socket.SHUT_WR)
+
+
+def _recv_1024(sock: socket.socket) -> tuple[int, int]:
+    reader = RecordReader()
+    records = calls = 0
+    while True:
+        data = sock.recv(1024)
+        calls += 1
+        if not data:
+            return records, calls
+        reader.feed(data)
+        for _ in reader:
+            records += 1
+
+
+def _buffered(sock: socket.socket, read_size: int) -> tuple[int, int]:
+    reader = BufferedSocketReader(sock, read_size)
+    records = 0
+    while reader.read_record() is not None:
+        records += 1
+    return records, reader.read_calls
+
+
+def bench(stream: bytes, receive, *args) -> tuple[float, int, int]:
+    receiver, sender = socket.socketpair()
+    thread = threading.Thread(target=_send, args=(sender, stream))
+    with receiver, sender:
+        start = time.perf_counter()
+        thread.start()
+        records, calls = receive(receiver, *args)
+        elapsed = time.perf_counter() - start
+        thread.join()
+    return elapsed, records, calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--fragment-size', type=int, default=2 ** 14)
+    parser.add_argument('--read-size', type=int, default=BufferedSocketReader.DEFAULT_READ_SIZE)
+    args = parser.parse_args()
+
+    record = PlaintextRecord(ContentType.application_data, fragment=b'\xab' * args.fragment_size).to_bytes()
+    stream = record * args.records
+    for name, receive, extra in (('recv(1024)', _recv_1024, ()), ('BufferedSocketReader', _buffered, (args.read_size,))):
+        elapsed, records, calls = bench(stream, receive, *extra)
+        print(f"{name:<22} {records / elapsed:>10,.0f} rec/s  {len(stream) / elapsed / 1e6:>8,.0f} MB/s  "
+              f"{calls / records:>6.2f} recv calls/record")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""Codec microbenchmarks with a stored baseline to catch regressions.
+
+Each case runs one codec entry point over an input from ``benchmarks.corpus``
+and reports ops/sec (best of ``--repeat`` runs) plus, through tracemalloc,
+the peak bytes allocated while one op runs and the bytes still held after it.
+Results can be written to JSON and compared against a baseline; the run
+exits with status 1 when a case is slower, or allocates more, than the
+baseline by more than ``--threshold``.
+
+ops/sec only mean something on the hardware they were measured on, so speed
+is only compared when the baseline's host (CPU model and count, machine and
+Python build) matches the current one; otherwise only allocations are
+checked, and only on the same Python. Host details an older baseline does
+not record count as unknown, not as different. Regenerate the baseline on
+the host that runs the gate with ``--save-baseline``.
+
+Run with ``python -m benchmarks.suite [--baseline benchmarks/baseline.json]``;
+``--save-baseline`` rewrites the baseline from the current run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks import corpus
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import ExtensionRegistry
+from python_tls_implementation.tls.record import TLSCiphertext, TLSInnerPlaintext, TLSPlaintext
+
+DEFAULT_BASELINE = Path(__file__).with_name('baseline.json')
+
+# Allocation sizes jitter by a few bytes between runs and Python builds
+ALLOCATION_SLACK = 64
+
+
+def _parse_extensions(block: bytes) -> None:
+    remaining = memoryview(block)
+    while remaining:
+        _, remaining = ExtensionRegistry.parse(remaining)
+
+
+def _parse_all_extensions(block: bytes) -> None:
+    ExtensionRegistry.parse_all(block)
+
+
+def _extensions_block(body: bytes) -> bytes:
+    view = ClientHelloView(body)
+    start = min(offset for offset, _ in map(view.extension_location, view.extension_types)) - 4
+    return body[start:]
+
+
+def cases() -> dict[str, tuple[Callable[[Any], Any], Any]]:
+    """Benchmark name -> (operation, input)."""
+    suite: dict[str, tuple[Callable[[Any], Any], Any]] = {}
+    for name, record in corpus.plaintext_records().items():
+        suite[f'TLSPlaintext.from_bytes[{name}]'] = (TLSPlaintext.from_bytes, record.to_bytes())
+        suite[f'TLSPlaintext.to_bytes[{name}]'] = (TLSPlaintext.to_bytes, record)
+    for name, record in corpus.ciphertext_records().items():
+        suite[f'TLSCiphertext.from_bytes[{name}]'] = (TLSCiphertext.from_bytes, record.to_bytes())
+        suite[f'TLSCiphertext.to_bytes[{name}]'] = (TLSCiphertext.to_bytes, record)
+    for name, inner in corpus.inner_plaintexts().items():
+        suite[f'TLSInnerPlaintext.from_bytes[{name}]'] = (TLSInnerPlaintext.from_bytes, inner.to_bytes())
+        suite[f'TLSInnerPlaintext.to_bytes[{name}]'] = (TLSInnerPlaintext.to_bytes, inner)
+    for name, hello in corpus.client_hellos().items():
+        body = hello._body_bytes()
+        suite[f'ExtensionRegistry.parse[{name}]'] = (_parse_extensions, _extensions_block(body))
+        suite[f'ExtensionRegistry.parse_all[{name}]'] = (_parse_all_extensions, _extensions_block(body))
+        suite[f'ClientHello.parse[{name}]'] = (ClientHello.parse, body)
+        suite[f'ClientHello._body_bytes[{name}]'] = (ClientHello._body_bytes, hello)
+        suite[f'ClientHelloView[{name}]'] = (ClientHelloView, body)
+    return suite
+
+
+def ops_per_second(operation: Callable[[Any], Any], argument: Any, min_time: float, repeat: int) -> float:
+    # Calibrate the loop count so a single run lasts about min_time
+    count = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(count):
+            operation(argument)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        count *= 10
+    count = max(1, int(count * min_time / elapsed))
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            operation(argument)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def allocations(operation: Callable[[Any], Any], argument: Any, count: int = 200) -> tuple[float, float]:
+    """(peak bytes allocated during one op, bytes retained per op) averaged over ``count`` ops."""
+    operation(argument)
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(count):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = operation(argument)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+            del result
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_total / count, (retained - baseline) / count
+
+
+def run(selected: list[str] | None, min_time: float, repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, (operation, argument) in cases().items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        peak, retained = allocations(operation, argument)
+        results[name] = {
+            'ops_per_sec': round(ops_per_second(operation, argument, min_time, repeat), 1),
+            'peak_bytes_per_op': round(peak, 1),
+            'retained_bytes_per_op': round(retained, 1),
+        }
+    return results
+
+
+def _cpu_model() -> str:
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def host_info() -> dict[str, Any]:
+    """Everything the timings depend on besides the code; baselines only compare on an identical host."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'cpu': _cpu_model(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def same_host(baseline: dict[str, Any], host: dict[str, Any]) -> bool:
+    """Whether ``baseline`` timings compare with ``host``; keys the baseline lacks are not held against it."""
+    return all(baseline[key] == value for key, value in host.items() if key in baseline)
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]],
+            threshold: float, timings: bool = True) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if timings and result['ops_per_sec'] < reference['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {result['ops_per_sec']:,.0f} ops/s vs baseline "
+                               f"{reference['ops_per_sec']:,.0f} ops/s")
+        if result['peak_bytes_per_op'] > reference['peak_bytes_per_op'] * (1 + threshold) + ALLOCATION_SLACK:
+            regressions.append(f"{name}: {result['peak_bytes_per_op']:,.0f} peak bytes/op vs baseline "
+                               f"{reference['peak_bytes_per_op']:,.0f}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', nargs='*', help="only run benchmarks whose name contains one of these")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timed run")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path, help="write results as JSON")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed relative regression")
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = run(args.filter, args.min_time, args.repeat)
+    print(f"{'benchmark':<44} {'ops/s':>12} {'peak B/op':>10} {'kept B/op':>10}")
+    for name, result in results.items():
+        print(f"{name:<44} {result['ops_per_sec']:>12,.0f} {result['peak_bytes_per_op']:>10,.0f} "
+              f"{result['retained_bytes_per_op']:>10,.0f}")
+
+    host = host_info()
+    report = {**host, 'results': results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + '\n')
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        timings = same_host(baseline, host)
+        same_python = all(baseline.get(key) == host[key] for key in ('python', 'implementation'))
+        if not same_python:
+            print(f"\nbaseline {args.baseline} is from another Python build; nothing compared")
+            return
+        missing = [key for key in host if key not in baseline]
+        if not timings:
+            print(f"\nbaseline {args.baseline} is from another host; comparing allocations only "
+                  f"(rerun with --save-baseline here to gate on speed)")
+        elif missing:
+            print(f"\nbaseline {args.baseline} does not record {', '.join(missing)}; assuming the same host")
+        regressions = compare(results, baseline['results'], args.threshold, timings=timings)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
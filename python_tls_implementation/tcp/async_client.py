@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Type
+
+from python_tls_implementation.tcp.streams import RecordProtocol, RecordStreamReader, RecordStreamWriter
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSPlaintext
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
+logger = logging.getLogger('tcp_async_client')
+
+
+async def open_record_connection(host: str, port: int,
+                                 record_type: Type[TLSPlaintext] | Type[TLSCiphertext] = TLSPlaintext,
+                                 idle_timeout: float | None = None,
+                                 connect_timeout: float | None = None) -> tuple[RecordStreamReader, RecordStreamWriter]:
+    loop = asyncio.get_running_loop()
+    _, protocol = await asyncio.wait_for(
+        loop.create_connection(lambda: RecordProtocol(record_type=record_type, idle_timeout=idle_timeout), host, port),
+        connect_timeout,
+    )
+    return protocol.reader, protocol.writer
+
+
+class AsyncTCPClient:
+    """asyncio counterpart of TCPClient exchanging whole records with the server."""
+
+    def __init__(self, idle_timeout: float | None = None):
+        self.idle_timeout = idle_timeout
+        self.reader: RecordStreamReader | None = None
+        self.writer: RecordStreamWriter | None = None
+        self.connected: bool = False
+
+    async def connect(self, host: str, port: int, timeout: float | None = None) -> bool:
+        try:
+            self.reader, self.writer = await open_record_connection(
+                host, port, idle_timeout=self.idle_timeout, connect_timeout=timeout,
+            )
+            self.connected = True
+            return True
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.error("Failed to connect to %s:%s: %s", host, port, e)
+            return False
+
+    async def send_data(self, data: bytes, content_type: ContentType = ContentType.application_data) -> bool:
+        if not self.connected:
+            logger.error("Not connected to any server")
+            return False
+        try:
+            self.writer.write(data, content_type)
+            await self.writer.drain()
+            return True
+        except OSError as e:
+            logger.error("Failed to send data: %s", e)
+            self.connected = False
+            return False
+
+    async def receive_record(self, timeout: float | None = None) -> PlaintextRecord | CiphertextRecord | None:
+        if not self.connected:
+            logger.error("Not connected to any server")
+            return None
+        try:
+            record = await asyncio.wait_for(self.reader.read_record(), timeout)
+        except (OSError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("Failed to receive data: %s", e)
+            self.connected = False
+            return None
+        if record is None:
+            logger.info("Connection closed by server")
+            self.connected = False
+        return record
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+        self.connected = False
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+from typing import Callable, Type
+
+from python_tls_implementation.tcp.streams import (
+    ConnectionHandler,
+    RecordProtocol,
+    RecordStreamReader,
+    RecordStreamWriter,
+)
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.fragmenter import RecordSizer
+from python_tls_implementation.tls.record import TLSCiphertext, TLSPlaintext
+from python_tls_implementation.tls.wire import CiphertextRecord
+
+logger = logging.getLogger('tcp_async_server')
+
+
+async def echo_handler(reader: RecordStreamReader, writer: RecordStreamWriter) -> None:
+    """Default handler: send every record back to the peer unchanged."""
+    async for record in reader:
+        if isinstance(record, CiphertextRecord):
+            writer.write_record(record.opaque_type, record.encrypted_record)
+        else:
+            writer.write_record(record.type, record.fragment)
+        await writer.drain()
+
+
+class AsyncTCPServer:
+    """Serves every connection concurrently on one event loop, running the record layer per connection."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8443, handler: ConnectionHandler = echo_handler,
+                 record_type: Type[TLSPlaintext] | Type[TLSCiphertext] = TLSPlaintext,
+                 idle_timeout: float | None = 60.0, backlog: int = socket.SOMAXCONN,
+                 reuse_port: bool = False, shutdown_timeout: float = 5.0,
+                 record_sizer: Callable[[], RecordSizer] | None = None,
+                 buffer_pool: BufferPool | None = None,
+                 limit: int = RecordProtocol.DEFAULT_LIMIT, low_water: int | None = None):
+        self.host: str = host
+        self.port: int = port
+        self.handler = handler
+        self.record_type = record_type
+        self.idle_timeout = idle_timeout
+        self.backlog = backlog
+        self.reuse_port = reuse_port
+        self.shutdown_timeout = shutdown_timeout
+        self.record_sizer = record_sizer
+        self.buffer_pool = buffer_pool
+        self.limit = limit
+        self.low_water = low_water
+        self.connections: set[RecordProtocol] = set()
+        self.accepted: int = 0
+        self._server: asyncio.Server | None = None
+
+    def _protocol_factory(self) -> RecordProtocol:
+        protocol = RecordProtocol(
+            handler=self.handler,
+            record_type=self.record_type,
+            idle_timeout=self.idle_timeout,
+            on_connection_lost=self.connections.discard,
+            record_sizer=self.record_sizer,
+            buffer_pool=self.buffer_pool,
+            limit=self.limit,
+            low_water=self.low_water,
+        )
+        self.connections.add(protocol)
+        self.accepted += 1
+        return protocol
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            self._protocol_factory,
+            self.host,
+            self.port,
+            backlog=self.backlog,
+            reuse_address=True,
+            reuse_port=self.reuse_port or None,
+        )
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Server started on %s:%s", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.shutdown()
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """Stop accepting, give open connections ``timeout`` seconds to finish, then abort the rest."""
+        if timeout is None:
+            timeout = self.shutdown_timeout
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+        for protocol in list(self.connections):
+            if protocol.reader is not None:
+                protocol.reader.feed_eof()
+
+        pending = [protocol.closed for protocol in self.connections]
+        if pending:
+            _, still_open = await asyncio.wait(pending, timeout=timeout)
+            if still_open:
+                logger.info("Aborting %s connections after %ss grace period", len(still_open), timeout)
+
+        for protocol in list(self.connections):
+            if protocol.transport is not None:
+                protocol.transport.abort()
+            if protocol.task is not None:
+                protocol.task.cancel()
+        self.connections.clear()
@@ -1,23 +1,37 @@
 import logging
 import socket
 
-logging.basicConfig(level=logging.DEBUG)
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.instrumentation import ConnectionMetrics, Instrumentation, default_instrumentation
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+from python_tls_implementation.tls.record_writer import RecordWriter
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
 logger = logging.getLogger('tcp_client')
 
 
 class TCPClient:
-    def __init__(self):
+    def __init__(self, instrumentation: Instrumentation = default_instrumentation,
+                 read_size: int = BufferedSocketReader.DEFAULT_READ_SIZE, buffer_pool: BufferPool | None = None):
         # Initialize client properties
         self.socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.reader: BufferedSocketReader = BufferedSocketReader(self.socket, read_size, pool=buffer_pool)
         self.connected: bool  = False
+        self.instrumentation = instrumentation
+        self.metrics: ConnectionMetrics | None = None
 
-    def connect(self, host: str, port: int) -> bool:
+    def connect(self, host: str, port: int, timeout: float | None = None) -> bool:
         try:
+            self.socket.settimeout(timeout)
             self.socket.connect((host, port))
+            self.socket.settimeout(None)
             self.connected = True
+            self.metrics = self.instrumentation.connection_opened((host, port))
+            self.reader.metrics = self.metrics
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to {host}:{port}: {e}")
+            logger.error("Failed to connect to %s:%s: %s", host, port, e)
             return False
 
     def send_data(self, data: bytes) -> bool:
@@ -26,10 +40,27 @@ class TCPClient:
             logger.error("Not connected to any server")
             return False
         try:
-            self.socket.send(data)
+            self.socket.sendall(data)
+            if self.metrics is not None:
+                self.metrics.write_calls += 1
+                self.metrics.bytes_out += len(data)
+            return True
+        except Exception as e:
+            logger.error("Failed to send data: %s", e)
+            self.connected = False
+            return False
+
+    def send_records(self, writer: RecordWriter) -> bool:
+        # Flush every record queued on the writer with vectored sends
+        if not self.connected:
+            logger.error("Not connected to any server")
+            return False
+        try:
+            writer.metrics = self.metrics
+            writer.flush(self.socket)
             return True
         except Exception as e:
-            logger.error(f"Failed to send data: {e}")
+            logger.error("Failed to send records: %s", e)
             self.connected = False
             return False
 
@@ -40,39 +71,62 @@ class TCPClient:
             logger.error("Not connected to any server")
             return b''
         try:
-            data = self.socket.recv(size)
+            data = bytes(self.reader.read_some(size))
 
             if not data:
                 logger.info("Connection closed by server")
                 self.connected = False
             return data
         except Exception as e:
-            logger.error(f"Failed to receive data: {e}")
+            logger.error("Failed to receive data: %s", e)
             self.connected = False
             return b''
 
+    def receive_record(self) -> PlaintextRecord | CiphertextRecord | None:
+        # Receive one whole record; its fragment is only valid until the next receive
+        if not self.connected:
+            logger.error("Not connected to any server")
+            return None
+        try:
+            record = self.reader.read_record()
+            if record is None:
+                logger.info("Connection closed by server")
+                self.connected = False
+            return record
+        except Exception as e:
+            logger.error("Failed to receive record: %s", e)
+            self.connected = False
+            return None
+
     def close(self) -> None:
         try:
             self.socket.close()
         except Exception as e:
-            logger.error(f"Failed to close connection: {e}")
+            logger.error("Failed to close connection: %s", e)
         finally:
             self.connected = False
+            self.reader.release()
+            if self.metrics is not None:
+                self.metrics.close()
+                self.metrics = None
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
     client = TCPClient()
     if client.connect("127.0.0.1", 8443):
         logger.info("Connected to server")
 
-        # Send a test message
+        # Send a test message as an application data record
         message = b"Hello, server!"
-        if client.send_data(message):
-            logger.info(f"Sent: {message}")
+        record = TLSPlaintext(type=ContentType.application_data, fragment=message)
+        if client.send_data(record.to_bytes()):
+            logger.info("Sent: %s", message)
 
             # Receive response
             response = client.receive_data()
             if response:
-                logger.info(f"Received: {response}")
+                echoed, _ = TLSPlaintext.from_bytes(response)
+                logger.info("Received: %s", echoed.fragment)
 
         client.close()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import time
+from enum import Enum
+from typing import Any, Callable
+
+from python_tls_implementation.tcp.async_server import echo_handler
+from python_tls_implementation.tcp.streams import ConnectionHandler, RecordStreamReader, RecordStreamWriter
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.reassembler import HandshakeReassembler
+from python_tls_implementation.tls.handshake.server_handshake import CryptoTask, ServerHandshake, pooled_key_exchange
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.record import ContentType
+
+logger = logging.getLogger('tcp_handshake_executor')
+
+
+_POOLED_IN_PROCESS = ("A KeySharePool can't be used with a process executor (key pairs are not picklable); "
+                      "drop key_shares or use a thread executor")
+
+
+class AdmissionPolicy(Enum):
+    shed = 'shed'
+    delay = 'delay'
+
+
+class HandshakeExecutor:
+    """Runs the CPU-heavy handshake steps off the event loop, with admission control.
+
+    ``max_handshakes`` bounds how many handshakes may be in flight at once.
+    Beyond that, new ones are either refused straight away (``shed``) or wait
+    up to ``admission_timeout`` seconds for a slot (``delay``). Separately, at
+    most ``max_pending`` crypto tasks are handed to the executor at a time, so
+    its internal queue stays bounded and a storm of handshakes can't build a
+    backlog that outlives it. Established connections never touch either
+    limit and keep their latency.
+
+    With ``processes=True`` (or a ProcessPoolExecutor) the tasks run in a
+    process pool, which sidesteps the GIL but can't use a KeySharePool: key
+    pairs are not picklable, so the workers generate their own and handshakes
+    configured with ``key_shares`` are rejected.
+    """
+
+    def __init__(self, executor: concurrent.futures.Executor | None = None, max_workers: int | None = None,
+                 processes: bool = False, max_pending: int = 64, max_handshakes: int = 256,
+                 policy: AdmissionPolicy = AdmissionPolicy.shed, admission_timeout: float | None = 1.0):
+        if max_pending <= 0 or max_handshakes <= 0:
+            raise ValueError("Handshake executor limits must be positive")
+        self._owns_executor = executor is None
+        self.processes = processes if executor is None else isinstance(executor, concurrent.futures.ProcessPoolExecutor)
+        if executor is None and processes:
+            # Not fork: workers forked mid-flight would inherit the loop's client
+            # sockets and keep them open after the server closes them.
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context('forkserver'))
+        elif executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self.executor = executor
+        self.max_pending = max_pending
+        self.max_handshakes = max_handshakes
+        self.policy = policy
+        self.admission_timeout = admission_timeout
+        self._slots = asyncio.Semaphore(max_handshakes)
+        self._pending = asyncio.Semaphore(max_pending)
+        self.active: int = 0
+        self.admitted: int = 0
+        self.shed: int = 0
+        self.delayed: int = 0
+        self.tasks_run: int = 0
+        self.queued: int = 0
+        self.queue_time: float = 0.0
+        self.task_time: float = 0.0
+
+    @property
+    def saturated(self) -> bool:
+        return self.active >= self.max_handshakes
+
+    async def admit(self) -> bool:
+        """Claim a handshake slot; False means the handshake should be refused. Pair with ``finish``."""
+        slots = self._slots
+        if slots.locked():
+            if self.policy == AdmissionPolicy.shed:
+                self.shed += 1
+                return False
+            self.delayed += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.admission_timeout)
+            except asyncio.TimeoutError:
+                self.shed += 1
+                return False
+        else:
+            await slots.acquire()
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def finish(self) -> None:
+        self.active -= 1
+        self._slots.release()
+
+    async def run(self, task: CryptoTask | Callable[..., Any], *args: Any) -> Any:
+        """Run a crypto task in the executor, waiting for a free submission slot first."""
+        if isinstance(task, CryptoTask):
+            task, args = task.func, task.args
+        if self.processes and task is pooled_key_exchange:
+            raise ValueError(_POOLED_IN_PROCESS)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.queued += 1
+        async with self._pending:
+            self.queued -= 1
+            submitted = time.perf_counter()
+            self.queue_time += submitted - start
+            try:
+                return await loop.run_in_executor(self.executor, task, *args)
+            finally:
+                self.tasks_run += 1
+                self.task_time += time.perf_counter() - submitted
+
+    async def handshake(self, handshake: ServerHandshake, client_hello: HandshakeFrame) -> list[HandshakeFrame]:
+        """Drive ``handshake`` from a ClientHello to the frames of the server's first flight."""
+        if self.processes and handshake.key_shares is not None:
+            raise ValueError(_POOLED_IN_PROCESS)
+        task = handshake.receive_client_hello(client_hello)
+        return handshake.resume(await self.run(task))
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            'active': self.active,
+            'admitted': self.admitted,
+            'shed': self.shed,
+            'delayed': self.delayed,
+            'queued': self.queued,
+            'tasks_run': self.tasks_run,
+            'average_queue_time': self.queue_time / self.tasks_run if self.tasks_run else 0.0,
+            'average_task_time': self.task_time / self.tasks_run if self.tasks_run else 0.0,
+        }
+
+
+def handshake_handler(executor: HandshakeExecutor, then: ConnectionHandler = echo_handler,
+                      handshake_factory: Callable[[], ServerHandshake] = ServerHandshake) -> ConnectionHandler:
+    """Connection handler that answers the ClientHello through ``executor`` before handing over to ``then``.
+
+    Connections arriving while the executor is saturated are closed before
+    any crypto is done for them.
+    """
+    if executor.processes and handshake_factory().key_shares is not None:
+        raise ValueError(_POOLED_IN_PROCESS)
+
+    async def handler(reader: RecordStreamReader, writer: RecordStreamWriter) -> None:
+        reassembler = HandshakeReassembler()
+        client_hello = None
+        while client_hello is None:
+            record = await reader.read_record()
+            if record is None:
+                return
+            if record.type != ContentType.handshake:
+                raise ValueError(f"unexpected_message: {record.type.name} record before ClientHello")
+            for frame in reassembler.feed(record.fragment):
+                if frame.msg_type != HandshakeType.client_hello:
+                    raise ValueError(f"unexpected_message: {frame.msg_type.name} before ClientHello")
+                client_hello = frame
+
+        if not await executor.admit():
+            logger.debug("Shedding handshake from %s", writer.get_extra_info('peername'))
+            writer.close()
+            return
+        try:
+            handshake = handshake_factory()
+            handshake.metrics = writer.metrics
+            frames = await executor.handshake(handshake, client_hello)
+        finally:
+            executor.finish()
+        writer.write_record(ContentType.handshake, b''.join(frame.to_bytes() for frame in frames))
+        await writer.drain()
+        await then(reader, writer)
+
+    return handler
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+import socket
+import struct
+import sys
+from typing import BinaryIO
+
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tls.fragmenter import RecordFragmenter
+from python_tls_implementation.tls.protection import CipherSuite, RecordProtection
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext
+from python_tls_implementation.tls.record_writer import RecordWriter
+from python_tls_implementation.tls.wire import InnerPlaintext
+
+logger = logging.getLogger('tcp_ktls')
+
+# Linux kernel TLS interface (include/uapi/linux/tls.h, Documentation/networking/tls.rst)
+SOL_TLS = 282
+TCP_ULP = 31
+TLS_TX = 1
+TLS_RX = 2
+TLS_SET_RECORD_TYPE = 1
+TLS_GET_RECORD_TYPE = 2
+TLS_1_3_VERSION = 0x0304
+
+# Cipher suite -> (kernel cipher type, salt length). The kernel splits the
+# 12-byte TLS 1.3 IV into a salt and an explicit part, except for ChaCha20.
+KERNEL_CIPHERS: dict[CipherSuite, tuple[int, int]] = {
+    CipherSuite.TLS_AES_128_GCM_SHA256: (51, 4),
+    CipherSuite.TLS_AES_256_GCM_SHA384: (52, 4),
+    CipherSuite.TLS_CHACHA20_POLY1305_SHA256: (54, 0),
+}
+
+_available: bool | None = None
+
+
+def crypto_info(cipher_suite: CipherSuite, key: bytes, iv: bytes, sequence_number: int = 0) -> bytes:
+    """``struct tls12_crypto_info_*`` for one direction: header, iv, key, salt, rec_seq."""
+    cipher_type, salt_length = KERNEL_CIPHERS[cipher_suite]
+    return b''.join((
+        struct.pack('=HH', TLS_1_3_VERSION, cipher_type),
+        iv[salt_length:], key, iv[:salt_length],
+        sequence_number.to_bytes(8, 'big'),
+    ))
+
+
+def kernel_tls_available() -> bool:
+    """True if this kernel can attach the "tls" ULP; probed once on a loopback connection."""
+    global _available
+    if _available is None:
+        _available = False
+        if sys.platform.startswith('linux'):
+            with socket.create_server(('127.0.0.1', 0)) as server, \
+                    socket.create_connection(server.getsockname()) as client:
+                try:
+                    client.setsockopt(socket.IPPROTO_TCP, TCP_ULP, b'tls')
+                    _available = True
+                except OSError as e:
+                    logger.info("Kernel TLS unavailable: %s", e)
+    return _available
+
+
+def enable_kernel_tls(sock: socket.socket, cipher_suite: CipherSuite,
+                      write: tuple[bytes, bytes, int] | None = None,
+                      read: tuple[bytes, bytes, int] | None = None) -> bool:
+    """Hand record protection for ``sock`` to the kernel; ``write``/``read`` are (key, iv, sequence number).
+
+    Must be called once the handshake is done and nothing is left unread in
+    user space. Returns False, leaving the socket untouched, if kernel TLS or
+    the cipher suite isn't supported. Once the ULP is attached the socket
+    can't go back to plain TCP, so a failure to install the keys after that
+    point is raised.
+    """
+    if cipher_suite not in KERNEL_CIPHERS or not kernel_tls_available():
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, TCP_ULP, b'tls')
+    except OSError as e:
+        logger.debug("Could not attach the tls ULP: %s", e)
+        return False
+    if write is not None:
+        sock.setsockopt(SOL_TLS, TLS_TX, crypto_info(cipher_suite, *write))
+    if read is not None:
+        sock.setsockopt(SOL_TLS, TLS_RX, crypto_info(cipher_suite, *read))
+    return True
+
+
+class KernelTLSWriter:
+    """Sends application data on a socket whose TLS_TX state lives in the kernel.
+
+    Plain ``write`` calls and ``sendfile`` are framed into records and
+    encrypted by the kernel; other record types go through ``sendmsg`` with
+    a TLS_SET_RECORD_TYPE control message.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+
+    def write(self, data: bytes | memoryview, content_type: ContentType = ContentType.application_data) -> None:
+        if content_type == ContentType.application_data:
+            self.sock.sendall(data)
+            return
+        # One sendmsg per record type; the kernel splits it at the maximum fragment length
+        control = [(SOL_TLS, TLS_SET_RECORD_TYPE, bytes((content_type.value,)))]
+        view = memoryview(data)
+        while view:
+            sent = self.sock.sendmsg([view], control)
+            view = view[sent:]
+
+    def sendfile(self, file: BinaryIO, offset: int = 0, count: int | None = None) -> int:
+        return self.sock.sendfile(file, offset, count)
+
+
+class PythonTLSWriter:
+    """Fallback with the same interface as KernelTLSWriter: records are sealed in Python."""
+
+    CHUNK_SIZE: int = 2 ** 18
+
+    def __init__(self, sock: socket.socket, protection: RecordProtection,
+                 fragmenter: RecordFragmenter | None = None):
+        self.sock = sock
+        self.protection = protection
+        self.fragmenter = fragmenter or RecordFragmenter()
+        self._writer = RecordWriter()
+
+    def write(self, data: bytes | memoryview, content_type: ContentType = ContentType.application_data) -> None:
+        # Seal and flush CHUNK_SIZE at a time so at most one chunk of ciphertext is held
+        view = memoryview(data)
+        writer = self._writer
+        for offset in range(0, len(view), self.CHUNK_SIZE):
+            inners = self.fragmenter.inner_plaintexts(content_type, view[offset:offset + self.CHUNK_SIZE])
+            for record in self.protection.seal_many(inners):
+                writer.write(record)
+            while writer.pending:
+                writer.flush(self.sock)
+
+    def sendfile(self, file: BinaryIO, offset: int = 0, count: int | None = None) -> int:
+        """Read, seal and send a file in CHUNK_SIZE pieces through one reusable buffer."""
+        buffer = bytearray(self.CHUNK_SIZE)
+        view = memoryview(buffer)
+        file.seek(offset)
+        total = 0
+        while count is None or total < count:
+            wanted = self.CHUNK_SIZE if count is None else min(self.CHUNK_SIZE, count - total)
+            read = file.readinto(view[:wanted])
+            if not read:
+                break
+            self.write(view[:read])
+            total += read
+        file.seek(offset + total)
+        return total
+
+
+class KernelTLSReader:
+    """Receives from a socket whose TLS_RX state lives in the kernel; returns decrypted record contents."""
+
+    def __init__(self, sock: socket.socket, read_size: int = BufferedSocketReader.DEFAULT_READ_SIZE):
+        self.sock = sock
+        self.read_size = read_size
+        self._control_size = socket.CMSG_SPACE(1)
+
+    def read(self) -> InnerPlaintext | None:
+        """Content of one or more records of the same type, or None at EOF."""
+        data, control, _, _ = self.sock.recvmsg(self.read_size, self._control_size)
+        if not data and not control:
+            return None
+        content_type = ContentType.application_data
+        for level, kind, value in control:
+            if level == SOL_TLS and kind == TLS_GET_RECORD_TYPE:
+                content_type = ContentType(value[0])
+        return InnerPlaintext(data, content_type)
+
+
+class PythonTLSReader:
+    """Fallback for KernelTLSReader: reads ciphertext records and opens them in Python."""
+
+    def __init__(self, sock: socket.socket, protection: RecordProtection,
+                 read_size: int = BufferedSocketReader.DEFAULT_READ_SIZE):
+        self.protection = protection
+        self._reader = BufferedSocketReader(sock, read_size, TLSCiphertext)
+
+    def read(self) -> InnerPlaintext | None:
+        record = self._reader.read_record()
+        if record is None:
+            return None
+        return self.protection.open(record)
+
+
+def protected_streams(sock: socket.socket, cipher_suite: CipherSuite,
+                      write: tuple[bytes, bytes, int], read: tuple[bytes, bytes, int],
+                      kernel: bool = True) -> tuple[KernelTLSReader | PythonTLSReader, KernelTLSWriter | PythonTLSWriter]:
+    """(reader, writer) for a connection whose traffic keys are known, in the kernel when possible.
+
+    ``write`` and ``read`` are (key, iv, sequence number) for each direction,
+    e.g. from ``KeySchedule.traffic_keys`` and the current sequence numbers.
+    """
+    if kernel and enable_kernel_tls(sock, cipher_suite, write, read):
+        logger.debug("Kernel TLS enabled for %s", cipher_suite.name)
+        return KernelTLSReader(sock), KernelTLSWriter(sock)
+
+    write_protection = RecordProtection(cipher_suite, write[0], write[1])
+    write_protection.sequence_number = write[2]
+    read_protection = RecordProtection(cipher_suite, read[0], read[1])
+    read_protection.sequence_number = read[2]
+    return PythonTLSReader(sock, read_protection), PythonTLSWriter(sock, write_protection)
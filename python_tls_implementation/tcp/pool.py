@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import logging
+import socket
+import threading
+import time
+from typing import AsyncIterator, Callable, Generic, Iterator, TypeVar
+
+from python_tls_implementation.tcp.async_client import AsyncTCPClient
+from python_tls_implementation.tcp.client import TCPClient
+
+logger = logging.getLogger('tcp_pool')
+
+PoolKey = tuple[str, int, str | None]
+C = TypeVar('C')
+
+
+def socket_alive(sock: socket.socket) -> bool:
+    """True if an idle socket is still open and has nothing unread on it.
+
+    Peeks without blocking: an idle keep-alive connection has no data, so EOF,
+    an error or unsolicited bytes (e.g. a late response) all mean it can't be reused.
+    """
+    try:
+        sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class _IdleConnection(Generic[C]):
+    __slots__ = ('connection', 'since')
+
+    def __init__(self, connection: C, since: float):
+        self.connection = connection
+        self.since = since
+
+
+class _PoolState(Generic[C]):
+    """Bookkeeping shared by the blocking and asyncio pools; callers hold their own lock.
+
+    Idle connections are kept per key oldest first and reused newest first,
+    so a burst leaves the surplus to age out. Methods that drop connections
+    return them for the caller to close outside the lock.
+    """
+
+    def __init__(self, max_per_key: int, max_total: int, idle_timeout: float | None, clock: Callable[[], float]):
+        if max_per_key <= 0 or max_total <= 0:
+            raise ValueError("Pool limits must be positive")
+        self.max_per_key = max_per_key
+        self.max_total = max_total
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.idle: dict[PoolKey, collections.deque[_IdleConnection[C]]] = {}
+        self.open: dict[PoolKey, int] = {}
+        self.leased: dict[C, PoolKey] = {}
+        self.total: int = 0
+        self.closed: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+        self.waits: int = 0
+        self.wait_time: float = 0.0
+        self.timeouts: int = 0
+        self.expired: int = 0
+        self.dead: int = 0
+
+    def pop_idle(self, key: PoolKey, stale: list[C]) -> C | None:
+        idle = self.idle.get(key)
+        if not idle:
+            return None
+        if self.idle_timeout is not None:
+            now = self.clock()
+            while idle and now - idle[0].since >= self.idle_timeout:
+                stale.append(idle.popleft().connection)
+                self.forget(key)
+                self.expired += 1
+        return idle.pop().connection if idle else None
+
+    def reserve(self, key: PoolKey, stale: list[C]) -> bool:
+        """Claim a slot for a new connection to ``key``, evicting another key's idle connection if that's all that's in the way."""
+        if self.open.get(key, 0) >= self.max_per_key:
+            return False
+        if self.total >= self.max_total:
+            oldest_key = None
+            for other_key, idle in self.idle.items():
+                if idle and (oldest_key is None or idle[0].since < self.idle[oldest_key][0].since):
+                    oldest_key = other_key
+            if oldest_key is None:
+                return False
+            stale.append(self.idle[oldest_key].popleft().connection)
+            self.forget(oldest_key)
+        self.open[key] = self.open.get(key, 0) + 1
+        self.total += 1
+        return True
+
+    def forget(self, key: PoolKey) -> None:
+        self.total -= 1
+        self.open[key] -= 1
+        if not self.open[key]:
+            del self.open[key]
+            self.idle.pop(key, None)
+
+    def lease(self, connection: C, key: PoolKey, reused: bool) -> C:
+        self.leased[connection] = key
+        if reused:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return connection
+
+    def give_back(self, connection: C, reusable: bool) -> bool:
+        """Return a leased connection; False means the caller must close it."""
+        key = self.leased.pop(connection, None)
+        if key is None:
+            raise ValueError("Connection was not acquired from this pool")
+        if reusable and not self.closed:
+            self.idle.setdefault(key, collections.deque()).append(_IdleConnection(connection, self.clock()))
+            return True
+        self.forget(key)
+        return False
+
+    def drain_idle(self) -> list[C]:
+        connections = []
+        for key, idle in list(self.idle.items()):
+            while idle:
+                connections.append(idle.popleft().connection)
+                self.forget(key)
+        return connections
+
+    def stats(self) -> dict[str, float]:
+        acquired = self.hits + self.misses
+        return {
+            'open': self.total,
+            'idle': sum(len(idle) for idle in self.idle.values()),
+            'leased': len(self.leased),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / acquired if acquired else 0.0,
+            'waits': self.waits,
+            'wait_time': self.wait_time,
+            'average_wait': self.wait_time / self.waits if self.waits else 0.0,
+            'timeouts': self.timeouts,
+            'expired': self.expired,
+            'dead': self.dead,
+        }
+
+
+class ConnectionPool:
+    """Thread-safe keep-alive pool of connected TCPClients keyed by (host, port, server_name).
+
+    At most ``max_per_key`` connections are open per key and ``max_total``
+    overall. When both are reached ``acquire`` blocks until a connection is
+    released, up to ``timeout`` seconds. Idle connections older than
+    ``idle_timeout`` are dropped, and each one is checked with a
+    non-blocking peek before reuse.
+    """
+
+    def __init__(self, max_per_key: int = 8, max_total: int = 64, idle_timeout: float | None = 60.0,
+                 connect_timeout: float | None = 10.0, clock: Callable[[], float] = time.monotonic):
+        self.connect_timeout = connect_timeout
+        self._state: _PoolState[TCPClient] = _PoolState(max_per_key, max_total, idle_timeout, clock)
+        # Waiters block on different keys, so every change wakes them all to recheck
+        self._condition = threading.Condition()
+
+    def acquire(self, host: str, port: int, server_name: str | None = None,
+                timeout: float | None = None) -> TCPClient:
+        state = self._state
+        key = (host, port, server_name)
+        start = state.clock()
+        waited = False
+        while True:
+            stale: list[TCPClient] = []
+            reserved = False
+            with self._condition:
+                if state.closed:
+                    raise RuntimeError("Connection pool is closed")
+                client = state.pop_idle(key, stale)
+                if client is None:
+                    reserved = state.reserve(key, stale)
+                    if not reserved:
+                        if not waited:
+                            waited = True
+                            state.waits += 1
+                        remaining = None if timeout is None else start + timeout - state.clock()
+                        if remaining is not None and remaining <= 0:
+                            state.timeouts += 1
+                            state.wait_time += state.clock() - start
+                            raise TimeoutError(f"No connection to {host}:{port} available within {timeout}s")
+                        self._condition.wait(remaining)
+            for connection in stale:
+                connection.close()
+
+            if client is not None:
+                if socket_alive(client.socket) and not client.reader.buffered:
+                    return self._lease(client, key, True, waited, start)
+                logger.debug("Dropping dead pooled connection to %s:%s", host, port)
+                client.close()
+                with self._condition:
+                    state.dead += 1
+                    state.forget(key)
+                    self._condition.notify_all()
+            elif reserved:
+                client = TCPClient()
+                if not client.connect(host, port, self.connect_timeout):
+                    self._discard_slot(key)
+                    raise ConnectionError(f"Failed to connect to {host}:{port}")
+                return self._lease(client, key, False, waited, start)
+
+    def _lease(self, client: TCPClient, key: PoolKey, reused: bool, waited: bool, start: float) -> TCPClient:
+        with self._condition:
+            if waited:
+                self._state.wait_time += self._state.clock() - start
+            return self._state.lease(client, key, reused)
+
+    def _discard_slot(self, key: PoolKey) -> None:
+        with self._condition:
+            self._state.forget(key)
+            self._condition.notify_all()
+
+    def release(self, client: TCPClient, reuse: bool = True) -> None:
+        """Hand a connection back; pass ``reuse=False`` if it is in an unknown state (e.g. after an error)."""
+        with self._condition:
+            kept = self._state.give_back(client, reuse and client.connected)
+            self._condition.notify_all()
+        if not kept:
+            client.close()
+
+    @contextlib.contextmanager
+    def connection(self, host: str, port: int, server_name: str | None = None,
+                   timeout: float | None = None) -> Iterator[TCPClient]:
+        client = self.acquire(host, port, server_name, timeout)
+        try:
+            yield client
+        except BaseException:
+            self.release(client, reuse=False)
+            raise
+        self.release(client)
+
+    def close(self) -> None:
+        """Close idle connections; leased ones are closed when released."""
+        with self._condition:
+            self._state.closed = True
+            idle = self._state.drain_idle()
+            self._condition.notify_all()
+        for client in idle:
+            client.close()
+
+    def stats(self) -> dict[str, float]:
+        with self._condition:
+            return self._state.stats()
+
+
+def async_client_alive(client: AsyncTCPClient) -> bool:
+    reader, writer = client.reader, client.writer
+    return (client.connected and not writer.is_closing() and not reader.at_eof()
+            and reader.exception() is None and not reader.buffered)
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of ConnectionPool handing out connected AsyncTCPClients; bound to one event loop."""
+
+    def __init__(self, max_per_key: int = 8, max_total: int = 64, idle_timeout: float | None = 60.0,
+                 connect_timeout: float | None = 10.0, clock: Callable[[], float] = time.monotonic):
+        self.connect_timeout = connect_timeout
+        self._state: _PoolState[AsyncTCPClient] = _PoolState(max_per_key, max_total, idle_timeout, clock)
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, host: str, port: int, server_name: str | None = None,
+                      timeout: float | None = None) -> AsyncTCPClient:
+        state = self._state
+        key = (host, port, server_name)
+        start = state.clock()
+        waited = False
+        while True:
+            stale: list[AsyncTCPClient] = []
+            reserved = False
+            async with self._condition:
+                if state.closed:
+                    raise RuntimeError("Connection pool is closed")
+                client = state.pop_idle(key, stale)
+                if client is None:
+                    reserved = state.reserve(key, stale)
+                    if not reserved:
+                        if not waited:
+                            waited = True
+                            state.waits += 1
+                        remaining = None if timeout is None else start + timeout - state.clock()
+                        try:
+                            if remaining is not None and remaining <= 0:
+                                raise asyncio.TimeoutError
+                            await asyncio.wait_for(self._condition.wait(), remaining)
+                        except asyncio.TimeoutError:
+                            state.timeouts += 1
+                            state.wait_time += state.clock() - start
+                            raise TimeoutError(f"No connection to {host}:{port} available within {timeout}s")
+            for connection in stale:
+                await connection.close()
+
+            if client is not None:
+                if async_client_alive(client):
+                    if waited:
+                        state.wait_time += state.clock() - start
+                    return state.lease(client, key, True)
+                logger.debug("Dropping dead pooled connection to %s:%s", host, port)
+                await client.close()
+                async with self._condition:
+                    state.dead += 1
+                    state.forget(key)
+                    self._condition.notify_all()
+            elif reserved:
+                client = AsyncTCPClient()
+                if not await client.connect(host, port, self.connect_timeout):
+                    async with self._condition:
+                        state.forget(key)
+                        self._condition.notify_all()
+                    raise ConnectionError(f"Failed to connect to {host}:{port}")
+                if waited:
+                    state.wait_time += state.clock() - start
+                return state.lease(client, key, False)
+
+    async def release(self, client: AsyncTCPClient, reuse: bool = True) -> None:
+        async with self._condition:
+            kept = self._state.give_back(client, reuse and async_client_alive(client))
+            self._condition.notify_all()
+        if not kept:
+            await client.close()
+
+    @contextlib.asynccontextmanager
+    async def connection(self, host: str, port: int, server_name: str | None = None,
+                         timeout: float | None = None) -> AsyncIterator[AsyncTCPClient]:
+        client = await self.acquire(host, port, server_name, timeout)
+        try:
+            yield client
+        except BaseException:
+            await self.release(client, reuse=False)
+            raise
+        await self.release(client)
+
+    async def close(self) -> None:
+        async with self._condition:
+            self._state.closed = True
+            idle = self._state.drain_idle()
+            self._condition.notify_all()
+        for client in idle:
+            await client.close()
+
+    def stats(self) -> dict[str, float]:
+        return self._state.stats()
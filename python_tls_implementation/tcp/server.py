@@ -1,17 +1,29 @@
+import asyncio
 import logging
 import socket
 from typing import Any
 
-logging.basicConfig(level=logging.DEBUG)
+from python_tls_implementation.tcp.async_server import AsyncTCPServer, echo_handler
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tcp.streams import ConnectionHandler
+from python_tls_implementation.tcp.workers import PreforkServer
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.record_writer import RecordWriter
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
 logger = logging.getLogger('tcp_server')
 
 
 class TCPServer:
-    def __init__(self, host: str = '127.0.0.1', port: int = 8443):
+    def __init__(self, host: str = '127.0.0.1', port: int = 8443,
+                 read_size: int = BufferedSocketReader.DEFAULT_READ_SIZE, buffer_pool: BufferPool | None = None):
         self.host: str = host
         self.port: int = port
+        self.read_size: int = read_size
+        # Shared receive buffers, checked out per connection only while data is waiting
+        self.buffer_pool = buffer_pool
         self.socket : socket.socket | None = None
-        self.connections: list[socket.socket] = []
+        self.connections: dict[socket.socket, BufferedSocketReader] = {}
 
     def start(self) -> None:
         # Create socket, bind, and start listening
@@ -21,41 +33,59 @@ class TCPServer:
             self.socket.bind((self.host, self.port))
             self.socket.listen(5)
         except Exception as e:
-            logger.error(f"Failed to create socket: {e}")
+            logger.error("Failed to create socket: %s", e)
 
     def accept_connection(self) -> tuple[socket, Any] | None:
         # Accept new client connections
         try:
             client_socket, client_address = self.socket.accept()
-            self.connections.append(client_socket)
+            self.connections[client_socket] = BufferedSocketReader(client_socket, self.read_size, pool=self.buffer_pool)
             return client_socket, client_address
         except Exception as e:
-            logger.error(f"Failed to accept connection: {e}")
+            logger.error("Failed to accept connection: %s", e)
 
 
     def receive_data(self, client_socket) -> Any | None:
         # Receive data from a client
         try:
-            return client_socket.recv(1024)
+            return bytes(self.connections[client_socket].read_some(1024))
         except Exception as e:
-            logger.error(f"Failed to receive data: {e}")
+            logger.error("Failed to receive data: %s", e)
+            self.remove_connection(client_socket)
+
+    def receive_record(self, client_socket) -> PlaintextRecord | CiphertextRecord | None:
+        # Receive one whole record; its fragment is only valid until the next receive
+        try:
+            return self.connections[client_socket].read_record()
+        except Exception as e:
+            logger.error("Failed to receive record: %s", e)
             self.remove_connection(client_socket)
 
     def send_data(self, client_socket, data) -> bool:
         # Send data to a client
         try:
-            client_socket.send(data)
+            client_socket.sendall(data)
             return True
         except Exception as e:
-            logger.error(f"Failed to send data: {e}")
+            logger.error("Failed to send data: %s", e)
+            return False
+
+    def send_records(self, client_socket, writer: RecordWriter) -> bool:
+        # Flush every record queued on the writer with vectored sends
+        try:
+            writer.flush(client_socket)
+            return True
+        except Exception as e:
+            logger.error("Failed to send records: %s", e)
             return False
 
     def close(self) -> None:
-        for conn in self.connections:
+        for conn, reader in self.connections.items():
+            reader.release()
             try:
                 conn.close()
             except Exception as e:
-                logger.error(f"Failed to close connection: {e}")
+                logger.error("Failed to close connection: %s", e)
 
         if self.socket:
             self.socket.close()
@@ -63,32 +93,32 @@ class TCPServer:
         self.connections.clear()
 
     def remove_connection(self, client_socket):
-        if client_socket in self.connections:
-            self.connections.remove(client_socket)
-
-    def run(self):
-        """Run the server in a loop accepting connections."""
-        self.start()
-        logger.info(f"Server started on {self.host}:{self.port}")
-
+        reader = self.connections.pop(client_socket, None)
+        if reader is not None:
+            reader.release()
+
+    def run(self, handler: ConnectionHandler = echo_handler, idle_timeout: float | None = 60.0,
+            workers: int = 1):
+        """Serve connections concurrently on an asyncio event loop until interrupted.
+
+        With ``workers`` > 1 the loop runs in that many SO_REUSEPORT worker processes instead.
+        Every connection reads through ``buffer_pool`` when one is set.
+        """
+        if workers > 1:
+            PreforkServer(self.host, self.port, workers=workers, handler=handler, idle_timeout=idle_timeout,
+                          buffer_pool=self.buffer_pool).run()
+            return
+
+        server = AsyncTCPServer(self.host, self.port, handler=handler, idle_timeout=idle_timeout,
+                                buffer_pool=self.buffer_pool)
         try:
-            while True:
-                conn_info = self.accept_connection()
-                if conn_info:
-                    client_socket, client_addr = conn_info
-                    logger.info(f"Connection from {client_addr[0]}:{client_addr[1]}")
-                    data = self.receive_data(client_socket)
-
-                    if data:
-                        self.send_data(client_socket, data)
-                    else:
-                        self.remove_connection(client_socket)
-
+            asyncio.run(server.serve_forever())
         except KeyboardInterrupt:
             logger.info("Server shutting down...")
         finally:
             self.close()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
     server = TCPServer()
     server.run()
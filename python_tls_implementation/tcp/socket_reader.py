@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import socket
+from typing import Type
+
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.instrumentation import ConnectionMetrics
+from python_tls_implementation.tls.record import RECORD_HEADER_LENGTH, TLSCiphertext, TLSPlaintext, parse_record_header
+from python_tls_implementation.tls.wire import WIRE_TYPES, CiphertextRecord, PlaintextRecord
+
+
+class BufferedSocketReader:
+    """Reads a blocking socket through one reusable buffer filled with ``recv_into``.
+
+    Every syscall asks for at least ``read_size`` bytes, so a 16 KB record
+    usually arrives in a single call instead of sixteen ``recv(1024)`` calls.
+    Results are memoryview slices of the buffer and stay valid until the next
+    read or peek; wrap them in ``bytes()`` to keep them.
+
+    With a ``pool`` the buffer is checked out only while data is waiting: a
+    reader that has drained its buffer gives it back and blocks on a
+    one-byte peek until the peer sends more, so idle connections hold no
+    receive memory.
+    """
+
+    DEFAULT_READ_SIZE: int = 2 ** 16
+
+    def __init__(self, sock: socket.socket, read_size: int = DEFAULT_READ_SIZE,
+                 record_type: Type[TLSPlaintext] | Type[TLSCiphertext] = TLSPlaintext,
+                 pool: BufferPool | None = None):
+        if read_size <= 0:
+            raise ValueError("Read size must be positive")
+        self.sock = sock
+        self.read_size = read_size
+        self.pool = pool
+        self._wire_type = WIRE_TYPES[record_type]
+        self._buffer: bytearray | None = None
+        self._view: memoryview | None = None
+        # True while the current buffer is checked out of the pool
+        self._pooled: bool = False
+        self._probe: bytearray = bytearray(1)
+        if pool is None:
+            # Room for a maximum-size record plus one read beyond it
+            self._buffer = bytearray(read_size + RECORD_HEADER_LENGTH + self._wire_type.MAX_FRAGMENT_LENGTH)
+            self._view = memoryview(self._buffer)
+        self._start: int = 0
+        self._end: int = 0
+        self._eof: bool = False
+        self.read_calls: int = 0
+        self.metrics: ConnectionMetrics | None = None
+
+    @property
+    def buffered(self) -> int:
+        return self._end - self._start
+
+    @property
+    def at_eof(self) -> bool:
+        return self._eof and self._start == self._end
+
+    @property
+    def holds_buffer(self) -> bool:
+        return self._buffer is not None
+
+    def release(self) -> None:
+        """Hand a pool buffer back, dropping anything unread; views handed out are invalid afterwards."""
+        if self.pool is None or self._buffer is None:
+            return
+        if self._pooled:
+            self.pool.release(self._buffer)
+        self._buffer = self._view = None
+        self._pooled = False
+        self._start = self._end = 0
+
+    def _recv_pooled(self, size: int) -> int:
+        # Called with nothing buffered; the buffer is kept while data is flowing
+        if self._buffer is not None:
+            try:
+                return self.sock.recv_into(self._view, 0, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                self.release()
+        if not self.sock.recv_into(self._probe, 1, socket.MSG_PEEK):
+            return 0
+        if size <= self.pool.buffer_size:
+            self._buffer = self.pool.acquire()
+            self._pooled = True
+        else:
+            self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        return self.sock.recv_into(self._view)
+
+    def _fill(self, size: int) -> bool:
+        """Read until at least ``size`` bytes are buffered; False if the peer closed first."""
+        while self._end - self._start < size:
+            if self._eof:
+                return False
+            pending = self._end - self._start
+            if self.pool is not None and not pending:
+                received = self._recv_pooled(size)
+            else:
+                # A pool buffer always has room for a whole record, so only ask for what's missing
+                wanted = size - pending if self._pooled else max(size - pending, self.read_size)
+                if self._end + wanted > len(self._buffer):
+                    if pending + wanted > len(self._buffer):
+                        # A new buffer, so views handed out before stay intact
+                        buffer = bytearray(pending + wanted)
+                        buffer[0:pending] = self._view[self._start:self._end]
+                        if self._pooled:
+                            self.pool.release(self._buffer)
+                            self._pooled = False
+                        self._buffer = buffer
+                        self._view = memoryview(buffer)
+                    else:
+                        self._buffer[0:pending] = self._buffer[self._start:self._end]
+                    self._start, self._end = 0, pending
+                received = self.sock.recv_into(self._view[self._end:])
+            self.read_calls += 1
+            metrics = self.metrics
+            if metrics is not None:
+                metrics.read_calls += 1
+                metrics.bytes_in += received
+            if not received:
+                self._eof = True
+                if not pending:
+                    self.release()
+            self._end += received
+        return True
+
+    def _take(self, size: int) -> memoryview:
+        if not size:
+            return memoryview(b'')
+        start = self._start
+        self._start += size
+        if self._start == self._end:
+            # Nothing left unread: the next read starts at the front again
+            self._start = self._end = 0
+        return self._view[start:start + size]
+
+    def peek(self, size: int = 1) -> memoryview:
+        """Up to ``size`` buffered bytes without consuming them, reading only if fewer are buffered.
+
+        Shorter than ``size`` only when the peer closed the connection.
+        """
+        self._fill(size)
+        if self._view is None:
+            return memoryview(b'')
+        return self._view[self._start:self._start + min(size, self._end - self._start)]
+
+    def read_some(self, max_size: int = DEFAULT_READ_SIZE) -> memoryview:
+        """Whatever is buffered (at most ``max_size`` bytes), or one read's worth; empty at EOF."""
+        if self._start == self._end:
+            self._fill(1)
+        return self._take(min(max_size, self._end - self._start))
+
+    def read_exact(self, size: int) -> memoryview:
+        if not self._fill(size):
+            raise EOFError(f"Connection closed after {self._end - self._start} of {size} bytes")
+        return self._take(size)
+
+    def read_record(self) -> PlaintextRecord | CiphertextRecord | None:
+        """Next complete record, or None if the peer closed the connection on a record boundary."""
+        if not self._fill(RECORD_HEADER_LENGTH):
+            if self._start == self._end:
+                return None
+            raise EOFError("Connection closed in the middle of a record header")
+        content_type, version, length = parse_record_header(self._view, self._start)
+        if length > self._wire_type.MAX_FRAGMENT_LENGTH:
+            raise ValueError(f"Record length {length} exceeds maximum of {self._wire_type.MAX_FRAGMENT_LENGTH} bytes")
+        if not self._fill(RECORD_HEADER_LENGTH + length):
+            raise EOFError(f"Connection closed in the middle of a {length} byte record")
+        record_view = self._take(RECORD_HEADER_LENGTH + length)
+        if self.metrics is not None:
+            self.metrics.records_in += 1
+        return self._wire_type(content_type, version, record_view[RECORD_HEADER_LENGTH:])
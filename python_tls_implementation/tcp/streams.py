@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+from typing import Awaitable, Callable, Type
+
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.fragmenter import RecordSizer
+from python_tls_implementation.tls.instrumentation import ConnectionMetrics, Instrumentation, default_instrumentation
+from python_tls_implementation.tls.record import (
+    RECORD_HEADER_LENGTH,
+    ContentType,
+    ProtocolVersion,
+    TLSCiphertext,
+    TLSPlaintext,
+    pack_record_header,
+)
+from python_tls_implementation.tls.record_reader import RecordReader
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
+logger = logging.getLogger('tcp_streams')
+
+
+class RecordStreamReader:
+    """Consumer side of a connection: hands out complete records as they arrive."""
+
+    def __init__(self, protocol: RecordProtocol, limit: int, low_water: int | None = None):
+        self._protocol = protocol
+        self._limit = limit
+        self._low_water = limit // 2 if low_water is None else low_water
+        self._records: collections.deque[PlaintextRecord | CiphertextRecord] = collections.deque()
+        self._buffered: int = 0
+        self._eof: bool = False
+        self._exception: Exception | None = None
+        self._waiter: asyncio.Future | None = None
+
+    def _wakeup(self) -> None:
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def feed_record(self, record: PlaintextRecord | CiphertextRecord, size: int) -> None:
+        self._records.append(record)
+        self._buffered += size
+        if self._buffered > self._limit:
+            self._protocol.pause_reading()
+        self._wakeup()
+
+    def feed_eof(self) -> None:
+        self._eof = True
+        self._wakeup()
+
+    def set_exception(self, exc: Exception) -> None:
+        self._exception = exc
+        self._wakeup()
+
+    def at_eof(self) -> bool:
+        return self._eof and not self._records
+
+    @property
+    def buffered(self) -> int:
+        """Payload bytes received but not yet read."""
+        return self._buffered
+
+    def exception(self) -> Exception | None:
+        return self._exception
+
+    async def read_record(self) -> PlaintextRecord | CiphertextRecord | None:
+        """Return the next record, or None once the peer has closed the connection."""
+        while not self._records:
+            if self._exception is not None:
+                raise self._exception
+            if self._eof:
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+
+        record = self._records.popleft()
+        self._buffered -= record.length
+        if self._buffered <= self._low_water:
+            self._protocol.resume_reading()
+        return record
+
+    def __aiter__(self) -> RecordStreamReader:
+        return self
+
+    async def __anext__(self) -> PlaintextRecord | CiphertextRecord:
+        record = await self.read_record()
+        if record is None:
+            raise StopAsyncIteration
+        return record
+
+
+class RecordStreamWriter:
+    """Producer side of a connection: frames payloads into records on the transport."""
+
+    def __init__(self, transport: asyncio.Transport, protocol: RecordProtocol,
+                 version: ProtocolVersion = ProtocolVersion.TLS_1_2, sizer: RecordSizer | None = None):
+        self.transport = transport
+        self._protocol = protocol
+        self.version = version
+        self.sizer = sizer
+
+    def write_record(self, content_type: ContentType, payload: bytes | memoryview) -> None:
+        if len(payload) > TLSCiphertext.MAX_FRAGMENT_LENGTH:
+            raise ValueError(f"Record payload of {len(payload)} bytes exceeds {TLSCiphertext.MAX_FRAGMENT_LENGTH} bytes")
+        self.transport.writelines((pack_record_header(content_type, self.version, len(payload)), payload))
+        metrics = self._protocol.metrics
+        if metrics is not None:
+            metrics.records_out += 1
+            metrics.write_calls += 1
+            metrics.bytes_out += RECORD_HEADER_LENGTH + len(payload)
+
+    def write(self, data: bytes | memoryview, content_type: ContentType = ContentType.application_data) -> None:
+        # Split arbitrary application writes into maximum-size records, or as the sizer says
+        view = memoryview(data)
+        max_length = TLSPlaintext.MAX_FRAGMENT_LENGTH
+        sizer = self.sizer
+        if sizer is None:
+            for offset in range(0, len(view), max_length):
+                self.write_record(content_type, view[offset:offset + max_length])
+            return
+        offset = 0
+        while offset < len(view):
+            chunk = view[offset:offset + min(sizer.record_size(), max_length)]
+            self.write_record(content_type, chunk)
+            sizer.sent(len(chunk))
+            offset += len(chunk)
+
+    async def drain(self) -> None:
+        await self._protocol.drain()
+
+    def is_closing(self) -> bool:
+        return self.transport.is_closing()
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def wait_closed(self) -> None:
+        await self._protocol.closed
+
+    @property
+    def metrics(self) -> ConnectionMetrics | None:
+        return self._protocol.metrics
+
+    def get_extra_info(self, name: str, default=None):
+        return self.transport.get_extra_info(name, default)
+
+
+ConnectionHandler = Callable[[RecordStreamReader, RecordStreamWriter], Awaitable[None]]
+
+
+class RecordProtocol(asyncio.BufferedProtocol):
+    """Runs the record layer for one connection and exposes it as a reader/writer pair.
+
+    The connection is aborted after ``idle_timeout`` seconds without inbound
+    data. The transport reads straight into the record reader's buffer: a
+    private one per connection by default, or with a ``buffer_pool`` (one
+    per event loop) one checked out only while a record is incomplete.
+    Records are copied out before they are queued; reading is paused once
+    more than ``limit`` bytes are waiting for the consumer and resumed at
+    ``low_water``, and idle connections also stop reading while the pool is
+    above its high water.
+    """
+
+    DEFAULT_LIMIT: int = 2 ** 18
+
+    def __init__(self, handler: ConnectionHandler | None = None,
+                 record_type: Type[TLSPlaintext] | Type[TLSCiphertext] = TLSPlaintext,
+                 idle_timeout: float | None = None, limit: int = DEFAULT_LIMIT,
+                 on_connection_lost: Callable[[RecordProtocol], None] | None = None,
+                 instrumentation: Instrumentation = default_instrumentation,
+                 record_sizer: Callable[[], RecordSizer] | None = None,
+                 buffer_pool: BufferPool | None = None, low_water: int | None = None):
+        self._handler = handler
+        self._buffer_pool = buffer_pool
+        self._record_reader = RecordReader(record_type, pool=buffer_pool)
+        self._idle_timeout = idle_timeout
+        self._limit = limit
+        self._low_water = low_water
+        self._on_connection_lost = on_connection_lost
+        self._instrumentation = instrumentation
+        self._record_sizer = record_sizer
+        self._loop = asyncio.get_running_loop()
+        self._last_activity: float = 0.0
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._paused_writing: bool = False
+        self._paused_reading: bool = False
+        self._paused_for_pool: bool = False
+        self._transport_paused: bool = False
+        self._discarding: bool = False
+        self._drain_waiter: asyncio.Future | None = None
+        self.closed: asyncio.Future = self._loop.create_future()
+        self.transport: asyncio.Transport | None = None
+        self.reader: RecordStreamReader | None = None
+        self.writer: RecordStreamWriter | None = None
+        self.task: asyncio.Task | None = None
+        self.metrics: ConnectionMetrics | None = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.metrics = self._instrumentation.connection_opened(transport.get_extra_info('peername'))
+        self.reader = RecordStreamReader(self, self._limit, self._low_water)
+        self.writer = RecordStreamWriter(transport, self, sizer=self._record_sizer() if self._record_sizer else None)
+        if self._idle_timeout is not None:
+            self._last_activity = self._loop.time()
+            self._idle_handle = self._loop.call_later(self._idle_timeout, self._check_idle)
+        if self._buffer_pool is not None:
+            self._buffer_pool.add_listener(self._pool_pressure)
+            if self._buffer_pool.under_pressure:
+                self._pool_pressure(True)
+        if self._handler is not None:
+            self.task = self._loop.create_task(self._run_handler())
+
+    async def _run_handler(self) -> None:
+        try:
+            await self._handler(self.reader, self.writer)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            logger.info("Connection closed after idle timeout")
+        except Exception as e:
+            logger.error("Connection handler failed: %s", e)
+        finally:
+            self.transport.close()
+
+    def _check_idle(self) -> None:
+        # One timer per connection, re-armed lazily instead of on every read
+        remaining = self._last_activity + self._idle_timeout - self._loop.time()
+        if remaining > 0:
+            self._idle_handle = self._loop.call_later(remaining, self._check_idle)
+            return
+        self._idle_handle = None
+        self.reader.set_exception(TimeoutError("Connection idle timeout"))
+        self.transport.abort()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        try:
+            return self._record_reader.get_buffer(sizehint)
+        except MemoryError as e:
+            # Over the pool's hard cap: shed this connection rather than grow
+            logger.warning("Dropping connection: %s", e)
+            self._discarding = True
+            self.reader.set_exception(e)
+            self.transport.abort()
+            return memoryview(bytearray(RECORD_HEADER_LENGTH))
+
+    def buffer_updated(self, nbytes: int) -> None:
+        if self._discarding:
+            return
+        self._record_reader.buffer_updated(nbytes)
+        self._records_received(nbytes)
+
+    def data_received(self, data: bytes) -> None:
+        self._record_reader.feed(data)
+        self._records_received(len(data))
+
+    def _records_received(self, nbytes: int) -> None:
+        if self._idle_timeout is not None:
+            self._last_activity = self._loop.time()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.read_calls += 1
+            metrics.bytes_in += nbytes
+        try:
+            for record in self._record_reader:
+                if metrics is not None:
+                    metrics.records_in += 1
+                # Fragments point into the shared receive buffer and are
+                # overwritten by the next feed(), so the queued copy owns its bytes.
+                if isinstance(record, PlaintextRecord):
+                    record.fragment = bytes(record.fragment)
+                else:
+                    record.encrypted_record = bytes(record.encrypted_record)
+                self.reader.feed_record(record, record.length)
+        except ValueError as e:
+            logger.error("Malformed record from peer: %s", e)
+            self.reader.set_exception(e)
+            self.transport.abort()
+            return
+        pool = self._buffer_pool
+        if pool is not None:
+            self._record_reader.release()
+            if pool.under_pressure and not self._record_reader.holds_buffer:
+                self._pool_pressure(True)
+
+    def _pool_pressure(self, pressure: bool) -> None:
+        # Connections in the middle of a record keep reading so they can hand their buffer back
+        if pressure and self._record_reader.holds_buffer:
+            return
+        self._paused_for_pool = pressure
+        self._update_reading()
+
+    def eof_received(self) -> bool:
+        self.reader.feed_eof()
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self._buffer_pool is not None:
+            self._buffer_pool.remove_listener(self._pool_pressure)
+            self._record_reader.release(force=True)
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self.reader is not None:
+            if exc is not None:
+                self.reader.set_exception(exc)
+            else:
+                self.reader.feed_eof()
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(exc or ConnectionResetError("Connection lost"))
+        if not self.closed.done():
+            self.closed.set_result(None)
+        if self.metrics is not None:
+            self.metrics.close()
+        if self._on_connection_lost is not None:
+            self._on_connection_lost(self)
+
+    def _update_reading(self) -> None:
+        # Reading stays paused while either the consumer or the buffer pool asks for it
+        paused = self._paused_reading or self._paused_for_pool
+        if paused != self._transport_paused and not self.transport.is_closing():
+            self._transport_paused = paused
+            if paused:
+                self.transport.pause_reading()
+            else:
+                self.transport.resume_reading()
+
+    def pause_reading(self) -> None:
+        self._paused_reading = True
+        self._update_reading()
+
+    def resume_reading(self) -> None:
+        self._paused_reading = False
+        self._update_reading()
+
+    def pause_writing(self) -> None:
+        self._paused_writing = True
+
+    def resume_writing(self) -> None:
+        self._paused_writing = False
+        waiter = self._drain_waiter
+        if waiter is not None:
+            self._drain_waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def drain(self) -> None:
+        if self.transport.is_closing():
+            # Yield so a lost connection is reported before more data is queued
+            await asyncio.sleep(0)
+            if self.closed.done():
+                raise ConnectionResetError("Connection lost")
+        if not self._paused_writing:
+            return
+        self._drain_waiter = self._loop.create_future()
+        await self._drain_waiter
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from typing import Type
+
+from python_tls_implementation.tcp.async_server import AsyncTCPServer, echo_handler
+from python_tls_implementation.tcp.streams import ConnectionHandler
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.record import TLSCiphertext, TLSPlaintext
+
+logger = logging.getLogger('tcp_workers')
+
+# Layout of each worker's slot in the shared stats array
+_STAT_FIELDS = ('pid', 'accepted', 'active', 'updated_at')
+_STATS_INTERVAL = 1.0
+
+
+def _worker_main(index: int, server_kwargs: dict, stats) -> None:
+    server = AsyncTCPServer(reuse_port=True, **server_kwargs)
+    base = index * len(_STAT_FIELDS)
+
+    def publish() -> None:
+        stats[base:base + len(_STAT_FIELDS)] = [os.getpid(), server.accepted, len(server.connections), time.time()]
+
+    async def report_stats() -> None:
+        while True:
+            publish()
+            await asyncio.sleep(_STATS_INTERVAL)
+
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        serving = asyncio.current_task()
+
+        def stop() -> None:
+            # Ctrl-C reaches workers directly and the supervisor follows up with
+            # SIGTERM; only the first signal may cancel, or it would cut the drain short.
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(sig)
+                signal.signal(sig, signal.SIG_IGN)
+            serving.cancel()
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop)
+        reporter = loop.create_task(report_stats())
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            reporter.cancel()
+            publish()
+
+    asyncio.run(main())
+
+
+class PreforkServer:
+    """Runs AsyncTCPServer in N worker processes that all bind the same port with SO_REUSEPORT.
+
+    The kernel spreads incoming connections across the workers. The supervisor
+    restarts workers that die and, on SIGINT/SIGTERM, asks each worker to drain
+    its connections for up to ``shutdown_timeout`` seconds before killing it.
+    Each worker gets its own copy of ``buffer_pool``, so its limits apply
+    per worker.
+    """
+
+    RESTART_BACKOFF: float = 1.0
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8443, workers: int | None = None,
+                 handler: ConnectionHandler = echo_handler,
+                 record_type: Type[TLSPlaintext] | Type[TLSCiphertext] = TLSPlaintext,
+                 idle_timeout: float | None = 60.0, shutdown_timeout: float = 5.0,
+                 buffer_pool: BufferPool | None = None):
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+        self.host: str = host
+        self.port: int = port
+        self.workers: int = workers or os.cpu_count() or 1
+        self.shutdown_timeout = shutdown_timeout
+        self._server_kwargs = dict(
+            host=host, port=port, handler=handler, record_type=record_type,
+            idle_timeout=idle_timeout, shutdown_timeout=shutdown_timeout, buffer_pool=buffer_pool,
+        )
+        # fork keeps arbitrary handlers usable without requiring them to be picklable
+        self._context = multiprocessing.get_context('fork')
+        self._stats = self._context.Array('d', self.workers * len(_STAT_FIELDS), lock=False)
+        self._processes: list[multiprocessing.Process | None] = [None] * self.workers
+        self._last_start: list[float] = [0.0] * self.workers
+        self.restarts: int = 0
+        self._stopping: bool = False
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self._server_kwargs, self._stats),
+            name=f"tls-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+        self._last_start[index] = time.monotonic()
+        logger.info("Started worker %s (pid %s)", index, process.pid)
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            self._spawn(index)
+
+    def stats(self) -> list[dict[str, float]]:
+        """Latest counters published by each worker."""
+        width = len(_STAT_FIELDS)
+        return [
+            dict(zip(_STAT_FIELDS, self._stats[index * width:(index + 1) * width]))
+            for index in range(self.workers)
+        ]
+
+    def supervise(self, poll_interval: float = 1.0) -> None:
+        """Block, restarting dead workers, until stop() is called or a signal arrives."""
+        while not self._stopping:
+            sentinels = {process.sentinel: index for index, process in enumerate(self._processes) if process}
+            for sentinel in wait(list(sentinels), timeout=poll_interval):
+                if self._stopping:
+                    break
+                index = sentinels[sentinel]
+                process = self._processes[index]
+                process.join()
+                logger.error("Worker %s (pid %s) exited with code %s", index, process.pid, process.exitcode)
+                # Avoid a tight crash loop if a worker dies right after starting
+                delay = self._last_start[index] + self.RESTART_BACKOFF - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.restarts += 1
+                self._spawn(index)
+
+    def stop(self) -> None:
+        """Ask every worker to drain and exit, killing those that outlive the grace period."""
+        self._stopping = True
+        alive = [process for process in self._processes if process is not None and process.is_alive()]
+        for process in alive:
+            process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout + 1.0
+        for process in alive:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.error("Worker pid %s did not drain in time, killing it", process.pid)
+                process.kill()
+                process.join()
+        self._processes = [None] * self.workers
+
+    def run(self) -> None:
+        def request_stop(signum, frame):
+            self._stopping = True
+
+        previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        self.start()
+        logger.info("Supervisor running %s workers on %s:%s", self.workers, self.host, self.port)
+        try:
+            self.supervise()
+        finally:
+            logger.info("Server shutting down...")
+            self.stop()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
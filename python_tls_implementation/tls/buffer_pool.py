@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from python_tls_implementation.tls.record import RECORD_HEADER_LENGTH, TLSCiphertext
+
+logger = logging.getLogger('tls_buffer_pool')
+
+# Room for one maximum-size ciphertext record, so a partial record always fits
+RECORD_BUFFER_SIZE = RECORD_HEADER_LENGTH + TLSCiphertext.MAX_FRAGMENT_LENGTH
+
+PressureListener = Callable[[bool], None]
+
+
+class BufferPool:
+    """Fixed-size receive buffers shared by the connections of one event loop or thread.
+
+    A connection checks a buffer out only while it has unparsed bytes and
+    hands it back as soon as it is drained, so idle connections hold no
+    receive memory at all and busy ones reuse the same few buffers instead of
+    allocating per read.
+
+    Memory is bounded at three levels. Once the bytes checked out reach
+    ``high_water``, registered listeners are told to stop reading from new
+    data (connections in the middle of a record keep going so they can hand
+    their buffer back); when usage falls to ``low_water`` they are told to
+    resume. ``max_bytes`` is a hard cap: ``acquire`` past it raises
+    MemoryError. At most ``max_free`` released buffers are kept for reuse.
+
+    Not thread-safe, and listeners run on the caller's thread: give each
+    event loop or thread its own pool.
+    """
+
+    DEFAULT_MAX_BYTES: int = 2 ** 28
+
+    def __init__(self, buffer_size: int = RECORD_BUFFER_SIZE, max_bytes: int = DEFAULT_MAX_BYTES,
+                 high_water: int | None = None, low_water: int | None = None, max_free: int | None = None):
+        if buffer_size < RECORD_BUFFER_SIZE:
+            raise ValueError(f"Buffer size must be at least {RECORD_BUFFER_SIZE} bytes to hold a whole record")
+        self.buffer_size = buffer_size
+        self.max_buffers = max_bytes // buffer_size
+        if self.max_buffers <= 0:
+            raise ValueError(f"Buffer pool cap of {max_bytes} bytes is smaller than one buffer")
+        self.high_water = self.max_buffers * 3 // 4 if high_water is None else high_water // buffer_size
+        self.low_water = self.high_water // 2 if low_water is None else low_water // buffer_size
+        if not 0 <= self.low_water < self.high_water <= self.max_buffers:
+            raise ValueError("Buffer pool watermarks must satisfy 0 <= low_water < high_water <= max_bytes")
+        self.max_free = self.low_water if max_free is None else max_free
+        self._free: list[bytearray] = []
+        self._listeners: set[PressureListener] = set()
+        self.in_use: int = 0
+        self.under_pressure: bool = False
+        self.allocated: int = 0
+        self.reused: int = 0
+        self.peak_in_use: int = 0
+        self.pressure_events: int = 0
+        self.refused: int = 0
+
+    @property
+    def bytes_in_use(self) -> int:
+        return self.in_use * self.buffer_size
+
+    @property
+    def free(self) -> int:
+        return len(self._free)
+
+    def add_listener(self, listener: PressureListener) -> None:
+        """Call ``listener(True)`` when the pool crosses high water and ``listener(False)`` when it recovers."""
+        self._listeners.add(listener)
+
+    def remove_listener(self, listener: PressureListener) -> None:
+        self._listeners.discard(listener)
+
+    def _notify(self, pressure: bool) -> None:
+        self.under_pressure = pressure
+        for listener in list(self._listeners):
+            listener(pressure)
+
+    def acquire(self) -> bytearray:
+        if self.in_use >= self.max_buffers:
+            self.refused += 1
+            raise MemoryError(f"Buffer pool exhausted: {self.in_use} buffers of {self.buffer_size} bytes in use")
+        if self._free:
+            buffer = self._free.pop()
+            self.reused += 1
+        else:
+            buffer = bytearray(self.buffer_size)
+            self.allocated += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+        if self.in_use >= self.high_water and not self.under_pressure:
+            self.pressure_events += 1
+            logger.info("Buffer pool above high water (%s buffers in use), pausing idle readers", self.in_use)
+            self._notify(True)
+        return buffer
+
+    def release(self, buffer: bytearray) -> None:
+        if len(buffer) != self.buffer_size:
+            raise ValueError(f"Buffer of {len(buffer)} bytes does not belong to this pool")
+        self.in_use -= 1
+        if len(self._free) < self.max_free:
+            self._free.append(buffer)
+        if self.under_pressure and self.in_use <= self.low_water:
+            logger.info("Buffer pool back at low water (%s buffers in use), resuming readers", self.in_use)
+            self._notify(False)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'buffer_size': self.buffer_size,
+            'in_use': self.in_use,
+            'free': len(self._free),
+            'peak_in_use': self.peak_in_use,
+            'allocated': self.allocated,
+            'reused': self.reused,
+            'pressure_events': self.pressure_events,
+            'refused': self.refused,
+        }
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """Bounded mapping with least-recently-used eviction and per-entry time-to-live.
+
+    ``clock`` defaults to time.monotonic; entries past their deadline are
+    dropped lazily when looked up and counted as expirations.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None, clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self._lookup(key, touch=False) is not None
+
+    def _lookup(self, key: K, touch: bool) -> tuple[V, float | None] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        deadline = entry[1]
+        if deadline is not None and self.clock() >= deadline:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        if touch:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        entry = self._lookup(key, touch=True)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, key: K, default: V | None = None) -> V | None:
+        """Look up an entry without refreshing its recency or touching the counters."""
+        entry = self._lookup(key, touch=False)
+        return default if entry is None else entry[0]
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """Remove and return an entry, e.g. for single-use values."""
+        entry = self._lookup(key, touch=False)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        del self._entries[key]
+        return entry[0]
+
+    def put(self, key: K, value: V, ttl: float | None = None) -> None:
+        if ttl is None:
+            ttl = self.ttl
+        self._entries[key] = (value, None if ttl is None else self.clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def purge_expired(self) -> int:
+        now = self.clock()
+        expired = [key for key, (_, deadline) in self._entries.items() if deadline is not None and now >= deadline]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
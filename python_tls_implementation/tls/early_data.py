@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+import time
+from typing import Callable
+
+from python_tls_implementation.tls.resumption import TicketState
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.2.10
+# https://datatracker.ietf.org/doc/html/rfc8446#section-8
+
+_HASH_PAIR = struct.Struct('<QQ')
+
+
+class EarlyDataBudget:
+    """Byte budget for the early data of one connection, bounded by max_early_data_size.
+
+    The client uses ``take`` to cut what it wants to send down to what the
+    ticket allows (the rest waits for 1-RTT keys); the server uses ``consume``
+    for every early data record it decrypts, or skips when early data was
+    rejected, and must abort the handshake once the budget is exceeded.
+    """
+    __slots__ = ('limit', 'used')
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.limit - self.used
+
+    def take(self, data: bytes | memoryview) -> memoryview:
+        view = memoryview(data)[:self.limit - self.used]
+        self.used += len(view)
+        return view
+
+    def consume(self, length: int) -> None:
+        self.used += length
+        if self.used > self.limit:
+            raise ValueError(f"unexpected_message: {self.used} bytes of early data exceed "
+                             f"max_early_data_size of {self.limit} bytes")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 128-bit digests, using double hashing for the k bit positions."""
+    __slots__ = ('bits', 'size', 'hash_count')
+
+    def __init__(self, size: int, hash_count: int):
+        self.size = size
+        self.hash_count = hash_count
+        self.bits = bytearray((size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> BloomFilter:
+        size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        return cls(size, max(1, round(size / capacity * math.log(2))))
+
+    def _positions(self, digest: bytes) -> list[int]:
+        h1, h2 = _HASH_PAIR.unpack(digest)
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, digest: bytes) -> None:
+        bits = self.bits
+        for position in self._positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        bits = self.bits
+        for position in self._positions(digest):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def clear(self) -> None:
+        self.bits[:] = bytes(len(self.bits))
+
+
+class AntiReplayWindow:
+    """Remembers the ClientHellos that carried early data over the last ``window`` seconds.
+
+    The window is split into time buckets, each with its own Bloom filter;
+    when time moves past a bucket it is cleared and reused, so memory is fixed
+    by ``capacity`` (ClientHellos expected per window) and the false positive
+    rate, however long the server runs. A false positive only turns 0-RTT
+    into a 1-RTT handshake. Entries are keyed on the PSK binder, which is
+    unique per ClientHello and cannot be produced without the PSK.
+    """
+
+    def __init__(self, window: float = 10.0, capacity: int = 100_000, buckets: int = 6,
+                 false_positive_rate: float = 1e-6, clock: Callable[[], float] = time.monotonic):
+        if buckets < 2:
+            raise ValueError("Anti-replay window needs at least 2 buckets")
+        self.window = window
+        self.clock = clock
+        # One bucket beyond the window so the oldest live one always covers a full window
+        self.bucket_period = window / (buckets - 1)
+        bucket_capacity = max(1, math.ceil(capacity / (buckets - 1)))
+        self._filters = [BloomFilter.for_capacity(bucket_capacity, false_positive_rate) for _ in range(buckets)]
+        self._epoch = int(clock() // self.bucket_period)
+        self._key = os.urandom(16)
+        self.recorded: int = 0
+        self.replays: int = 0
+
+    @property
+    def memory(self) -> int:
+        return sum(len(bloom.bits) for bloom in self._filters)
+
+    def _rotate(self) -> BloomFilter:
+        epoch = int(self.clock() // self.bucket_period)
+        buckets = len(self._filters)
+        if epoch != self._epoch:
+            for stale in range(max(self._epoch + 1, epoch - buckets + 1), epoch + 1):
+                self._filters[stale % buckets].clear()
+            self._epoch = epoch
+        return self._filters[epoch % buckets]
+
+    def check_and_record(self, binder: bytes) -> bool:
+        """True the first time a binder is seen within the window, False for a (probable) replay."""
+        current = self._rotate()
+        # Keyed so clients can't aim for collisions in the filters
+        digest = hashlib.blake2b(binder, digest_size=16, key=self._key).digest()
+        for bloom in self._filters:
+            if digest in bloom:
+                self.replays += 1
+                return False
+        current.add(digest)
+        self.recorded += 1
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {'recorded': self.recorded, 'replays': self.replays, 'memory': self.memory}
+
+
+class EarlyDataAcceptor:
+    """Server-side decision whether to accept the early data offered with a resumed ClientHello.
+
+    Early data is only considered for the first PSK identity and is accepted
+    when both the server and the ticket allow it, the client's view of the
+    ticket age agrees with the server's within the anti-replay window, and the
+    ClientHello has not been seen within that window (RFC 8446, section 8.3).
+    """
+
+    def __init__(self, max_early_data_size: int, anti_replay: AntiReplayWindow | None = None,
+                 clock: Callable[[], float] = time.time):
+        self.max_early_data_size = max_early_data_size
+        self.anti_replay = anti_replay or AntiReplayWindow()
+        self.clock = clock
+        self.accepted: int = 0
+        self.rejected: int = 0
+
+    def accept(self, state: TicketState, obfuscated_ticket_age: int, binder: bytes,
+               selected_identity: int = 0) -> EarlyDataBudget | None:
+        """Budget for the early data to read, or None when it has to be skipped."""
+        limit = min(self.max_early_data_size, state.max_early_data_size)
+        server_age_ms = (self.clock() - state.issued_at) * 1000
+        skew_ms = abs(server_age_ms - state.client_ticket_age_ms(obfuscated_ticket_age))
+        if (selected_identity != 0 or limit <= 0
+                or skew_ms > self.anti_replay.window * 1000
+                or not self.anti_replay.check_and_record(binder)):
+            self.rejected += 1
+            return None
+        self.accepted += 1
+        return EarlyDataBudget(limit)
+
+    def skip_budget(self) -> EarlyDataBudget:
+        """Budget for skipping the records of rejected early data before the handshake continues."""
+        return EarlyDataBudget(self.max_early_data_size)
+
+    def stats(self) -> dict[str, int]:
+        return {'accepted': self.accepted, 'rejected': self.rejected, **self.anti_replay.stats()}
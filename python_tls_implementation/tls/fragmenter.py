@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterator
+
+from python_tls_implementation.tls.record import ContentType, ProtocolVersion, TLSPlaintext
+from python_tls_implementation.tls.record_writer import RecordWriter
+from python_tls_implementation.tls.wire import InnerPlaintext, PlaintextRecord
+
+# RFC 8446, section 5.4: content plus padding of a TLSInnerPlaintext must not exceed 2^14 octets
+MAX_INNER_CONTENT_LENGTH = 2 ** 14
+
+
+class PaddingPolicy:
+    """Decides how many zero octets follow the content type of each TLSInnerPlaintext."""
+
+    def padding_for(self, content_length: int) -> int:
+        return 0
+
+    def max_content_length(self, limit: int) -> int:
+        """Largest content length whose padded form still fits in ``limit`` octets; <= 0 if none does."""
+        return limit
+
+
+class NoPadding(PaddingPolicy):
+    pass
+
+
+class BlockPadding(PaddingPolicy):
+    """Pads every TLSInnerPlaintext (content type octet included) to a multiple of ``block_size``."""
+
+    def __init__(self, block_size: int):
+        if not 0 < block_size <= MAX_INNER_CONTENT_LENGTH:
+            raise ValueError(f"Block size must be between 1 and {MAX_INNER_CONTENT_LENGTH}")
+        self.block_size = block_size
+
+    def padding_for(self, content_length: int) -> int:
+        return -(content_length + 1) % self.block_size
+
+    def max_content_length(self, limit: int) -> int:
+        # Largest multiple of the block that holds content + type octet + padding
+        return (limit + 1) // self.block_size * self.block_size - 1
+
+
+class FixedSizePadding(PaddingPolicy):
+    """Pads every record's content to exactly ``record_size`` octets, hiding write sizes."""
+
+    def __init__(self, record_size: int):
+        if not 0 < record_size <= MAX_INNER_CONTENT_LENGTH:
+            raise ValueError(f"Record size must be between 1 and {MAX_INNER_CONTENT_LENGTH}")
+        self.record_size = record_size
+
+    def padding_for(self, content_length: int) -> int:
+        return self.record_size - content_length
+
+    def max_content_length(self, limit: int) -> int:
+        # Every record is padded to record_size, so it fits whole or not at all
+        return self.record_size if self.record_size <= limit else 0
+
+
+def _unchanged(limit: int) -> int:
+    return limit
+
+
+class RecordSizer:
+    """Dynamic record sizing: small records while a connection is cold, full-size ones once it is busy.
+
+    A fresh or idle connection gets records that fit in one TCP segment
+    (``small_size`` octets of content), so the peer can decrypt the first
+    bytes without waiting for a 16 KB record to arrive in full. After
+    ``boost_bytes`` have been sent, or ``boost_after`` seconds of continuous
+    sending, records grow to ``max_size`` to save per-record CPU and header
+    overhead. Going idle for ``idle_timeout`` seconds starts over, since the
+    congestion window has likely shrunk as well.
+    """
+
+    # Conservative TCP payload per segment (IPv6, options, tunnels) minus the
+    # record header, content type octet and AEAD tag
+    DEFAULT_SMALL_SIZE: int = 1208 - 5 - 1 - 16
+    DEFAULT_BOOST_BYTES: int = 2 ** 17
+
+    def __init__(self, small_size: int = DEFAULT_SMALL_SIZE, max_size: int = MAX_INNER_CONTENT_LENGTH,
+                 boost_bytes: int = DEFAULT_BOOST_BYTES, boost_after: float | None = 1.0,
+                 idle_timeout: float | None = 1.0, clock: Callable[[], float] = time.monotonic):
+        if not 0 < small_size <= max_size <= MAX_INNER_CONTENT_LENGTH:
+            raise ValueError(f"Record sizes must satisfy 0 < small_size <= max_size <= {MAX_INNER_CONTENT_LENGTH}")
+        self.small_size = small_size
+        self.max_size = max_size
+        self.boost_bytes = boost_bytes
+        self.boost_after = boost_after
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.boosted: bool = False
+        self._sent_since_reset: int = 0
+        self._started_at: float | None = None
+        self._last_write: float = 0.0
+        self.resets: int = 0
+
+    def limit(self, max_content_length: int | None) -> None:
+        """Apply the peer's negotiated limit (see ``peer_fragment_limit``); None means no limit."""
+        if max_content_length is None:
+            return
+        self.max_size = min(self.max_size, max_content_length)
+        self.small_size = min(self.small_size, self.max_size)
+
+    def record_size(self) -> int:
+        """Content length for the next record."""
+        now = self.clock()
+        if self._started_at is None:
+            self._started_at = now
+        elif self.idle_timeout is not None and now - self._last_write >= self.idle_timeout:
+            if self.boosted or self._sent_since_reset:
+                self.resets += 1
+            self.boosted = False
+            self._sent_since_reset = 0
+            self._started_at = now
+        self._last_write = now
+        if not self.boosted and (self._sent_since_reset >= self.boost_bytes or (
+                self.boost_after is not None and now - self._started_at >= self.boost_after)):
+            self.boosted = True
+        return self.max_size if self.boosted else self.small_size
+
+    def sent(self, length: int) -> None:
+        self._sent_since_reset += length
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'record_size': self.max_size if self.boosted else self.small_size,
+            'boosted': int(self.boosted),
+            'sent_since_reset': self._sent_since_reset,
+            'resets': self.resets,
+        }
+
+
+class RecordFragmenter:
+    """Splits arbitrarily large writes into record-sized fragments without copying the data.
+
+    Every fragment is a memoryview slice of the caller's buffer, so the buffer
+    must stay unchanged until the fragments have been serialized or sent.
+    With a ``sizer``, each fragment's size is asked for as it is produced
+    (and capped at ``max_fragment_length``); otherwise every fragment but the
+    last is ``max_fragment_length`` long.
+    """
+
+    def __init__(self, padding: PaddingPolicy | None = None,
+                 max_fragment_length: int = TLSPlaintext.MAX_FRAGMENT_LENGTH, sizer: RecordSizer | None = None):
+        if not 0 < max_fragment_length <= MAX_INNER_CONTENT_LENGTH:
+            raise ValueError(f"Maximum fragment length must be between 1 and {MAX_INNER_CONTENT_LENGTH}")
+        padding = padding or NoPadding()
+        if padding.max_content_length(max_fragment_length) <= 0:
+            raise ValueError(f"Padded records do not fit the maximum fragment length of {max_fragment_length}")
+        self.padding = padding
+        self.max_fragment_length = max_fragment_length
+        self.sizer = sizer
+
+    def _chunks(self, data: bytes | bytearray | memoryview,
+                step_for: Callable[[int], int] | None = None) -> Iterator[memoryview]:
+        """Slices of ``data``; ``step_for`` maps a record size limit to the content length that fits it."""
+        if step_for is None:
+            step_for = _unchanged
+        view = memoryview(data)
+        sizer = self.sizer
+        if sizer is None:
+            full_step = step_for(self.max_fragment_length)
+            for offset in range(0, len(view), full_step):
+                yield view[offset:offset + full_step]
+            return
+        # Small records are only a preference; the sizer's max_size carries the peer's limit
+        limit = min(sizer.max_size, self.max_fragment_length)
+        limit_step = step_for(limit)
+        if limit_step <= 0:
+            raise ValueError(f"Padded records do not fit the record size limit of {limit}")
+        offset, size = 0, len(view)
+        while offset < size:
+            step = step_for(min(sizer.record_size(), limit))
+            if step <= 0:
+                # Padding blocks larger than a small record: padding wins, up to the limit
+                step = limit_step
+            chunk = view[offset:offset + step]
+            sizer.sent(len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+    def inner_plaintexts(self, content_type: ContentType,
+                         data: bytes | bytearray | memoryview) -> Iterator[InnerPlaintext]:
+        """Fragments ready for record protection, padded according to the policy."""
+        padding = self.padding
+        padding_for = padding.padding_for
+        for chunk in self._chunks(data, padding.max_content_length):
+            yield InnerPlaintext(chunk, content_type, padding_for(len(chunk)))
+
+    def plaintext_records(self, content_type: ContentType, data: bytes | bytearray | memoryview,
+                          version: ProtocolVersion = ProtocolVersion.TLS_1_2) -> Iterator[PlaintextRecord]:
+        """Unprotected records (before traffic keys exist), which carry no padding."""
+        for chunk in self._chunks(data):
+            yield PlaintextRecord(content_type, version, chunk)
+
+    def write(self, writer: RecordWriter, content_type: ContentType, data: bytes | bytearray | memoryview,
+              version: ProtocolVersion = ProtocolVersion.TLS_1_2) -> int:
+        """Queue ``data`` on ``writer`` as unprotected records; returns the number of records."""
+        count = 0
+        for chunk in self._chunks(data):
+            writer.write_record(content_type, chunk, version)
+            count += 1
+        return count
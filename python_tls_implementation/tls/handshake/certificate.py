@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Iterable, Sequence, Type
+
+from pydantic import BaseModel
+
+from python_tls_implementation.tls.cache import LRUCache
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionRegistry
+from python_tls_implementation.tls.handshake.extensions.compress_certificate import CertificateCompressionAlgorithm
+from python_tls_implementation.tls.handshake.messages import HandshakeMessage, HandshakeType, T
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# uint24 length fields bound both the message and its uncompressed size
+MAX_CERTIFICATE_MESSAGE_LENGTH = 2 ** 24 - 1
+
+
+# Implementation based on RFC8446 and RFC8879
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.4.2
+# https://datatracker.ietf.org/doc/html/rfc8879#section-4
+
+class CertificateEntry(BaseModel):
+    # X.509 only; RawPublicKey (RFC 7250) is not supported
+    cert_data: bytes
+    extensions: list[Extension] = []
+
+    def to_bytes(self) -> bytes:
+        extensions_bytes = b''.join(ext.to_bytes() for ext in self.extensions)
+        return b''.join((
+            struct.pack('!I', len(self.cert_data))[1:], self.cert_data,
+            struct.pack('!H', len(extensions_bytes)), extensions_bytes,
+        ))
+
+
+class Certificate(HandshakeMessage):
+    msg_type: HandshakeType = HandshakeType.certificate
+    msg_type_value = HandshakeType.certificate
+    certificate_request_context: bytes = b''
+    certificate_list: list[CertificateEntry] = []
+
+    def _body_bytes(self) -> bytes:
+        entries = b''.join(entry.to_bytes() for entry in self.certificate_list)
+        return b''.join((
+            bytes((len(self.certificate_request_context),)), self.certificate_request_context,
+            struct.pack('!I', len(entries))[1:], entries,
+        ))
+
+    @classmethod
+    def parse(cls: Type[T], body: bytes) -> T:
+        if len(body) < 4:
+            raise ValueError("Certificate message too short")
+        context_length = body[0]
+        offset = 1 + context_length
+        if offset + 3 > len(body):
+            raise ValueError("Message truncated before certificate_list")
+        certificate_request_context = body[1:offset]
+        list_length = int.from_bytes(body[offset:offset + 3], byteorder='big')
+        offset += 3
+        if offset + list_length != len(body):
+            raise ValueError("Certificate list length does not match message length")
+
+        view = memoryview(body)
+        entries = []
+        while offset < len(body):
+            if offset + 3 > len(body):
+                raise ValueError("Certificate entry truncated")
+            cert_length = int.from_bytes(body[offset:offset + 3], byteorder='big')
+            offset += 3
+            if cert_length == 0 or offset + cert_length + 2 > len(body):
+                raise ValueError("Certificate entry truncated in cert_data")
+            cert_data = body[offset:offset + cert_length]
+            offset += cert_length
+            extensions_length = int.from_bytes(body[offset:offset + 2], byteorder='big')
+            offset += 2
+            if offset + extensions_length > len(body):
+                raise ValueError("Certificate entry extensions exceed message length")
+            extensions = ExtensionRegistry.parse_all(view[offset:offset + extensions_length])
+            offset += extensions_length
+            entries.append(CertificateEntry(cert_data=cert_data, extensions=extensions))
+
+        return cls(certificate_request_context=certificate_request_context, certificate_list=entries)
+
+
+def _brotli_decompress(data: bytes, limit: int) -> bytes:
+    decompressor = brotli.Decompressor()
+    # The limit stops decoding after the output block that reaches it, so trim the rest
+    return decompressor.process(data, output_buffer_limit=limit)[:limit]
+
+
+def _zlib_decompress(data: bytes, limit: int) -> bytes:
+    return zlib.decompressobj().decompress(data, limit)
+
+
+def _zstd_decompress(data: bytes, limit: int) -> bytes:
+    # decompress(max_output_size=...) ignores the cap when the frame declares its content size
+    with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+        return reader.read(limit)
+
+
+def _brotli_limits_output() -> bool:
+    # output_buffer_limit only exists since brotli 1.2; without it decompression is unbounded
+    try:
+        brotli.Decompressor().process(b'', output_buffer_limit=1)
+    except TypeError:
+        return False
+    return True
+
+
+# Algorithm -> (compress, decompress capped at a given output size). Compression
+# runs once per chain, so every algorithm is used at its strongest setting.
+_CODECS = {
+    CertificateCompressionAlgorithm.zlib: (lambda data: zlib.compress(data, 9), _zlib_decompress),
+}
+if brotli is not None and _brotli_limits_output():
+    _CODECS[CertificateCompressionAlgorithm.brotli] = (lambda data: brotli.compress(data, quality=11), _brotli_decompress)
+if zstandard is not None:
+    _CODECS[CertificateCompressionAlgorithm.zstd] = (
+        lambda data: zstandard.ZstdCompressor(level=19).compress(data), _zstd_decompress)
+
+AVAILABLE_ALGORITHMS: tuple[CertificateCompressionAlgorithm, ...] = tuple(_CODECS)
+
+
+def compress_certificate(body: bytes, algorithm: CertificateCompressionAlgorithm) -> bytes:
+    """Compress an encoded Certificate message body (the handshake header is not included)."""
+    codec = _CODECS.get(algorithm)
+    if codec is None:
+        raise ValueError(f"Certificate compression algorithm {algorithm!r} is not available")
+    return codec[0](body)
+
+
+def decompress_certificate(data: bytes, algorithm: int, uncompressed_length: int) -> bytes:
+    """Inverse of ``compress_certificate``; never inflates past ``uncompressed_length``.
+
+    Anything that does not decompress to exactly the announced length is a
+    bad_certificate (RFC 8879, section 4).
+    """
+    codec = _CODECS.get(algorithm)
+    if codec is None:
+        raise ValueError(f"bad_certificate: unsupported compression algorithm {algorithm}")
+    if not 0 < uncompressed_length <= MAX_CERTIFICATE_MESSAGE_LENGTH:
+        raise ValueError(f"bad_certificate: invalid uncompressed_length {uncompressed_length}")
+    try:
+        # One byte of slack tells a message that is too long from one that is exact
+        body = codec[1](data, uncompressed_length + 1)
+    except Exception as e:
+        raise ValueError(f"bad_certificate: certificate decompression failed: {e}") from e
+    if len(body) != uncompressed_length:
+        raise ValueError(f"bad_certificate: decompressed to {len(body)} bytes, expected {uncompressed_length}")
+    return body
+
+
+class CompressedCertificate(HandshakeMessage):
+    msg_type: HandshakeType = HandshakeType.compressed_certificate
+    msg_type_value = HandshakeType.compressed_certificate
+    algorithm: int
+    uncompressed_length: int
+    compressed_certificate_message: bytes
+
+    def _body_bytes(self) -> bytes:
+        return b''.join((
+            struct.pack('!H', self.algorithm), struct.pack('!I', self.uncompressed_length)[1:],
+            struct.pack('!I', len(self.compressed_certificate_message))[1:], self.compressed_certificate_message,
+        ))
+
+    @classmethod
+    def parse(cls: Type[T], body: bytes) -> T:
+        if len(body) < 8:
+            raise ValueError("CompressedCertificate message too short")
+        algorithm = int.from_bytes(body[0:2], byteorder='big')
+        uncompressed_length = int.from_bytes(body[2:5], byteorder='big')
+        compressed_length = int.from_bytes(body[5:8], byteorder='big')
+        if compressed_length == 0 or 8 + compressed_length != len(body):
+            raise ValueError("CompressedCertificate length does not match message length")
+        return cls(algorithm=algorithm, uncompressed_length=uncompressed_length,
+                   compressed_certificate_message=body[8:])
+
+    @classmethod
+    def compress(cls, certificate_body: bytes, algorithm: CertificateCompressionAlgorithm) -> CompressedCertificate:
+        return cls(algorithm=algorithm, uncompressed_length=len(certificate_body),
+                   compressed_certificate_message=compress_certificate(certificate_body, algorithm))
+
+    def decompress(self) -> Certificate:
+        return Certificate.parse(decompress_certificate(
+            self.compressed_certificate_message, self.algorithm, self.uncompressed_length))
+
+
+class CachedCertificateChain:
+    """A server certificate chain whose Certificate message is encoded once and compressed ahead of time.
+
+    ``frame`` is the plain Certificate and ``compressed`` maps each available
+    algorithm to its CompressedCertificate, smallest first; algorithms that
+    don't shrink the message are left out. The frames are never modified, so
+    one instance serves every handshake that presents this chain.
+    """
+    __slots__ = ('certificates', 'frame', 'compressed')
+
+    def __init__(self, certificates: Sequence[bytes], extensions: Sequence[list[Extension]] | None = None,
+                 algorithms: Iterable[CertificateCompressionAlgorithm] = AVAILABLE_ALGORITHMS):
+        if not certificates:
+            raise ValueError("Certificate chain must not be empty")
+        if extensions is None:
+            extensions = [[] for _ in certificates]
+        elif len(extensions) != len(certificates):
+            raise ValueError("Need one extensions list per certificate")
+        self.certificates: tuple[bytes, ...] = tuple(certificates)
+        # The server's Certificate always has an empty certificate_request_context
+        body = Certificate(certificate_list=[
+            CertificateEntry(cert_data=cert_data, extensions=entry_extensions)
+            for cert_data, entry_extensions in zip(certificates, extensions)
+        ])._body_bytes()
+        if len(body) > MAX_CERTIFICATE_MESSAGE_LENGTH:
+            raise ValueError(f"Certificate message of {len(body)} bytes exceeds {MAX_CERTIFICATE_MESSAGE_LENGTH} bytes")
+        self.frame = HandshakeFrame(HandshakeType.certificate, body)
+
+        compressed = []
+        for algorithm in algorithms:
+            message = CompressedCertificate.compress(body, algorithm)
+            frame = HandshakeFrame(HandshakeType.compressed_certificate, message._body_bytes())
+            if frame.length < len(body):
+                compressed.append((algorithm, frame))
+        compressed.sort(key=lambda item: item[1].length)
+        self.compressed: dict[CertificateCompressionAlgorithm, HandshakeFrame] = dict(compressed)
+
+    def frame_for(self, peer_algorithms: Iterable[int] = ()) -> HandshakeFrame:
+        """The smallest message the peer can read, given the algorithms from its compress_certificate extension."""
+        peer_algorithms = set(peer_algorithms)
+        for algorithm, frame in self.compressed.items():
+            if algorithm in peer_algorithms:
+                return frame
+        return self.frame
+
+
+class CertificateCache:
+    """CachedCertificateChain per DER chain, so each chain is encoded and compressed once per process."""
+
+    def __init__(self, max_size: int = 64, algorithms: Iterable[CertificateCompressionAlgorithm] = AVAILABLE_ALGORITHMS):
+        self.algorithms = tuple(algorithms)
+        self._chains: LRUCache[tuple[bytes, ...], CachedCertificateChain] = LRUCache(max_size)
+
+    def __len__(self) -> int:
+        return len(self._chains)
+
+    def get(self, certificates: Sequence[bytes]) -> CachedCertificateChain:
+        key = tuple(certificates)
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = CachedCertificateChain(key, algorithms=self.algorithms)
+            self._chains.put(key, chain)
+        return chain
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'chains': len(self._chains),
+            'hits': self._chains.hits,
+            'misses': self._chains.misses,
+            'evictions': self._chains.evictions,
+        }
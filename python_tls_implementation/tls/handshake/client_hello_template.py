@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import struct
+
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import ExtensionType
+from python_tls_implementation.tls.handshake.wire import HANDSHAKE_HEADER_LENGTH
+
+_RANDOM_OFFSET = HANDSHAKE_HEADER_LENGTH + 2
+_RANDOM_LENGTH = 32
+_SESSION_ID_OFFSET = _RANDOM_OFFSET + _RANDOM_LENGTH + 1
+
+
+class ClientHelloTemplate:
+    """A ClientHello serialized once, from which per-connection hellos are stamped out.
+
+    The configuration (cipher suites, extensions, ...) goes through the regular
+    serializer a single time. ``build`` then copies the template and patches
+    only the per-connection fields in place: random, legacy_session_id,
+    key_share public values, PSK ticket ages and binders. The values passed in
+    must have the same lengths as the ones in the template hello, which keeps
+    the output byte-identical to serializing the equivalent ClientHello.
+    """
+
+    def __init__(self, client_hello: ClientHello):
+        message = client_hello.to_bytes()
+        view = ClientHelloView.from_message(message)
+        base = HANDSHAKE_HEADER_LENGTH
+
+        self.session_id_length: int = len(client_hello.legacy_session_id)
+        self.key_shares: dict[int, tuple[int, int]] = {}
+        self.ticket_ages: list[int] = []
+        self.binders: list[tuple[int, int]] = []
+        self.binders_offset: int | None = None
+
+        location = view.extension_location(ExtensionType.key_share)
+        if location is not None:
+            offset, length = location
+            offset += base
+            end = offset + length
+            offset += 2
+            while offset + 4 <= end:
+                group, key_length = struct.unpack_from('!HH', message, offset)
+                self.key_shares[group] = (offset + 4, key_length)
+                offset += 4 + key_length
+
+        location = view.extension_location(ExtensionType.pre_shared_key)
+        if location is not None:
+            offset, length = location
+            offset += base
+            if offset + length != len(message):
+                raise ValueError("pre_shared_key must be the last extension in the ClientHello")
+            identities_end = offset + 2 + struct.unpack_from('!H', message, offset)[0]
+            offset += 2
+            while offset < identities_end:
+                identity_length = struct.unpack_from('!H', message, offset)[0]
+                offset += 2 + identity_length
+                self.ticket_ages.append(offset)
+                offset += 4
+            # Binders are computed over the hello truncated right before this point (RFC 8446, section 4.2.11.2)
+            self.binders_offset = identities_end
+            offset = identities_end + 2
+            while offset < len(message):
+                binder_length = message[offset]
+                self.binders.append((offset + 1, binder_length))
+                offset += 1 + binder_length
+
+        self.template: bytes = message
+
+    @staticmethod
+    def _patch(hello: bytearray, offset: int, length: int, value: bytes, name: str) -> None:
+        if len(value) != length:
+            raise ValueError(f"{name} must be {length} bytes, got {len(value)}")
+        hello[offset:offset + length] = value
+
+    def build(self, random_value: bytes, legacy_session_id: bytes | None = None,
+              key_shares: dict[int, bytes] | None = None, obfuscated_ticket_ages: list[int] | None = None,
+              binders: list[bytes] | None = None) -> bytearray:
+        """Stamp out a full ClientHello handshake message (header included)."""
+        hello = bytearray(self.template)
+        self._patch(hello, _RANDOM_OFFSET, _RANDOM_LENGTH, random_value, "Random")
+        if legacy_session_id is not None:
+            self._patch(hello, _SESSION_ID_OFFSET, self.session_id_length, legacy_session_id, "Session id")
+        if key_shares:
+            for group, key_exchange in key_shares.items():
+                location = self.key_shares.get(group)
+                if location is None:
+                    raise ValueError(f"Template has no key share for group {group:#06x}")
+                self._patch(hello, *location, key_exchange, f"Key share for group {group:#06x}")
+        if obfuscated_ticket_ages is not None:
+            if len(obfuscated_ticket_ages) != len(self.ticket_ages):
+                raise ValueError(f"Template has {len(self.ticket_ages)} PSK identities")
+            for offset, age in zip(self.ticket_ages, obfuscated_ticket_ages):
+                struct.pack_into('!I', hello, offset, age)
+        if binders is not None:
+            self.patch_binders(hello, binders)
+        return hello
+
+    def patch_binders(self, hello: bytearray, binders: list[bytes]) -> None:
+        """Fill in PSK binders once they have been computed over ``hello[:binders_offset]``."""
+        if len(binders) != len(self.binders):
+            raise ValueError(f"Template has {len(self.binders)} PSK binders")
+        for (offset, length), binder in zip(self.binders, binders):
+            self._patch(hello, offset, length, binder, "PSK binder")
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import struct
+
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionRegistry, ExtensionType
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.wire import HANDSHAKE_HEADER_LENGTH
+from python_tls_implementation.tls.record import PROTOCOL_VERSIONS, ProtocolVersion
+
+_EXTENSION_HEADER = struct.Struct('!HH')
+
+
+class ClientHelloView:
+    """Read-only ClientHello that indexes the message in one pass and decodes fields on demand.
+
+    Construction only validates the length fields and records where each
+    extension lives (type -> (offset, length)); nothing is copied or decoded
+    until it is asked for. Servers that only look at a handful of extensions
+    (SNI, ALPN, supported_versions, key_share) skip the rest entirely.
+    """
+    __slots__ = ('_view', '_session_id_offset', '_cipher_suites_offset', '_cipher_suites_length',
+                 '_compression_offset', '_extensions', '_decoded')
+
+    def __init__(self, body: bytes | bytearray | memoryview):
+        view = memoryview(body)
+        size = len(view)
+        if size < 38:
+            raise ValueError("ClientHello message too short")
+
+        offset = 34
+        session_id_length = view[offset]
+        self._session_id_offset = offset + 1
+        offset += 1 + session_id_length
+
+        if offset + 2 > size:
+            raise ValueError("Message truncated before cipher suites")
+        cipher_suites_length = (view[offset] << 8) | view[offset + 1]
+        if cipher_suites_length % 2 != 0:
+            raise ValueError("Cipher suites length must be even")
+        self._cipher_suites_offset = offset + 2
+        self._cipher_suites_length = cipher_suites_length
+        offset += 2 + cipher_suites_length
+
+        if offset + 1 > size:
+            raise ValueError("Message truncated in cipher suites")
+        self._compression_offset = offset
+        offset += 1 + view[offset]
+        if offset > size:
+            raise ValueError("Message truncated in compression methods")
+
+        extensions: dict[int, tuple[int, int]] = {}
+        if offset < size:
+            if offset + 2 > size:
+                raise ValueError("Message truncated in extensions length")
+            extensions_end = offset + 2 + ((view[offset] << 8) | view[offset + 1])
+            if extensions_end > size:
+                raise ValueError("Extensions block exceeds message length")
+            offset += 2
+            unpack_from = _EXTENSION_HEADER.unpack_from
+            while offset + 4 <= extensions_end:
+                extension_type, length = unpack_from(view, offset)
+                offset += 4
+                if offset + length > extensions_end:
+                    raise ValueError(f"Extension {extension_type} exceeds extensions block")
+                if extension_type in extensions:
+                    raise ValueError(f"Duplicate extension type: {extension_type}")
+                extensions[extension_type] = (offset, length)
+                offset += length
+            if offset != extensions_end:
+                raise ValueError("Trailing bytes in extensions block")
+
+        self._view = view
+        self._extensions = extensions
+        self._decoded: dict[int, Extension | None] = {}
+
+    @classmethod
+    def from_message(cls, data: bytes | bytearray | memoryview) -> ClientHelloView:
+        """Build a view from a full handshake message, header included."""
+        view = memoryview(data)
+        if len(view) < HANDSHAKE_HEADER_LENGTH or view[0] != HandshakeType.client_hello.value:
+            raise ValueError("Not a ClientHello handshake message")
+        length = struct.unpack_from('!I', view)[0] & 0xFFFFFF
+        if len(view) < HANDSHAKE_HEADER_LENGTH + length:
+            raise ValueError("Incomplete ClientHello message")
+        return cls(view[HANDSHAKE_HEADER_LENGTH:HANDSHAKE_HEADER_LENGTH + length])
+
+    @property
+    def legacy_version(self) -> ProtocolVersion:
+        version = PROTOCOL_VERSIONS.get((self._view[0] << 8) | self._view[1])
+        if version is None:
+            raise ValueError(f"Invalid legacy version: {self._view[0:2].hex()}")
+        return version
+
+    @property
+    def random_value(self) -> bytes:
+        return bytes(self._view[2:34])
+
+    @property
+    def legacy_session_id(self) -> bytes:
+        start = self._session_id_offset
+        return bytes(self._view[start:start + self._view[start - 1]])
+
+    @property
+    def cipher_suites(self) -> tuple[int, ...]:
+        return struct.unpack_from(f'!{self._cipher_suites_length // 2}H', self._view, self._cipher_suites_offset)
+
+    @property
+    def legacy_compression_methods(self) -> list[int]:
+        start = self._compression_offset + 1
+        return list(self._view[start:start + self._view[start - 1]])
+
+    @property
+    def extension_types(self) -> list[int]:
+        return list(self._extensions)
+
+    def has_extension(self, extension_type: int) -> bool:
+        return extension_type in self._extensions
+
+    def extension_location(self, extension_type: int) -> tuple[int, int] | None:
+        """(offset, length) of the extension_data of ``extension_type`` within the body."""
+        return self._extensions.get(extension_type)
+
+    def extension_data(self, extension_type: int) -> memoryview | None:
+        """Raw extension_data of ``extension_type`` as a view into the message, without decoding."""
+        location = self._extensions.get(extension_type)
+        if location is None:
+            return None
+        offset, length = location
+        return self._view[offset:offset + length]
+
+    def extension(self, extension_type: int) -> Extension | None:
+        """Decode a single extension through ExtensionRegistry the first time it is requested."""
+        if extension_type in self._decoded:
+            return self._decoded[extension_type]
+        data = self.extension_data(extension_type)
+        if data is None:
+            return None
+        extension = ExtensionRegistry.decode(extension_type, bytes(data))
+        self._decoded[extension_type] = extension
+        return extension
+
+    @property
+    def server_name(self) -> str | None:
+        """host_name from the server_name extension (RFC 6066, section 3)."""
+        data = self.extension_data(ExtensionType.server_name)
+        if data is None or len(data) < 2:
+            return None
+        offset, end = 2, min(len(data), 2 + ((data[0] << 8) | data[1]))
+        while offset + 3 <= end:
+            name_type = data[offset]
+            length = (data[offset + 1] << 8) | data[offset + 2]
+            offset += 3
+            if name_type == 0:
+                return bytes(data[offset:offset + length]).decode('ascii')
+            offset += length
+        return None
+
+    @property
+    def alpn_protocols(self) -> list[bytes]:
+        """ProtocolNameList from the ALPN extension (RFC 7301, section 3.1)."""
+        data = self.extension_data(ExtensionType.application_layer_protocol_negotiation)
+        if data is None or len(data) < 2:
+            return []
+        protocols = []
+        offset, end = 2, min(len(data), 2 + ((data[0] << 8) | data[1]))
+        while offset < end:
+            length = data[offset]
+            protocols.append(bytes(data[offset + 1:offset + 1 + length]))
+            offset += 1 + length
+        return protocols
+
+    @property
+    def supported_versions(self) -> tuple[int, ...]:
+        """Raw 16-bit versions offered in supported_versions (RFC 8446, section 4.2.1)."""
+        data = self.extension_data(ExtensionType.supported_versions)
+        if data is None or len(data) < 1:
+            return ()
+        count = min(data[0], len(data) - 1) // 2
+        return struct.unpack_from(f'!{count}H', data, 1)
+
+    @property
+    def compress_certificate_algorithms(self) -> tuple[int, ...]:
+        """Raw 16-bit algorithms from compress_certificate (RFC 8879, section 3)."""
+        data = self.extension_data(ExtensionType.compress_certificate)
+        if data is None or len(data) < 1:
+            return ()
+        count = min(data[0], len(data) - 1) // 2
+        return struct.unpack_from(f'!{count}H', data, 1)
+
+    @property
+    def key_shares(self) -> dict[int, memoryview]:
+        """Named group -> key_exchange from the key_share extension (RFC 8446, section 4.2.8)."""
+        data = self.extension_data(ExtensionType.key_share)
+        if data is None or len(data) < 2:
+            return {}
+        shares = {}
+        offset, end = 2, min(len(data), 2 + ((data[0] << 8) | data[1]))
+        while offset + 4 <= end:
+            group, length = _EXTENSION_HEADER.unpack_from(data, offset)
+            offset += 4
+            shares[group] = data[offset:offset + length]
+            offset += length
+        return shares
+
+    def to_client_hello(self) -> ClientHello:
+        """Fully decoded (and validated) ClientHello model."""
+        return ClientHello.parse(bytes(self._view))
@@ -1,11 +1,14 @@
+import struct
 from typing import Type
 
-from python_tls_implementation.tls.handshake.extensions.base import Extension
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionRegistry
 from python_tls_implementation.tls.handshake.messages import HandshakeMessage, T, HandshakeType
-from python_tls_implementation.tls.record import ProtocolVersion
+from python_tls_implementation.tls.record import PROTOCOL_VERSIONS, ProtocolVersion
 
 
 class ClientHello(HandshakeMessage):
+    msg_type: HandshakeType = HandshakeType.client_hello
+    msg_type_value = HandshakeType.client_hello
     legacy_version: ProtocolVersion = ProtocolVersion.TLS_1_2
     random_value: bytes
     legacy_session_id: bytes = b''
@@ -13,12 +16,8 @@ class ClientHello(HandshakeMessage):
     legacy_compression_methods: list[int] = [0]
     extensions: list[Extension] = []
 
-    def __init__(self):
-        super().__init__()
-        self.msg_type = HandshakeType.client_hello
-
     def _body_bytes(self) -> bytes:
-        version_bytes = self.legacy_version.value.to_bytes(2, byteorder='big')
+        version_bytes = ProtocolVersion.to_bytes(self.legacy_version.value)
         session_id_bytes = bytes([len(self.legacy_session_id)]) + self.legacy_session_id
         cipher_suites_bytes = b''.join(cs.to_bytes(2, byteorder='big') for cs in self.cipher_suites)
         cipher_suites_bytes = len(cipher_suites_bytes).to_bytes(2, byteorder='big') + cipher_suites_bytes
@@ -39,7 +38,9 @@ class ClientHello(HandshakeMessage):
             raise ValueError("ClientHello message too short")
 
         offset = 0
-        legacy_version = ProtocolVersion(int.from_bytes(body[offset:offset + 2], byteorder='big'))
+        legacy_version = PROTOCOL_VERSIONS.get(int.from_bytes(body[offset:offset + 2], byteorder='big'))
+        if legacy_version is None:
+            raise ValueError(f"Invalid legacy version: {body[offset:offset + 2].hex()}")
         offset += 2
         random_value = body[offset:offset + 32]
         offset += 32
@@ -52,14 +53,10 @@ class ClientHello(HandshakeMessage):
 
         if cipher_suites_len % 2 != 0:
             raise ValueError("Cipher suites length must be even")
+        if offset + cipher_suites_len > len(body):
+            raise ValueError("Message truncated in cipher suites")
 
-        cipher_suites = []
-        for i in range(0, cipher_suites_len, 2):
-            if offset + i + 1 >= len(body):
-                raise ValueError("Message truncated in cipher suites")
-            cipher_suite = int.from_bytes(body[offset:offset + 2], byteorder='big')
-            cipher_suites.append(cipher_suite)
-
+        cipher_suites = list(struct.unpack_from(f'!{cipher_suites_len // 2}H', body, offset))
         offset += cipher_suites_len
         compression_len = body[offset]
         offset += 1
@@ -70,22 +67,30 @@ class ClientHello(HandshakeMessage):
         if offset < len(body):
             extensions_len = int.from_bytes(body[offset:offset + 2], byteorder='big')
             offset += 2
+            if offset + extensions_len > len(body):
+                raise ValueError("Extensions block exceeds message length")
+            extensions = ExtensionRegistry.parse_all(memoryview(body)[offset:offset + extensions_len])
+
+        return cls(
+            legacy_version=legacy_version,
+            random_value=random_value,
+            legacy_session_id=legacy_session_id,
+            cipher_suites=cipher_suites,
+            legacy_compression_methods=compression_methods,
+            extensions=extensions,
+        )
+
+
+class EndOfEarlyData(HandshakeMessage):
+    # https://datatracker.ietf.org/doc/html/rfc8446#section-4.5
+    msg_type: HandshakeType = HandshakeType.end_of_early_data
+    msg_type_value = HandshakeType.end_of_early_data
 
-            extensions_end = offset + extensions_len
-            while offset < extensions_end:
-                from python_tls_implementation.tls.handshake.extensions.base import ExtensionRegistry
-                extension, remaining = ExtensionRegistry.parse(body[offset:extensions_end])
-                if extension is None:
-                    break
-                extensions.append(extension)
-                offset = extensions_end - len(remaining)
-
-        client_hello = cls()
-        client_hello.legacy_version = legacy_version
-        client_hello.random_value = random_value
-        client_hello.legacy_session_id = legacy_session_id
-        client_hello.cipher_suites = cipher_suites
-        client_hello.legacy_compression_methods = compression_methods
-        client_hello.extensions = extensions
-
-        return client_hello
+    def _body_bytes(self) -> bytes:
+        return b''
+
+    @classmethod
+    def parse(cls: Type[T], body: bytes) -> T:
+        if body:
+            raise ValueError("EndOfEarlyData message must be empty")
+        return cls()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import struct
 from enum import IntEnum
 from typing import ClassVar, Type, Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class ExtensionType(IntEnum):
@@ -11,6 +12,7 @@ class ExtensionType(IntEnum):
     max_fragment_length = 1
     status_request = 5
     supported_groups = 10
+    ec_point_formats = 11
     signature_algorithms = 13
     use_srtp = 14
     heartbeat = 15
@@ -19,6 +21,10 @@ class ExtensionType(IntEnum):
     client_certificate_type = 19
     server_certificate_type = 20
     padding = 21
+    extended_master_secret = 23
+    compress_certificate = 27
+    record_size_limit = 28
+    session_ticket = 35
     pre_shared_key = 41
     early_data = 42
     supported_versions = 43
@@ -29,51 +35,110 @@ class ExtensionType(IntEnum):
     post_handshake_auth = 49
     signature_algorithms_cert = 50
     key_share = 51
+    renegotiation_info = 65281
+
+# GREASE codepoints 0x0a0a, 0x1a1a, ..., 0xfafa are reserved for clients to send at random (RFC 8701)
+GREASE_VALUES: frozenset[int] = frozenset(0x0a0a + 0x1010 * i for i in range(16))
+
+_EXTENSION_HEADER = struct.Struct('!HH')
+
+
+def is_grease(value: int) -> bool:
+    return value in GREASE_VALUES
+
 
 class ExtensionRegistry:
+    """Extension codec built on fixed tables indexed by the raw 16-bit extension type.
+
+    ``_types[value]`` is the ExtensionType member (or the plain int for unknown
+    and GREASE codepoints) and ``_table[value]`` the registered handler class,
+    so parsing a known, unknown or GREASE extension is two list lookups and
+    never raises. Extensions without a handler are kept as raw ``Extension``
+    objects carrying their undecoded data.
+    """
     _handlers: dict[ExtensionType, Type[Extension]] = {}
+    _types: list[ExtensionType | int] = [ExtensionType._value2member_map_.get(value, value) for value in range(2 ** 16)]
+    _table: list[Type[Extension] | None] = [None] * 2 ** 16
 
     @classmethod
     def register(cls, extension_type: ExtensionType, handler_class: Type[Extension]) -> None:
         if not issubclass(handler_class, Extension):
             raise TypeError(f"Handler must be a subclass of Extension, got {handler_class}")
         cls._handlers[extension_type] = handler_class
+        cls._table[extension_type] = handler_class
+
+    @classmethod
+    def get_handler(cls, extension_type: ExtensionType | int) -> Type[Extension] | None:
+        return cls._table[extension_type]
 
     @classmethod
-    def get_handler(cls, extension_type: ExtensionType) -> Type[Extension] | None:
-        return cls._handlers.get(extension_type)
+    def decode(cls, extension_type: int, data: bytes) -> Extension:
+        """Extension object for one extension_data value of any 16-bit type."""
+        handler_class = cls._table[extension_type]
+        if handler_class is None:
+            return Extension(extension_type=cls._types[extension_type], data=data)
+        return handler_class.parse_from_bytes(data)
 
     @classmethod
-    def parse(cls, data: bytes) -> tuple[Extension | None, bytes]:
+    def parse(cls, data: bytes | memoryview) -> tuple[Extension | None, bytes | memoryview]:
+        """Decode the first extension in ``data``; (None, data) if it is truncated."""
         if len(data) < 4:
             return None, data
-
-        extension_type = ExtensionType(int.from_bytes(data[0:2], byteorder='big'))
-        length = int.from_bytes(data[2:4], byteorder='big')
-
+        extension_type, length = _EXTENSION_HEADER.unpack_from(data)
         if len(data) < 4 + length:
             return None, data
+        return cls.decode(extension_type, bytes(data[4:4 + length])), data[4 + length:]
 
-        extension_data = data[4:4 + length]
-        remaining_data = data[4 + length:]
-
-        handler_class = cls.get_handler(extension_type)
-        if handler_class is None:
-            extension = Extension(extension_type=extension_type, data=extension_data)
-            return extension, remaining_data
-
-        extension = handler_class.parse_from_bytes(extension_data)
-        return extension, remaining_data
+    @classmethod
+    def parse_all(cls, block: bytes | memoryview) -> list[Extension]:
+        """Decode a whole extensions block (without its length prefix) in one pass.
+
+        Raises ValueError if an extension overruns the block or a type occurs
+        twice (RFC 8446, section 4.2), GREASE codepoints included.
+        """
+        view = memoryview(block)
+        end = len(view)
+        unpack_from = _EXTENSION_HEADER.unpack_from
+        decode = cls.decode
+        extensions: list[Extension] = []
+        seen: set[int] = set()
+        offset = 0
+        while offset + 4 <= end:
+            extension_type, length = unpack_from(view, offset)
+            offset += 4
+            if offset + length > end:
+                raise ValueError(f"Extension {extension_type} exceeds extensions block")
+            if extension_type in seen:
+                raise ValueError(f"Duplicate extension type: {extension_type}")
+            seen.add(extension_type)
+            extensions.append(decode(extension_type, bytes(view[offset:offset + length])))
+            offset += length
+        if offset != end:
+            raise ValueError("Trailing bytes in extensions block")
+        return extensions
 
 
 class Extension(BaseModel):
-    extension_type: ExtensionType
+    # A plain int for codepoints ExtensionType doesn't know, e.g. GREASE. int is
+    # tried first so those skip a failed enum lookup; members still match
+    # ExtensionType exactly and stay members.
+    extension_type: int | ExtensionType
     data: bytes | None = None
     extension_type_value: ClassVar[ExtensionType] = None
 
     class Config:
         arbitrary_types_allowed = True
 
+    @field_validator('extension_type', mode='before')
+    @classmethod
+    def validate_extension_type(cls, v: Any) -> Any:
+        # Known codepoints given as plain ints still become ExtensionType members
+        if type(v) is int:
+            if not 0 <= v < 2 ** 16:
+                raise ValueError(f"Extension type must fit in 16 bits, got {v}")
+            return ExtensionRegistry._types[v]
+        return v
+
     def __init_subclass__(cls, **kwargs: Any) -> None:
         super().__init_subclass__(**kwargs)
         if cls.extension_type_value is not None:
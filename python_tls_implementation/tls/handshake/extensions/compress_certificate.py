@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+
+
+# Implementation based on RFC8879
+# https://datatracker.ietf.org/doc/html/rfc8879#section-3
+
+class CertificateCompressionAlgorithm(IntEnum):
+    zlib = 1
+    brotli = 2
+    zstd = 3
+
+
+class CompressCertificate(Extension):
+    """compress_certificate: the algorithms the sender can decompress, in order of preference."""
+    extension_type: ExtensionType = ExtensionType.compress_certificate
+    extension_type_value = ExtensionType.compress_certificate
+    # Raw 16-bit codepoints, so algorithms we don't know about survive a round trip
+    algorithms: list[int]
+
+    def _extension_bytes(self) -> bytes:
+        body = b''.join(algorithm.to_bytes(2, byteorder='big') for algorithm in self.algorithms)
+        return bytes((len(body),)) + body
+
+    @classmethod
+    def parse_from_bytes(cls, data: bytes) -> CompressCertificate:
+        # algorithms<2..2^8-2>
+        if len(data) < 3 or data[0] != len(data) - 1 or data[0] % 2:
+            raise ValueError(f"decode_error: invalid compress_certificate extension {data.hex()}")
+        return cls(algorithms=[int.from_bytes(data[i:i + 2], byteorder='big') for i in range(1, len(data), 2)])
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import struct
+
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.2.10
+
+class EarlyDataIndication(Extension):
+    """early_data extension: empty in ClientHello/EncryptedExtensions, uint32 max_early_data_size in NewSessionTicket."""
+    extension_type: ExtensionType = ExtensionType.early_data
+    extension_type_value = ExtensionType.early_data
+    max_early_data_size: int | None = None
+
+    def _extension_bytes(self) -> bytes:
+        if self.max_early_data_size is None:
+            return b''
+        return struct.pack('!I', self.max_early_data_size)
+
+    @classmethod
+    def parse_from_bytes(cls, data: bytes) -> EarlyDataIndication:
+        if not data:
+            return cls()
+        if len(data) != 4:
+            raise ValueError(f"Invalid early_data extension length: {len(data)}")
+        return cls(max_early_data_size=struct.unpack('!I', data)[0])
+
+    @classmethod
+    def find(cls, extensions: list[Extension]) -> EarlyDataIndication | None:
+        for extension in extensions:
+            if extension.extension_type == ExtensionType.early_data:
+                if isinstance(extension, cls):
+                    return extension
+                return cls.parse_from_bytes(extension.data or b'')
+        return None
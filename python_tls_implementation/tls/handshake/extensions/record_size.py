@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+
+
+# Implementation based on RFC6066 and RFC8449
+# https://datatracker.ietf.org/doc/html/rfc6066#section-4
+# https://datatracker.ietf.org/doc/html/rfc8449#section-4
+
+class MaxFragmentLength(Extension):
+    """max_fragment_length: one octet selecting a plaintext limit of 2^9, 2^10, 2^11 or 2^12 octets."""
+    extension_type: ExtensionType = ExtensionType.max_fragment_length
+    extension_type_value = ExtensionType.max_fragment_length
+    code: int
+
+    LENGTHS: ClassVar[dict[int, int]] = {1: 2 ** 9, 2: 2 ** 10, 3: 2 ** 11, 4: 2 ** 12}
+
+    @property
+    def max_fragment_length(self) -> int:
+        return self.LENGTHS[self.code]
+
+    def _extension_bytes(self) -> bytes:
+        return bytes((self.code,))
+
+    @classmethod
+    def parse_from_bytes(cls, data: bytes) -> MaxFragmentLength:
+        if len(data) != 1 or data[0] not in cls.LENGTHS:
+            raise ValueError(f"illegal_parameter: invalid max_fragment_length {data.hex()}")
+        return cls(code=data[0])
+
+
+class RecordSizeLimit(Extension):
+    """record_size_limit: the largest TLSInnerPlaintext (content type and padding included) the sender accepts."""
+    extension_type: ExtensionType = ExtensionType.record_size_limit
+    extension_type_value = ExtensionType.record_size_limit
+    record_size_limit: int
+
+    MIN_LIMIT: ClassVar[int] = 64
+
+    @property
+    def max_content_length(self) -> int:
+        # TLS 1.3 counts the content type octet against the limit
+        return self.record_size_limit - 1
+
+    def _extension_bytes(self) -> bytes:
+        return self.record_size_limit.to_bytes(2, byteorder='big')
+
+    @classmethod
+    def parse_from_bytes(cls, data: bytes) -> RecordSizeLimit:
+        if len(data) != 2:
+            raise ValueError(f"Invalid record_size_limit extension length: {len(data)}")
+        limit = int.from_bytes(data, byteorder='big')
+        if limit < cls.MIN_LIMIT:
+            raise ValueError(f"illegal_parameter: record_size_limit {limit} is below {cls.MIN_LIMIT}")
+        return cls(record_size_limit=limit)
+
+
+def peer_fragment_limit(extensions: list[Extension]) -> int | None:
+    """Largest record content the peer accepts according to its extensions, or None if it set no limit.
+
+    record_size_limit takes precedence over max_fragment_length (RFC 8449, section 5).
+    """
+    max_fragment_length = None
+    for extension in extensions:
+        if isinstance(extension, RecordSizeLimit):
+            return extension.max_content_length
+        if isinstance(extension, MaxFragmentLength):
+            max_fragment_length = extension.max_fragment_length
+    return max_fragment_length
@@ -3,7 +3,7 @@ from __future__ import annotations
 import struct
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Type, TypeVar
+from typing import ClassVar, Type, TypeVar
 
 from pydantic import BaseModel
 
@@ -22,16 +22,24 @@ class HandshakeType(Enum):
     certificate_verify = 15
     finished = 20
     key_update = 24
+    compressed_certificate = 25
     message_hash = 254
 
+# Indexed by the raw msg_type byte; None for unassigned values
+HANDSHAKE_TYPES: tuple[HandshakeType | None, ...] = tuple(
+    HandshakeType._value2member_map_.get(value) for value in range(256)
+)
+
 T = TypeVar('T', bound="HandshakeMessage")
 
 class HandshakeMessage(BaseModel, ABC):
     msg_type: HandshakeType
+    msg_type_value: ClassVar[HandshakeType | None] = None
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        HandshakeMessageRegistry.register_class(cls)
+        if cls.msg_type_value is not None:
+            HandshakeMessageRegistry.register_class(cls)
 
 
     def to_bytes(self) -> bytes:
@@ -46,11 +54,10 @@ class HandshakeMessage(BaseModel, ABC):
 
     @classmethod
     def from_bytes(cls, data: bytes) -> tuple[HandshakeMessage, bytes]:
-        if len(data) < 5:
+        if len(data) < 4:
             raise ValueError("Data too short for handshake message header")
-        try:
-            parsed_message_type = HandshakeType(data[0])
-        except ValueError:
+        parsed_message_type = HANDSHAKE_TYPES[data[0]]
+        if parsed_message_type is None:
             raise ValueError(f"Invalid handshake message type: {data[0]}")
 
         parsed_message_length = struct.unpack(
@@ -58,8 +65,8 @@ class HandshakeMessage(BaseModel, ABC):
             b"\x00" # Add 0x00 because in the format used to decode ('I' = unsigned int) the data must be 4-bytes long
             + data[1:4])[0]
 
-        if len(data) < 5+parsed_message_length:
-            raise ValueError(f"Incomplete handshake message: expected {parsed_message_length} bytes, got {len(data) - 5}")
+        if len(data) < 4+parsed_message_length:
+            raise ValueError(f"Incomplete handshake message: expected {parsed_message_length} bytes, got {len(data) - 4}")
 
         payload = data[4:4+parsed_message_length]
         remainder = data[4+parsed_message_length:]
@@ -82,8 +89,8 @@ class HandshakeMessageRegistry:
     def register_class(cls, handler_class: Type[HandshakeMessage], message_type: HandshakeType | None = None) -> None:
         if not issubclass(handler_class, HandshakeMessage):
             raise TypeError(f"Handler must be a subclass of HandshakeMessage, got {handler_class}")
-        if hasattr(handler_class, "msg_type"):
-            cls._message_registry[handler_class.msg_type] = handler_class
+        if handler_class.msg_type_value is not None:
+            cls._message_registry[handler_class.msg_type_value] = handler_class
         else:
             if not message_type:
                 raise ValueError("Message type was not provided")
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import struct
+
+from python_tls_implementation.tls.handshake.messages import HANDSHAKE_TYPES, HandshakeMessage, HandshakeType
+from python_tls_implementation.tls.handshake.wire import HANDSHAKE_HEADER_LENGTH, HandshakeFrame
+from python_tls_implementation.tls.key_schedule import TranscriptHash
+
+
+class HandshakeReassembler:
+    """Turns the fragments carried by handshake records into complete handshake messages.
+
+    A record may hold several messages and a message may span several records.
+    When a message is split, its body buffer is preallocated from the 24-bit
+    length in the header and filled in place, so large Certificate chains are
+    assembled in linear time. Completed messages are added to ``transcript``
+    when one is given.
+    """
+
+    DEFAULT_MAX_MESSAGE_SIZE: int = 2 ** 17
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE, transcript: TranscriptHash | None = None):
+        self.max_message_size = max_message_size
+        self.transcript = transcript
+        self._header = bytearray(HANDSHAKE_HEADER_LENGTH)
+        self._header_filled: int = 0
+        self._msg_type: HandshakeType | None = None
+        self._body: bytearray | None = None
+        self._body_view: memoryview | None = None
+        self._body_filled: int = 0
+
+    @property
+    def in_progress(self) -> bool:
+        """True while a message is partially buffered (it must not straddle a key change)."""
+        return self._header_filled > 0 or self._body is not None
+
+    def _parse_header(self, header: bytes | bytearray | memoryview, offset: int = 0) -> tuple[HandshakeType, int]:
+        value = struct.unpack_from('!I', header, offset)[0]
+        msg_type = HANDSHAKE_TYPES[value >> 24]
+        if msg_type is None:
+            raise ValueError(f"Invalid handshake message type: {value >> 24}")
+        length = value & 0xFFFFFF
+        if length > self.max_message_size:
+            raise ValueError(f"Handshake message of {length} bytes exceeds maximum of {self.max_message_size} bytes")
+        return msg_type, length
+
+    def _complete(self, frame: HandshakeFrame, frames: list[HandshakeFrame]) -> None:
+        if self.transcript is not None:
+            self.transcript.add_message(frame)
+        frames.append(frame)
+
+    def feed(self, fragment: bytes | memoryview) -> list[HandshakeFrame]:
+        view = memoryview(fragment)
+        size = len(view)
+        position = 0
+        frames: list[HandshakeFrame] = []
+
+        while position < size:
+            if self._body is not None:
+                # Continue a message that started in an earlier fragment
+                count = min(len(self._body) - self._body_filled, size - position)
+                self._body_view[self._body_filled:self._body_filled + count] = view[position:position + count]
+                self._body_filled += count
+                position += count
+                if self._body_filled == len(self._body):
+                    body = self._body
+                    self._body = self._body_view = None
+                    self._complete(HandshakeFrame(self._msg_type, body), frames)
+                continue
+
+            if self._header_filled == 0 and size - position >= HANDSHAKE_HEADER_LENGTH:
+                msg_type, length = self._parse_header(view, position)
+                position += HANDSHAKE_HEADER_LENGTH
+            else:
+                count = min(HANDSHAKE_HEADER_LENGTH - self._header_filled, size - position)
+                self._header[self._header_filled:self._header_filled + count] = view[position:position + count]
+                self._header_filled += count
+                position += count
+                if self._header_filled < HANDSHAKE_HEADER_LENGTH:
+                    break
+                self._header_filled = 0
+                msg_type, length = self._parse_header(self._header)
+
+            if size - position >= length:
+                # Whole body is in this fragment
+                self._complete(HandshakeFrame(msg_type, bytes(view[position:position + length])), frames)
+                position += length
+            else:
+                self._msg_type = msg_type
+                self._body = bytearray(length)
+                self._body_view = memoryview(self._body)
+                self._body_filled = 0
+
+        return frames
+
+    def feed_messages(self, fragment: bytes | memoryview) -> list[HandshakeMessage]:
+        """Like ``feed``, but parses each completed message into its registered HandshakeMessage class."""
+        return [frame.to_message() for frame in self.feed(fragment)]
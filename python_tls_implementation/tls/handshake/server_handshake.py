@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import struct
+from enum import Enum
+from typing import Any, Callable
+
+from python_tls_implementation.tls.handshake.certificate import CachedCertificateChain
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.server_messages import ServerHello
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.instrumentation import ConnectionMetrics, HandshakePhase
+from python_tls_implementation.tls.key_schedule import KeySchedule
+from python_tls_implementation.tls.key_share import KeyShareKeyPair, KeySharePool, NamedGroup
+from python_tls_implementation.tls.protection import CipherSuite
+
+TLS_1_3 = 0x0304
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-2
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.1.1
+
+def ecdhe_key_exchange(group: NamedGroup, peer_key_exchange: bytes) -> tuple[bytes, bytes]:
+    """Fresh key share for ``group``: (our key_exchange value, shared secret).
+
+    A plain module-level function so it can be shipped to a process pool.
+    """
+    key_pair = KeyShareKeyPair.generate(group)
+    return key_pair.public_bytes, key_pair.exchange(peer_key_exchange)
+
+
+def pooled_key_exchange(key_pair: KeyShareKeyPair, peer_key_exchange: bytes) -> tuple[bytes, bytes]:
+    """Like ``ecdhe_key_exchange`` with a pre-generated pair; only usable in-process (thread pools)."""
+    return key_pair.public_bytes, key_pair.exchange(peer_key_exchange)
+
+
+class CryptoTask:
+    """A CPU-heavy handshake step: ``func(*args)``, run wherever the driver chooses."""
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def run(self) -> Any:
+        return self.func(*self.args)
+
+
+class ServerHandshakeState(Enum):
+    wait_client_hello = 'wait_client_hello'
+    key_exchange = 'key_exchange'
+    server_hello_sent = 'server_hello_sent'
+
+
+class ServerHandshake:
+    """Resumable server side of the TLS 1.3 handshake that never does public-key crypto itself.
+
+    Each step either returns handshake frames to send or a CryptoTask that the
+    caller runs (inline, in a thread pool or in a process pool) and feeds back
+    through ``resume``. The handshake holds no I/O and no locks, so an event
+    loop can park it while the task runs and serve other connections meanwhile.
+
+    Only the (EC)DHE path without HelloRetryRequest is covered so far: a
+    ClientHello that offers no key_share for a supported group is rejected.
+    With a ``certificate_chain`` the Certificate message comes from its cache,
+    compressed if the client offered a usable algorithm.
+    """
+
+    DEFAULT_CIPHER_SUITES: tuple[CipherSuite, ...] = (
+        CipherSuite.TLS_AES_128_GCM_SHA256,
+        CipherSuite.TLS_CHACHA20_POLY1305_SHA256,
+        CipherSuite.TLS_AES_256_GCM_SHA384,
+    )
+    DEFAULT_GROUPS: tuple[NamedGroup, ...] = (NamedGroup.x25519, NamedGroup.secp256r1)
+
+    def __init__(self, cipher_suites: tuple[CipherSuite, ...] = DEFAULT_CIPHER_SUITES,
+                 groups: tuple[NamedGroup, ...] = DEFAULT_GROUPS, key_shares: KeySharePool | None = None,
+                 metrics: ConnectionMetrics | None = None, certificate_chain: CachedCertificateChain | None = None):
+        self.cipher_suites = cipher_suites
+        self.groups = groups
+        self.key_shares = key_shares
+        self.metrics = metrics
+        self.certificate_chain = certificate_chain
+        self.state = ServerHandshakeState.wait_client_hello
+        self.client_hello: ClientHelloView | None = None
+        self.cipher_suite: CipherSuite | None = None
+        self.group: NamedGroup | None = None
+        self.key_schedule: KeySchedule | None = None
+        self.client_handshake_secret: bytes | None = None
+        self.server_handshake_secret: bytes | None = None
+
+    def _select_cipher_suite(self, offered: tuple[int, ...]) -> CipherSuite:
+        # Server preference order
+        for cipher_suite in self.cipher_suites:
+            if cipher_suite in offered:
+                return cipher_suite
+        raise ValueError("handshake_failure: no cipher suite in common")
+
+    def _select_key_share(self, offered: dict[int, memoryview]) -> tuple[NamedGroup, bytes]:
+        for group in self.groups:
+            key_exchange = offered.get(group)
+            if key_exchange is not None:
+                return group, bytes(key_exchange)
+        raise ValueError("handshake_failure: no key_share for a supported group")
+
+    def receive_client_hello(self, frame: HandshakeFrame) -> CryptoTask:
+        """Negotiate parameters from the ClientHello and return the key exchange to run."""
+        if self.state != ServerHandshakeState.wait_client_hello or frame.msg_type != HandshakeType.client_hello:
+            raise ValueError(f"unexpected_message: {frame.msg_type.name} in state {self.state.value}")
+        if self.metrics is not None:
+            self.metrics.mark(HandshakePhase.client_hello_received)
+        client_hello = ClientHelloView(frame.body)
+        if TLS_1_3 not in client_hello.supported_versions:
+            raise ValueError("protocol_version: client does not offer TLS 1.3")
+        self.cipher_suite = self._select_cipher_suite(client_hello.cipher_suites)
+        self.group, peer_key_exchange = self._select_key_share(client_hello.key_shares)
+        self.client_hello = client_hello
+
+        self.key_schedule = KeySchedule(self.cipher_suite)
+        self.key_schedule.add_message(frame)
+        self.state = ServerHandshakeState.key_exchange
+        if self.key_shares is not None and self.group in self.key_shares.groups:
+            return CryptoTask(pooled_key_exchange, self.key_shares.take(self.group), peer_key_exchange)
+        return CryptoTask(ecdhe_key_exchange, self.group, peer_key_exchange)
+
+    def resume(self, result: tuple[bytes, bytes]) -> list[HandshakeFrame]:
+        """Continue with the key exchange result; returns the frames to send (ServerHello)."""
+        if self.state != ServerHandshakeState.key_exchange:
+            raise ValueError(f"Handshake is not waiting for a key exchange (state {self.state.value})")
+        public_bytes, shared_secret = result
+        server_hello = ServerHello(
+            random_value=os.urandom(32),
+            legacy_session_id_echo=bytes(self.client_hello.legacy_session_id),
+            cipher_suite=self.cipher_suite,
+            extensions=[
+                Extension(extension_type=ExtensionType.supported_versions, data=struct.pack('!H', TLS_1_3)),
+                Extension(extension_type=ExtensionType.key_share,
+                          data=struct.pack('!HH', self.group, len(public_bytes)) + public_bytes),
+            ],
+        )
+        frame = HandshakeFrame.from_message(server_hello)
+        self.key_schedule.add_message(frame)
+        self.client_handshake_secret, self.server_handshake_secret = \
+            self.key_schedule.derive_handshake_secrets(shared_secret)
+        self.state = ServerHandshakeState.server_hello_sent
+        if self.metrics is not None:
+            self.metrics.mark(HandshakePhase.server_hello_sent)
+        return [frame]
+
+    def certificate_frame(self) -> HandshakeFrame:
+        """The cached Certificate or CompressedCertificate for this client, added to the transcript.
+
+        Call once EncryptedExtensions is in the transcript; the frame is shared
+        and goes out under the server handshake traffic keys.
+        """
+        if self.state != ServerHandshakeState.server_hello_sent:
+            raise ValueError(f"Certificate can only follow ServerHello (state {self.state.value})")
+        if self.certificate_chain is None:
+            raise ValueError("No certificate chain configured")
+        frame = self.certificate_chain.frame_for(self.client_hello.compress_certificate_algorithms)
+        self.key_schedule.add_message(frame)
+        return frame
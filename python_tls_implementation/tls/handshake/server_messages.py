@@ -1,12 +1,117 @@
-from typing import Type
+import struct
+from typing import ClassVar, Type
 
-from python_tls_implementation.tls.handshake.messages import HandshakeMessage, T
+from pydantic import field_validator
+
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionRegistry
+from python_tls_implementation.tls.handshake.messages import HandshakeMessage, T, HandshakeType
+from python_tls_implementation.tls.record import PROTOCOL_VERSIONS, ProtocolVersion
 
 
 class ServerHello(HandshakeMessage):
+    # https://datatracker.ietf.org/doc/html/rfc8446#section-4.1.3
+    msg_type: HandshakeType = HandshakeType.server_hello
+    msg_type_value = HandshakeType.server_hello
+    legacy_version: ProtocolVersion = ProtocolVersion.TLS_1_2
+    random_value: bytes
+    legacy_session_id_echo: bytes = b''
+    cipher_suite: int
+    legacy_compression_method: int = 0
+    extensions: list[Extension] = []
+
+    def _body_bytes(self) -> bytes:
+        extensions_bytes = b''.join(ext.to_bytes() for ext in self.extensions)
+        return b''.join((
+            ProtocolVersion.to_bytes(self.legacy_version.value), self.random_value,
+            bytes([len(self.legacy_session_id_echo)]), self.legacy_session_id_echo,
+            struct.pack('!HB', self.cipher_suite, self.legacy_compression_method),
+            struct.pack('!H', len(extensions_bytes)), extensions_bytes,
+        ))
+
+    @classmethod
+    def parse(cls: Type[T], body: bytes) -> T:
+        if len(body) < 38:
+            raise ValueError("ServerHello message too short")
+        legacy_version = PROTOCOL_VERSIONS.get(int.from_bytes(body[0:2], byteorder='big'))
+        if legacy_version is None:
+            raise ValueError(f"Invalid legacy version: {body[0:2].hex()}")
+        random_value = body[2:34]
+        session_id_len = body[34]
+        offset = 35 + session_id_len
+        if offset + 5 > len(body):
+            raise ValueError("Message truncated before cipher suite")
+        legacy_session_id_echo = body[35:offset]
+        cipher_suite, legacy_compression_method, extensions_len = struct.unpack_from('!HBH', body, offset)
+        offset += 5
+        if offset + extensions_len != len(body):
+            raise ValueError("ServerHello extensions length does not match message length")
+
+        extensions = ExtensionRegistry.parse_all(memoryview(body)[offset:])
+
+        return cls(
+            legacy_version=legacy_version,
+            random_value=random_value,
+            legacy_session_id_echo=legacy_session_id_echo,
+            cipher_suite=cipher_suite,
+            legacy_compression_method=legacy_compression_method,
+            extensions=extensions,
+        )
+
+
+class NewSessionTicket(HandshakeMessage):
+    # https://datatracker.ietf.org/doc/html/rfc8446#section-4.6.1
+    msg_type: HandshakeType = HandshakeType.new_session_ticket
+    msg_type_value = HandshakeType.new_session_ticket
+    ticket_lifetime: int
+    ticket_age_add: int
+    ticket_nonce: bytes = b''
+    ticket: bytes
+    extensions: list[Extension] = []
+
+    MAX_TICKET_LIFETIME: ClassVar[int] = 604800
+
+    @field_validator('ticket_lifetime')
+    @classmethod
+    def validate_ticket_lifetime(cls, v: int) -> int:
+        if not 0 <= v <= cls.MAX_TICKET_LIFETIME:
+            raise ValueError(f"Ticket lifetime must be between 0 and {cls.MAX_TICKET_LIFETIME} seconds")
+        return v
+
     def _body_bytes(self) -> bytes:
-        pass
+        extensions_bytes = b''.join(ext.to_bytes() for ext in self.extensions)
+        return b''.join((
+            struct.pack('!II', self.ticket_lifetime, self.ticket_age_add),
+            bytes([len(self.ticket_nonce)]), self.ticket_nonce,
+            struct.pack('!H', len(self.ticket)), self.ticket,
+            struct.pack('!H', len(extensions_bytes)), extensions_bytes,
+        ))
 
     @classmethod
     def parse(cls: Type[T], body: bytes) -> T:
-        pass
+        if len(body) < 9:
+            raise ValueError("NewSessionTicket message too short")
+        ticket_lifetime, ticket_age_add = struct.unpack_from('!II', body)
+        offset = 8
+        nonce_len = body[offset]
+        ticket_nonce = body[offset + 1:offset + 1 + nonce_len]
+        offset += 1 + nonce_len
+        if offset + 2 > len(body):
+            raise ValueError("Message truncated before ticket")
+        ticket_len = int.from_bytes(body[offset:offset + 2], byteorder='big')
+        ticket = body[offset + 2:offset + 2 + ticket_len]
+        offset += 2 + ticket_len
+        if len(ticket) != ticket_len or ticket_len == 0 or offset + 2 > len(body):
+            raise ValueError("Message truncated in ticket")
+
+        extensions_len = int.from_bytes(body[offset:offset + 2], byteorder='big')
+        if offset + 2 + extensions_len > len(body):
+            raise ValueError("NewSessionTicket extensions exceed message length")
+        extensions = ExtensionRegistry.parse_all(memoryview(body)[offset + 2:offset + 2 + extensions_len])
+
+        return cls(
+            ticket_lifetime=ticket_lifetime,
+            ticket_age_add=ticket_age_add,
+            ticket_nonce=ticket_nonce,
+            ticket=ticket,
+            extensions=extensions,
+        )
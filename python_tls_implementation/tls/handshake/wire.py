@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import struct
+
+from python_tls_implementation.tls.handshake.messages import (
+    HANDSHAKE_TYPES,
+    HandshakeMessage,
+    HandshakeMessageRegistry,
+    HandshakeType,
+)
+
+HANDSHAKE_HEADER_LENGTH = 4
+
+
+class HandshakeFrame:
+    """Validation-free handshake message: the type plus the raw (possibly memoryview) body.
+
+    ``to_message`` dispatches to the registered pydantic message class, which is
+    where validation happens on the strict path.
+    """
+    __slots__ = ('msg_type', 'body')
+
+    def __init__(self, msg_type: HandshakeType, body: bytes | memoryview = b''):
+        self.msg_type = msg_type
+        self.body = body
+
+    @property
+    def length(self) -> int:
+        return len(self.body)
+
+    def header_bytes(self) -> bytes:
+        return struct.pack('!I', (self.msg_type.value << 24) | len(self.body))
+
+    def to_bytes(self) -> bytes:
+        return self.header_bytes() + self.body
+
+    def to_message(self) -> HandshakeMessage:
+        handler = HandshakeMessageRegistry.get_handler(self.msg_type)
+        return handler.parse(bytes(self.body))
+
+    @classmethod
+    def from_message(cls, message: HandshakeMessage) -> HandshakeFrame:
+        return cls(message.msg_type, message._body_bytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> tuple[HandshakeFrame, bytes | memoryview]:
+        if len(data) < HANDSHAKE_HEADER_LENGTH:
+            raise ValueError("Data too short for handshake message header")
+        header = struct.unpack_from('!I', data)[0]
+        msg_type = HANDSHAKE_TYPES[header >> 24]
+        if msg_type is None:
+            raise ValueError(f"Invalid handshake message type: {header >> 24}")
+        length = header & 0xFFFFFF
+        end = HANDSHAKE_HEADER_LENGTH + length
+        if len(data) < end:
+            raise ValueError(f"Incomplete handshake message: expected {length} bytes, got {len(data) - HANDSHAKE_HEADER_LENGTH}")
+        return cls(msg_type, data[HANDSHAKE_HEADER_LENGTH:end]), data[end:]
+
+    def __repr__(self) -> str:
+        return f"HandshakeFrame(msg_type={self.msg_type}, length={self.length})"
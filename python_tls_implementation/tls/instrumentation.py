@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import time
+from enum import Enum
+
+
+class HandshakePhase(Enum):
+    client_hello_received = 'client_hello_received'
+    server_hello_sent = 'server_hello_sent'
+    finished = 'finished'
+
+
+COUNTERS = ('records_in', 'records_out', 'bytes_in', 'bytes_out', 'read_calls', 'write_calls', 'partial_writes')
+
+
+class ConnectionMetrics:
+    """Counters for one connection, updated in place by the record layer.
+
+    Objects only exist while a hook is registered: components ask
+    ``Instrumentation.connection_opened`` for one when the connection starts
+    and get None otherwise, so the disabled cost is a single ``is not None``
+    check per event.
+    """
+    __slots__ = ('instrumentation', 'peer', 'opened_at', 'last_mark', 'records_in', 'records_out',
+                 'bytes_in', 'bytes_out', 'read_calls', 'write_calls', 'partial_writes', 'phases')
+
+    def __init__(self, instrumentation: Instrumentation, peer: object = None):
+        self.instrumentation = instrumentation
+        self.peer = peer
+        self.opened_at: float = time.perf_counter()
+        self.last_mark: float = self.opened_at
+        self.records_in: int = 0
+        self.records_out: int = 0
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+        self.read_calls: int = 0
+        self.write_calls: int = 0
+        self.partial_writes: int = 0
+        self.phases: dict[HandshakePhase, float] = {}
+
+    def mark(self, phase: HandshakePhase) -> None:
+        """Record that the handshake reached ``phase`` and report the time spent since the previous one."""
+        now = time.perf_counter()
+        elapsed = now - self.last_mark
+        self.last_mark = now
+        self.phases[phase] = now - self.opened_at
+        for hook in self.instrumentation.hooks:
+            hook.phase(self, phase, elapsed)
+
+    def counters(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def close(self) -> None:
+        for hook in self.instrumentation.hooks:
+            hook.connection_closed(self)
+
+
+class InstrumentationHook:
+    """Receives connection lifecycle events and handshake phase timings; override what you need."""
+
+    def connection_opened(self, metrics: ConnectionMetrics) -> None:
+        pass
+
+    def connection_closed(self, metrics: ConnectionMetrics) -> None:
+        pass
+
+    def phase(self, metrics: ConnectionMetrics, phase: HandshakePhase, elapsed: float) -> None:
+        pass
+
+
+class Instrumentation:
+    """Set of registered hooks; hands out ConnectionMetrics only while at least one is registered."""
+
+    def __init__(self):
+        self.hooks: list[InstrumentationHook] = []
+
+    def add_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.remove(hook)
+
+    def connection_opened(self, peer: object = None) -> ConnectionMetrics | None:
+        if not self.hooks:
+            return None
+        metrics = ConnectionMetrics(self, peer)
+        for hook in self.hooks:
+            hook.connection_opened(metrics)
+        return metrics
+
+
+# Process-wide default used by the tcp layer
+default_instrumentation = Instrumentation()
+
+
+class MetricsCollector(InstrumentationHook):
+    """Aggregates connection counters and phase timings for export as Prometheus text or JSON.
+
+    Counters include connections that are still open, so they only ever grow.
+    Phase timings go into cumulative histograms with ``buckets`` upper bounds
+    in seconds.
+    """
+
+    DEFAULT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, namespace: str = 'tls', buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = buckets
+        self.opened: int = 0
+        self.closed: int = 0
+        self._active: set[ConnectionMetrics] = set()
+        self._closed_totals: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._phase_counts: dict[HandshakePhase, list[int]] = {}
+        self._phase_sums: dict[HandshakePhase, float] = {}
+
+    def connection_opened(self, metrics: ConnectionMetrics) -> None:
+        self.opened += 1
+        self._active.add(metrics)
+
+    def connection_closed(self, metrics: ConnectionMetrics) -> None:
+        if metrics in self._active:
+            self._active.discard(metrics)
+            self.closed += 1
+            for name in COUNTERS:
+                self._closed_totals[name] += getattr(metrics, name)
+
+    def phase(self, metrics: ConnectionMetrics, phase: HandshakePhase, elapsed: float) -> None:
+        counts = self._phase_counts.get(phase)
+        if counts is None:
+            counts = self._phase_counts[phase] = [0] * (len(self.buckets) + 1)
+            self._phase_sums[phase] = 0.0
+        index = 0
+        while index < len(self.buckets) and elapsed > self.buckets[index]:
+            index += 1
+        counts[index] += 1
+        self._phase_sums[phase] += elapsed
+
+    def totals(self) -> dict[str, int]:
+        totals = dict(self._closed_totals)
+        for metrics in self._active:
+            for name in COUNTERS:
+                totals[name] += getattr(metrics, name)
+        return totals
+
+    def to_json(self) -> dict:
+        return {
+            'connections_opened': self.opened,
+            'connections_closed': self.closed,
+            'connections_active': len(self._active),
+            **self.totals(),
+            'handshake_phases': {
+                phase.value: {
+                    'count': sum(counts),
+                    'sum': self._phase_sums[phase],
+                    'buckets': dict(zip([*map(str, self.buckets), '+Inf'], counts)),
+                }
+                for phase, counts in self._phase_counts.items()
+            },
+        }
+
+    def to_json_text(self) -> str:
+        return json.dumps(self.to_json())
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format (version 0.0.4)."""
+        prefix = self.namespace
+        lines = [
+            f'# TYPE {prefix}_connections_opened_total counter',
+            f'{prefix}_connections_opened_total {self.opened}',
+            f'# TYPE {prefix}_connections_closed_total counter',
+            f'{prefix}_connections_closed_total {self.closed}',
+            f'# TYPE {prefix}_connections_active gauge',
+            f'{prefix}_connections_active {len(self._active)}',
+        ]
+        for name, value in self.totals().items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+
+        name = f'{prefix}_handshake_phase_seconds'
+        lines.append(f'# TYPE {name} histogram')
+        for phase, counts in self._phase_counts.items():
+            cumulative = 0
+            for bound, count in zip([*map(repr, self.buckets), '+Inf'], counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{phase="{phase.value}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{phase="{phase.value}"}} {self._phase_sums[phase]}')
+            lines.append(f'{name}_count{{phase="{phase.value}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import struct
+
+from python_tls_implementation.tls.handshake.messages import HandshakeMessage, HandshakeType
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.protection import CIPHER_SUITES, CipherSuite, RecordProtection
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-7.1
+
+def hkdf_extract(hash_name: str, salt: bytes, ikm: bytes) -> bytes:
+    return hmac.digest(salt, ikm, hash_name)
+
+
+def hkdf_expand(hash_name: str, prk: bytes, info: bytes, length: int) -> bytes:
+    output = b''
+    block = b''
+    counter = 1
+    while len(output) < length:
+        block = hmac.digest(prk, block + info + bytes((counter,)), hash_name)
+        output += block
+        counter += 1
+    return output[:length]
+
+
+def hkdf_expand_label(hash_name: str, secret: bytes, label: bytes, context: bytes, length: int) -> bytes:
+    full_label = b'tls13 ' + label
+    hkdf_label = struct.pack('!HB', length, len(full_label)) + full_label + bytes((len(context),)) + context
+    return hkdf_expand(hash_name, secret, hkdf_label, length)
+
+
+class TranscriptHash:
+    """Running hash over the handshake messages of one connection.
+
+    Intermediate values are read from a ``copy()`` of the running hash, so the
+    transcript is never re-hashed from the start.
+    """
+
+    def __init__(self, hash_name: str):
+        self.hash_name = hash_name
+        self._hash = hashlib.new(hash_name)
+
+    def update(self, data: bytes | memoryview) -> None:
+        self._hash.update(data)
+
+    def add_message(self, message: HandshakeMessage | HandshakeFrame) -> None:
+        if isinstance(message, HandshakeFrame):
+            self._hash.update(message.header_bytes())
+            self._hash.update(message.body)
+        else:
+            self._hash.update(message.to_bytes())
+
+    def digest(self) -> bytes:
+        return self._hash.copy().digest()
+
+    def restart_after_hello_retry(self) -> None:
+        """Replace ClientHello1 with the synthetic message_hash message (RFC 8446, section 4.4.1)."""
+        client_hello_hash = self._hash.digest()
+        self._hash = hashlib.new(self.hash_name)
+        self._hash.update(bytes((HandshakeType.message_hash.value, 0, 0, len(client_hello_hash))))
+        self._hash.update(client_hello_hash)
+
+
+class KeySchedule:
+    """TLS 1.3 key schedule for one connection, with memoized HKDF-Expand-Label results.
+
+    Handshake messages are fed through ``add_message`` as they are serialized
+    or parsed; each derivation step reads the transcript hash at that point.
+    """
+
+    def __init__(self, cipher_suite: CipherSuite, psk: bytes | None = None):
+        parameters = CIPHER_SUITES[cipher_suite]
+        self.cipher_suite = cipher_suite
+        self.hash_name: str = parameters.hash_name
+        self.key_length: int = parameters.key_length
+        self.iv_length: int = parameters.iv_length
+        self.transcript = TranscriptHash(self.hash_name)
+        self.hash_length: int = hashlib.new(self.hash_name).digest_size
+        self._zeros = bytes(self.hash_length)
+        self._empty_hash = hashlib.new(self.hash_name).digest()
+        self._labels: dict[tuple[bytes, bytes, bytes, int], bytes] = {}
+        self.snapshots: dict[str, bytes] = {}
+
+        self.early_secret: bytes = hkdf_extract(self.hash_name, self._zeros, psk or self._zeros)
+        self.handshake_secret: bytes | None = None
+        self.master_secret: bytes | None = None
+
+    def add_message(self, message: HandshakeMessage | HandshakeFrame) -> None:
+        self.transcript.add_message(message)
+
+    def snapshot(self, name: str) -> bytes:
+        """Record the transcript hash at a named point of the handshake (e.g. 'server_finished')."""
+        digest = self.transcript.digest()
+        self.snapshots[name] = digest
+        return digest
+
+    def expand_label(self, secret: bytes, label: bytes, context: bytes, length: int) -> bytes:
+        key = (secret, label, context, length)
+        value = self._labels.get(key)
+        if value is None:
+            value = self._labels[key] = hkdf_expand_label(self.hash_name, secret, label, context, length)
+        return value
+
+    def derive_secret(self, secret: bytes, label: bytes, transcript_hash: bytes | None = None) -> bytes:
+        if transcript_hash is None:
+            transcript_hash = self.transcript.digest()
+        return self.expand_label(secret, label, transcript_hash, self.hash_length)
+
+    def binder_key(self, external: bool = False) -> bytes:
+        return self.derive_secret(self.early_secret, b'ext binder' if external else b'res binder', self._empty_hash)
+
+    def client_early_traffic_secret(self) -> bytes:
+        """Requires the ClientHello to be in the transcript."""
+        return self.derive_secret(self.early_secret, b'c e traffic')
+
+    def derive_handshake_secrets(self, shared_secret: bytes) -> tuple[bytes, bytes]:
+        """Client and server handshake traffic secrets; requires ClientHello...ServerHello in the transcript."""
+        derived = self.derive_secret(self.early_secret, b'derived', self._empty_hash)
+        self.handshake_secret = hkdf_extract(self.hash_name, derived, shared_secret)
+        transcript_hash = self.snapshot('server_hello')
+        return (
+            self.derive_secret(self.handshake_secret, b'c hs traffic', transcript_hash),
+            self.derive_secret(self.handshake_secret, b's hs traffic', transcript_hash),
+        )
+
+    def derive_application_secrets(self) -> tuple[bytes, bytes, bytes]:
+        """Client/server application traffic secrets and the exporter master secret.
+
+        Requires ClientHello...server Finished in the transcript.
+        """
+        if self.handshake_secret is None:
+            raise ValueError("Handshake secret has not been derived yet")
+        derived = self.derive_secret(self.handshake_secret, b'derived', self._empty_hash)
+        self.master_secret = hkdf_extract(self.hash_name, derived, self._zeros)
+        transcript_hash = self.snapshot('server_finished')
+        return (
+            self.derive_secret(self.master_secret, b'c ap traffic', transcript_hash),
+            self.derive_secret(self.master_secret, b's ap traffic', transcript_hash),
+            self.derive_secret(self.master_secret, b'exp master', transcript_hash),
+        )
+
+    def resumption_master_secret(self) -> bytes:
+        """Requires ClientHello...client Finished in the transcript."""
+        if self.master_secret is None:
+            raise ValueError("Master secret has not been derived yet")
+        return self.derive_secret(self.master_secret, b'res master', self.snapshot('client_finished'))
+
+    def resumption_psk(self, resumption_master_secret: bytes, ticket_nonce: bytes) -> bytes:
+        return self.expand_label(resumption_master_secret, b'resumption', ticket_nonce, self.hash_length)
+
+    def next_traffic_secret(self, secret: bytes) -> bytes:
+        return self.expand_label(secret, b'traffic upd', b'', self.hash_length)
+
+    def traffic_keys(self, secret: bytes) -> tuple[bytes, bytes]:
+        return (
+            self.expand_label(secret, b'key', b'', self.key_length),
+            self.expand_label(secret, b'iv', b'', self.iv_length),
+        )
+
+    def record_protection(self, secret: bytes) -> RecordProtection:
+        key, iv = self.traffic_keys(secret)
+        return RecordProtection(self.cipher_suite, key, iv)
+
+    def finished_verify_data(self, base_key: bytes, transcript_hash: bytes | None = None) -> bytes:
+        finished_key = self.expand_label(base_key, b'finished', b'', self.hash_length)
+        if transcript_hash is None:
+            transcript_hash = self.transcript.digest()
+        return hmac.digest(finished_key, transcript_hash, self.hash_name)
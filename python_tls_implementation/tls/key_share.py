@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+from enum import IntEnum
+
+from cryptography.hazmat.primitives.asymmetric import ec, x448, x25519
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+logger = logging.getLogger('tls_key_share')
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.2.7
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.2.8.2
+
+class NamedGroup(IntEnum):
+    secp256r1 = 0x0017
+    secp384r1 = 0x0018
+    secp521r1 = 0x0019
+    x25519 = 0x001d
+    x448 = 0x001e
+
+
+_CURVES = {
+    NamedGroup.secp256r1: ec.SECP256R1,
+    NamedGroup.secp384r1: ec.SECP384R1,
+    NamedGroup.secp521r1: ec.SECP521R1,
+}
+
+
+class KeyShareKeyPair:
+    """Ephemeral key pair for one key_share; the private key can be used for a single exchange."""
+    __slots__ = ('group', 'public_bytes', '_private_key')
+
+    def __init__(self, group: NamedGroup, private_key, public_bytes: bytes):
+        self.group = group
+        self.public_bytes = public_bytes
+        self._private_key = private_key
+
+    @classmethod
+    def generate(cls, group: NamedGroup) -> KeyShareKeyPair:
+        if group == NamedGroup.x25519:
+            private_key = x25519.X25519PrivateKey.generate()
+            return cls(group, private_key, private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw))
+        if group == NamedGroup.x448:
+            private_key = x448.X448PrivateKey.generate()
+            return cls(group, private_key, private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw))
+        curve = _CURVES.get(group)
+        if curve is None:
+            raise ValueError(f"Unsupported named group: {group}")
+        private_key = ec.generate_private_key(curve())
+        # UncompressedPointRepresentation (RFC 8446, section 4.2.8.2)
+        return cls(group, private_key, private_key.public_key().public_bytes(Encoding.X962, PublicFormat.UncompressedPoint))
+
+    def exchange(self, peer_key_exchange: bytes) -> bytes:
+        """Shared secret with the peer's key_exchange value; the private key is dropped afterwards."""
+        private_key = self._private_key
+        if private_key is None:
+            raise ValueError("Key share has already been used")
+        self._private_key = None
+        if self.group == NamedGroup.x25519:
+            return private_key.exchange(x25519.X25519PublicKey.from_public_bytes(peer_key_exchange))
+        if self.group == NamedGroup.x448:
+            return private_key.exchange(x448.X448PublicKey.from_public_bytes(peer_key_exchange))
+        peer_key = ec.EllipticCurvePublicKey.from_encoded_point(_CURVES[self.group](), peer_key_exchange)
+        return private_key.exchange(ec.ECDH(), peer_key)
+
+
+class GroupPoolConfig:
+    """Keep up to ``capacity`` key pairs ready for a group and refill once fewer than ``low_water`` remain."""
+    __slots__ = ('capacity', 'low_water')
+
+    def __init__(self, capacity: int, low_water: int | None = None):
+        if capacity <= 0:
+            raise ValueError("Key share pool capacity must be positive")
+        self.capacity = capacity
+        self.low_water = capacity // 2 if low_water is None else low_water
+
+
+class KeySharePool:
+    """Pre-generates ephemeral key pairs in a background thread so handshakes only pop a ready one.
+
+    Each pair is handed out once. When a group's pool is empty, ``take``
+    generates a pair inline and counts the miss as starvation; a steady
+    stream of starvation means the capacity or low-water mark is too low for
+    the handshake rate.
+    """
+
+    DEFAULT_GROUPS: dict[NamedGroup, GroupPoolConfig] = {
+        NamedGroup.x25519: GroupPoolConfig(64),
+        NamedGroup.secp256r1: GroupPoolConfig(16),
+    }
+
+    def __init__(self, groups: dict[NamedGroup, GroupPoolConfig] | None = None):
+        self.groups = dict(self.DEFAULT_GROUPS if groups is None else groups)
+        self._ready: dict[NamedGroup, collections.deque[KeyShareKeyPair]] = {
+            group: collections.deque() for group in self.groups
+        }
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping: bool = False
+        self.taken: dict[NamedGroup, int] = dict.fromkeys(self.groups, 0)
+        self.starved: dict[NamedGroup, int] = dict.fromkeys(self.groups, 0)
+        self.generated: dict[NamedGroup, int] = dict.fromkeys(self.groups, 0)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._refill_loop, name='key-share-pool', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> KeySharePool:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _below_low_water(self) -> NamedGroup | None:
+        for group, config in self.groups.items():
+            if len(self._ready[group]) < config.low_water:
+                return group
+        return None
+
+    def _refill_loop(self) -> None:
+        # Fill everything once, then only wake up when a group drops below its low-water mark
+        pending = list(self.groups)
+        while True:
+            for group in pending:
+                capacity = self.groups[group].capacity
+                while len(self._ready[group]) < capacity and not self._stopping:
+                    key_pair = KeyShareKeyPair.generate(group)
+                    with self._condition:
+                        self._ready[group].append(key_pair)
+                        self.generated[group] += 1
+            with self._condition:
+                while not self._stopping and self._below_low_water() is None:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                pending = [group for group, config in self.groups.items()
+                           if len(self._ready[group]) < config.low_water]
+
+    def take(self, group: NamedGroup) -> KeyShareKeyPair:
+        ready = self._ready.get(group)
+        if ready is None:
+            raise ValueError(f"Key share pool is not configured for group {group!r}")
+        with self._condition:
+            self.taken[group] += 1
+            key_pair = ready.popleft() if ready else None
+            if key_pair is None:
+                self.starved[group] += 1
+            if len(ready) < self.groups[group].low_water:
+                self._condition.notify()
+        if key_pair is None:
+            logger.debug("Key share pool for %s is empty, generating inline", group.name)
+            key_pair = KeyShareKeyPair.generate(group)
+        return key_pair
+
+    def available(self, group: NamedGroup) -> int:
+        return len(self._ready[group])
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._condition:
+            return {
+                group.name: {
+                    'available': len(self._ready[group]),
+                    'taken': self.taken[group],
+                    'starved': self.starved[group],
+                    'generated': self.generated[group],
+                }
+                for group in self.groups
+            }
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import Iterable
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+
+from python_tls_implementation.tls.record import (
+    PROTOCOL_VERSION_VALUES,
+    RECORD_HEADER,
+    ContentType,
+    ProtocolVersion,
+    TLSCiphertext,
+    TLSInnerPlaintext,
+)
+from python_tls_implementation.tls.wire import CiphertextRecord, InnerPlaintext
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-5.2
+
+class CipherSuite(IntEnum):
+    TLS_AES_128_GCM_SHA256 = 0x1301
+    TLS_AES_256_GCM_SHA384 = 0x1302
+    TLS_CHACHA20_POLY1305_SHA256 = 0x1303
+
+
+class CipherSuiteParameters:
+    __slots__ = ('aead', 'key_length', 'iv_length', 'hash_name')
+
+    def __init__(self, aead: type, key_length: int, iv_length: int, hash_name: str):
+        self.aead = aead
+        self.key_length = key_length
+        self.iv_length = iv_length
+        self.hash_name = hash_name
+
+
+CIPHER_SUITES: dict[CipherSuite, CipherSuiteParameters] = {
+    CipherSuite.TLS_AES_128_GCM_SHA256: CipherSuiteParameters(AESGCM, 16, 12, 'sha256'),
+    CipherSuite.TLS_AES_256_GCM_SHA384: CipherSuiteParameters(AESGCM, 32, 12, 'sha384'),
+    CipherSuite.TLS_CHACHA20_POLY1305_SHA256: CipherSuiteParameters(ChaCha20Poly1305, 32, 12, 'sha256'),
+}
+
+TAG_LENGTH = 16
+MAX_SEQUENCE_NUMBER = 2 ** 64 - 1
+# TLSCiphertext always claims to be TLS 1.2 application data on the wire
+_OUTER_TYPE = ContentType.application_data.value
+_OUTER_VERSION = PROTOCOL_VERSION_VALUES[ProtocolVersion.TLS_1_2]
+
+
+class RecordProtection:
+    """AEAD state for one direction of a connection.
+
+    The AEAD context is built once per traffic key and reused for every record;
+    the per-record nonce is the 64-bit sequence number XORed into the static IV,
+    computed with integer arithmetic.
+    """
+
+    def __init__(self, cipher_suite: CipherSuite, key: bytes, iv: bytes):
+        self.cipher_suite = cipher_suite
+        self.parameters = CIPHER_SUITES[cipher_suite]
+        self.sequence_number: int = 0
+        self.update_keys(key, iv)
+
+    def update_keys(self, key: bytes, iv: bytes) -> None:
+        """Install a new traffic key (e.g. after KeyUpdate); the sequence number restarts at zero."""
+        parameters = self.parameters
+        if len(key) != parameters.key_length:
+            raise ValueError(f"Key must be {parameters.key_length} bytes for {self.cipher_suite.name}")
+        if len(iv) != parameters.iv_length:
+            raise ValueError(f"IV must be {parameters.iv_length} bytes for {self.cipher_suite.name}")
+        self._aead = parameters.aead(key)
+        self._iv = int.from_bytes(iv, 'big')
+        self._iv_length = len(iv)
+        self.sequence_number = 0
+
+    def _next_nonce(self) -> bytes:
+        sequence_number = self.sequence_number
+        if sequence_number > MAX_SEQUENCE_NUMBER:
+            raise ValueError("Sequence number exhausted, traffic keys must be updated")
+        self.sequence_number = sequence_number + 1
+        return (self._iv ^ sequence_number).to_bytes(self._iv_length, 'big')
+
+    def seal(self, inner: InnerPlaintext | TLSInnerPlaintext) -> CiphertextRecord:
+        plaintext = inner.to_bytes()
+        length = len(plaintext) + TAG_LENGTH
+        if length > TLSCiphertext.MAX_FRAGMENT_LENGTH:
+            raise ValueError(f"Encrypted record length must be less than {TLSCiphertext.MAX_FRAGMENT_LENGTH} bytes")
+        additional_data = RECORD_HEADER.pack(_OUTER_TYPE, _OUTER_VERSION, length)
+        encrypted_record = self._aead.encrypt(self._next_nonce(), plaintext, additional_data)
+        return CiphertextRecord(ContentType.application_data, ProtocolVersion.TLS_1_2, encrypted_record)
+
+    def open(self, record: CiphertextRecord | TLSCiphertext) -> InnerPlaintext:
+        encrypted_record = record.encrypted_record
+        length = len(encrypted_record)
+        if length < TAG_LENGTH + 1:
+            raise ValueError("Encrypted record too short")
+        additional_data = RECORD_HEADER.pack(
+            record.opaque_type.value, PROTOCOL_VERSION_VALUES[record.legacy_record_version], length,
+        )
+        try:
+            plaintext = self._aead.decrypt(self._next_nonce(), encrypted_record, additional_data)
+        except InvalidTag:
+            raise ValueError("bad_record_mac: record failed authentication") from None
+        return InnerPlaintext.from_bytes(plaintext)
+
+    def seal_many(self, inners: Iterable[InnerPlaintext | TLSInnerPlaintext]) -> list[CiphertextRecord]:
+        seal = self.seal
+        return [seal(inner) for inner in inners]
+
+    def open_many(self, records: Iterable[CiphertextRecord | TLSCiphertext]) -> list[InnerPlaintext]:
+        open_record = self.open
+        return [open_record(record) for record in records]
+
+
+class ConnectionProtection:
+    """Read and write protection state cached for the lifetime of a connection."""
+
+    def __init__(self, cipher_suite: CipherSuite, write_key: bytes, write_iv: bytes,
+                 read_key: bytes, read_iv: bytes):
+        self.cipher_suite = cipher_suite
+        self.write = RecordProtection(cipher_suite, write_key, write_iv)
+        self.read = RecordProtection(cipher_suite, read_key, read_iv)
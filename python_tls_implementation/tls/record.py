@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import struct
 from enum import Enum
+from typing import ClassVar
 
 from pydantic import BaseModel, field_validator
 
@@ -34,6 +35,71 @@ class ProtocolVersion(Enum):
 
         return data[0], data[1]
 
+# Precomputed lookups used on the wire path instead of Enum(...) calls.
+# CONTENT_TYPES is indexed by the raw byte, PROTOCOL_VERSIONS by the 16-bit version.
+CONTENT_TYPES: tuple[ContentType | None, ...] = tuple(
+    ContentType._value2member_map_.get(value) for value in range(256)
+)
+PROTOCOL_VERSIONS: dict[int, ProtocolVersion] = {
+    (version.value[0] << 8) | version.value[1]: version for version in ProtocolVersion
+}
+PROTOCOL_VERSION_VALUES: dict[ProtocolVersion, int] = {version: value for value, version in PROTOCOL_VERSIONS.items()}
+
+RECORD_HEADER_LENGTH = 5
+RECORD_HEADER = struct.Struct("!BHH")
+
+def parse_record_header(data: bytes | bytearray | memoryview, offset: int = 0) -> tuple[ContentType, ProtocolVersion, int]:
+    """Decode the 5-byte record header starting at ``offset`` without slicing ``data``."""
+    content_type_value, version_value, length = RECORD_HEADER.unpack_from(data, offset)
+    content_type = CONTENT_TYPES[content_type_value]
+    if content_type is None:
+        raise ValueError(f"Invalid content type: {content_type_value}")
+    version = PROTOCOL_VERSIONS.get(version_value)
+    if version is None:
+        raise ValueError(f"Invalid protocol version: {version_value:#06x}")
+    return content_type, version, length
+
+def pack_record_header(content_type: ContentType, version: ProtocolVersion, length: int) -> bytes:
+    return RECORD_HEADER.pack(content_type.value, PROTOCOL_VERSION_VALUES[version], length)
+
+CONTENT_TYPE_BYTES: tuple[bytes, ...] = tuple(bytes((value,)) for value in range(256))
+
+# Shared source of padding octets, sliced instead of allocating zeros per record
+_ZEROS: memoryview = memoryview(bytes(2**14))
+
+def zero_padding(length: int) -> bytes | memoryview:
+    return _ZEROS[:length] if length <= len(_ZEROS) else bytes(length)
+
+def find_content_type_index(data: bytes | bytearray | memoryview) -> int:
+    """Index of the last non-zero octet of a TLSInnerPlaintext, or -1 if every octet is zero.
+
+    Trailing zeros are stripped with bytes.rstrip over growing windows taken from
+    the end, so only the padding (not the content) is ever copied.
+    """
+    end = len(data)
+    if end and data[end - 1]:
+        return end - 1
+
+    window = 256
+    while end > 0:
+        start = max(0, end - window)
+        stripped = bytes(data[start:end]).rstrip(b'\x00')
+        if stripped:
+            return start + len(stripped) - 1
+        end = start
+        window *= 4
+    return -1
+
+def split_inner_plaintext(data: bytes | bytearray | memoryview) -> tuple[int, ContentType]:
+    """Locate the content type octet of a TLSInnerPlaintext (RFC 8446, section 5.4)."""
+    index = find_content_type_index(data)
+    if index < 0:
+        raise ValueError("Invalid TLSInnerPlaintext: no content type found")
+    content_type = CONTENT_TYPES[data[index]]
+    if content_type is None:
+        raise ValueError(f"Invalid TLSInnerPlaintext: unknown content type {data[index]}")
+    return index, content_type
+
 class TLSPlaintext(BaseModel):
     type: ContentType
     legacy_record_version: ProtocolVersion = ProtocolVersion.TLS_1_2
@@ -43,7 +109,7 @@ class TLSPlaintext(BaseModel):
     def length(self) -> int:
         return len(self.fragment)
 
-    MAX_FRAGMENT_LENGTH: int = 2**14
+    MAX_FRAGMENT_LENGTH: ClassVar[int] = 2**14
 
     @field_validator('fragment')
     @classmethod
@@ -64,11 +130,7 @@ class TLSPlaintext(BaseModel):
         if len(data)<5:
             raise ValueError("Data too short for TLS record header")
 
-        content_type = ContentType(data[0])
-        version_tuple = (data[1], data[2])
-        version = ProtocolVersion(version_tuple)
-        length_byte = data[3:5]
-        length = struct.unpack("!H",length_byte)[0]
+        content_type, version, length = parse_record_header(data)
 
         if len(data) < 5 + length:
             raise ValueError(f"Incomplete TLS record: expected {length} bytes, got {len(data) - 5}")
@@ -82,12 +144,7 @@ class TLSPlaintext(BaseModel):
         ), remainder
 
     def to_bytes(self) -> bytes:
-        return (
-                bytes([self.type.value]) +
-                ProtocolVersion.to_bytes(self.legacy_record_version.value) +
-                struct.pack("!H",self.length) +
-                self.fragment
-        )
+        return pack_record_header(self.type, self.legacy_record_version, self.length) + self.fragment
 
     class Config:
         arbitrary_types_allowed = True
@@ -109,28 +166,19 @@ class TLSInnerPlaintext(BaseModel):
         if not data:
             raise ValueError("Empty data provided to TLSInnerPlaintext.from_bytes")
 
-        for i in range(len(data)-1, -1, -1):
-            if (content_type_byte := data[i]) != 0:
-                try:
-                    content_type = ContentType(content_type_byte)
-                    content = data[:i]
-                    zeros_padding_length = len(data[i+1:])
-                    return cls(
-                        content=content,
-                        type=content_type,
-                        zeros_padding_length=zeros_padding_length
-                    )
-                except ValueError:
-                    continue
-
-        raise ValueError("Invalid TLSInnerPlaintext: no content type found")
+        index, content_type = split_inner_plaintext(data)
+        return cls(
+            content=data[:index],
+            type=content_type,
+            zeros_padding_length=len(data) - index - 1
+        )
 
     def to_bytes(self) -> bytes:
-        return (
-            self.content +
-            bytes([self.type.value]) +
-            bytes([0] * self.zeros_padding_length)
-        )
+        return b''.join((
+            self.content,
+            CONTENT_TYPE_BYTES[self.type.value],
+            zero_padding(self.zeros_padding_length),
+        ))
 
     class Config:
         arbitrary_types_allowed = True
@@ -144,7 +192,7 @@ class TLSCiphertext(BaseModel):
     def length(self) -> int:
         return len(self.encrypted_record)
 
-    MAX_FRAGMENT_LENGTH: int = 2 ** 14 + 256
+    MAX_FRAGMENT_LENGTH: ClassVar[int] = 2 ** 14 + 256
 
     @field_validator('encrypted_record')
     @classmethod
@@ -154,22 +202,14 @@ class TLSCiphertext(BaseModel):
         return v
 
     def to_bytes(self) -> bytes:
-        return (
-            bytes([self.opaque_type.value]) +
-            ProtocolVersion.to_bytes(self.legacy_record_version.value) +
-            struct.pack("!H", self.length) +
-            self.encrypted_record
-        )
+        return pack_record_header(self.opaque_type, self.legacy_record_version, self.length) + self.encrypted_record
 
     @classmethod
     def from_bytes(cls, data: bytes) -> tuple[TLSCiphertext,bytes]:
         if len(data)<5:
             raise ValueError("Data too short for TLS ciphertext header")
 
-        opaque_type = ContentType(data[0])
-        version_tuple = (data[1], data[2])
-        version = ProtocolVersion(version_tuple)
-        length = struct.unpack("!H", data[3:5])[0]
+        opaque_type, version, length = parse_record_header(data)
 
         if len(data) < 5+length:
             raise ValueError(f"Incomplete TLS ciphertext: expected {length} bytes, got {len(data) - 5}")
@@ -181,6 +221,5 @@ class TLSCiphertext(BaseModel):
             legacy_record_version=version,
             encrypted_record=encrypted_record
         ), remainder
-
     class Config:
         arbitrary_types_allowed = True
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Iterator, Type
+
+from python_tls_implementation.tls.buffer_pool import BufferPool
+from python_tls_implementation.tls.record import (
+    RECORD_HEADER_LENGTH,
+    TLSCiphertext,
+    TLSPlaintext,
+    parse_record_header,
+)
+from python_tls_implementation.tls.wire import WIRE_TYPES, CiphertextRecord, PlaintextRecord
+
+
+class RecordReader:
+    """Frames TLS records out of a growable receive buffer as bytes arrive.
+
+    By default the reader yields slotted wire records (``PlaintextRecord`` or
+    ``CiphertextRecord``) whose fragments are memoryview slices into the
+    reader's buffer, so no per-record copy or validation is done. They stay
+    valid until the next call to ``feed``; wrap them in ``bytes()`` to keep them
+    around longer. With ``strict=True`` each record is copied into a validated
+    pydantic model of ``record_type`` instead.
+
+    With a ``pool`` the reader owns no memory while it is drained: a pool
+    buffer is checked out when bytes arrive and given back by ``release``
+    once every complete record has been consumed.
+    """
+
+    DEFAULT_BUFFER_SIZE: int = 2 ** 16
+
+    def __init__(self, record_type: Type[TLSPlaintext] | Type[TLSCiphertext] = TLSPlaintext,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, strict: bool = False, pool: BufferPool | None = None):
+        if buffer_size <= 0:
+            raise ValueError("Buffer size must be positive")
+        self.record_type = record_type
+        self.strict = strict
+        self.pool = pool
+        self._wire_type = WIRE_TYPES[record_type]
+        self._buffer: bytearray | None = None
+        self._view: memoryview | None = None
+        # True while the current buffer is checked out of the pool
+        self._pooled: bool = False
+        self._start: int = 0
+        self._end: int = 0
+        if pool is None:
+            self._buffer = bytearray(buffer_size)
+            self._view = memoryview(self._buffer)
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes not yet consumed as a complete record."""
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._buffer is None else len(self._buffer)
+
+    @property
+    def holds_buffer(self) -> bool:
+        return self._buffer is not None
+
+    def feed(self, data: bytes | bytearray | memoryview) -> None:
+        size = len(data)
+        if not size:
+            return
+        self._reserve(size)
+        self._view[self._end:self._end + size] = data
+        self._end += size
+
+    def get_buffer(self, sizehint: int = -1) -> memoryview:
+        """Writable space after the unread bytes, for ``recv_into``; report what was written with ``buffer_updated``.
+
+        There is always room for the rest of a maximum-size record.
+        """
+        self._reserve(RECORD_HEADER_LENGTH + self._wire_type.MAX_FRAGMENT_LENGTH - (self._end - self._start))
+        return self._view[self._end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._end += nbytes
+
+    def release(self, force: bool = False) -> None:
+        """Give a pool buffer back once nothing is left unread, or with ``force`` unconditionally.
+
+        Fragments yielded earlier must not be used afterwards.
+        """
+        if self.pool is None or self._buffer is None or (self._end > self._start and not force):
+            return
+        if self._pooled:
+            self.pool.release(self._buffer)
+        self._buffer = self._view = None
+        self._pooled = False
+        self._start = self._end = 0
+
+    def _reserve(self, size: int) -> None:
+        if self._buffer is None:
+            if size <= self.pool.buffer_size:
+                self._buffer = self.pool.acquire()
+                self._pooled = True
+            else:
+                self._buffer = bytearray(size)
+            self._view = memoryview(self._buffer)
+            return
+        # Fast path: there is still room after the unread bytes
+        if self._end + size <= len(self._buffer):
+            return
+
+        pending = self._end - self._start
+        if pending + size <= len(self._buffer):
+            # Slide the partial record to the front; the buffer keeps its size,
+            # so views handed out earlier don't block the move.
+            self._buffer[0:pending] = self._buffer[self._start:self._end]
+        else:
+            # A fresh buffer is allocated instead of resizing in place, which
+            # would fail while earlier fragments are still referenced.
+            new_buffer = bytearray(max(2 * len(self._buffer), pending + size))
+            new_buffer[0:pending] = self._view[self._start:self._end]
+            if self._pooled:
+                # Oversized feeds get a private buffer, dropped by the next release
+                self.pool.release(self._buffer)
+                self._pooled = False
+            self._buffer = new_buffer
+            self._view = memoryview(new_buffer)
+        self._start = 0
+        self._end = pending
+
+    def records(self) -> Iterator[PlaintextRecord | CiphertextRecord | TLSPlaintext | TLSCiphertext]:
+        """Yield every complete record currently buffered, leaving partial ones in place."""
+        wire_type = self._wire_type
+        strict = self.strict
+        max_length = wire_type.MAX_FRAGMENT_LENGTH
+        while self._end - self._start >= RECORD_HEADER_LENGTH:
+            start = self._start
+            view = self._view
+            content_type, version, length = parse_record_header(view, start)
+            if length > max_length:
+                raise ValueError(f"Record length {length} exceeds maximum of {max_length} bytes")
+
+            end = start + RECORD_HEADER_LENGTH + length
+            if end > self._end:
+                break
+            self._start = end
+            record = wire_type(content_type, version, view[start + RECORD_HEADER_LENGTH:end])
+            yield record.to_model() if strict else record
+
+        if self._start == self._end:
+            self._start = self._end = 0
+
+    def __iter__(self) -> Iterator[PlaintextRecord | CiphertextRecord | TLSPlaintext | TLSCiphertext]:
+        return self.records()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import socket
+
+from python_tls_implementation.tls.instrumentation import ConnectionMetrics
+from python_tls_implementation.tls.record import (
+    PROTOCOL_VERSION_VALUES,
+    RECORD_HEADER,
+    RECORD_HEADER_LENGTH,
+    ContentType,
+    ProtocolVersion,
+    TLSCiphertext,
+    TLSPlaintext,
+)
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
+try:
+    IOV_MAX: int = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+
+class RecordWriter:
+    """Queues outgoing records and flushes them with scatter-gather ``sendmsg``.
+
+    Headers are packed into a preallocated area and payloads are queued by
+    reference, so a flush hands the kernel one iovec per header and per payload
+    without ever joining them into a single buffer. Payloads must not be
+    modified until they have been flushed.
+    """
+
+    DEFAULT_HEADER_SLOTS: int = 64
+
+    def __init__(self, header_slots: int = DEFAULT_HEADER_SLOTS):
+        if header_slots <= 0:
+            raise ValueError("Header slots must be positive")
+        self._headers: bytearray = bytearray(header_slots * RECORD_HEADER_LENGTH)
+        self._header_view: memoryview = memoryview(self._headers)
+        self._header_offset: int = 0
+        self._buffers: list[memoryview | bytes] = []
+        self._index: int = 0
+        self._pending: int = 0
+        self.metrics: ConnectionMetrics | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of queued bytes not yet accepted by the kernel."""
+        return self._pending
+
+    def write_record(self, content_type: ContentType, payload: bytes | memoryview,
+                     version: ProtocolVersion = ProtocolVersion.TLS_1_2) -> None:
+        length = len(payload)
+        if length > TLSCiphertext.MAX_FRAGMENT_LENGTH:
+            raise ValueError(f"Record payload of {length} bytes exceeds {TLSCiphertext.MAX_FRAGMENT_LENGTH} bytes")
+
+        offset = self._header_offset
+        if offset + RECORD_HEADER_LENGTH > len(self._headers):
+            # Queued iovecs still point into the full area, so start a new one
+            # rather than resizing it; it becomes the reusable area from here on.
+            self._headers = bytearray(2 * len(self._headers))
+            self._header_view = memoryview(self._headers)
+            offset = 0
+        RECORD_HEADER.pack_into(self._headers, offset, content_type.value, PROTOCOL_VERSION_VALUES[version], length)
+        self._header_offset = offset + RECORD_HEADER_LENGTH
+
+        self._buffers.append(self._header_view[offset:offset + RECORD_HEADER_LENGTH])
+        if length:
+            self._buffers.append(payload)
+        self._pending += RECORD_HEADER_LENGTH + length
+        if self.metrics is not None:
+            self.metrics.records_out += 1
+
+    def write(self, record: PlaintextRecord | CiphertextRecord | TLSPlaintext | TLSCiphertext) -> None:
+        if isinstance(record, (PlaintextRecord, TLSPlaintext)):
+            self.write_record(record.type, record.fragment, record.legacy_record_version)
+        else:
+            self.write_record(record.opaque_type, record.encrypted_record, record.legacy_record_version)
+
+    def flush(self, sock: socket.socket) -> int:
+        """Send queued records, returning the number of bytes written.
+
+        Partial writes are resumed until everything is sent. On a non-blocking
+        socket the flush stops when the kernel buffer is full; the unsent
+        remainder stays queued for the next call.
+        """
+        buffers = self._buffers
+        metrics = self.metrics
+        total = 0
+        while self._index < len(buffers):
+            chunk = buffers[self._index:self._index + IOV_MAX]
+            try:
+                sent = sock.sendmsg(chunk)
+            except BlockingIOError:
+                break
+            if metrics is not None:
+                metrics.write_calls += 1
+                metrics.bytes_out += sent
+                if sent < sum(map(len, chunk)):
+                    metrics.partial_writes += 1
+            total += sent
+            self._pending -= sent
+            self._advance(sent)
+
+        if self._index == len(buffers):
+            self._reset()
+        return total
+
+    def _advance(self, sent: int) -> None:
+        buffers = self._buffers
+        index = self._index
+        while sent:
+            size = len(buffers[index])
+            if sent < size:
+                buffers[index] = memoryview(buffers[index])[sent:]
+                break
+            sent -= size
+            index += 1
+        self._index = index
+
+    def _reset(self) -> None:
+        self._buffers.clear()
+        self._index = 0
+        self._header_offset = 0
+        self._pending = 0
+
+    def clear(self) -> None:
+        """Drop every queued record without sending it."""
+        self._reset()
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import time
+from typing import Callable
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from python_tls_implementation.tls.cache import LRUCache
+from python_tls_implementation.tls.handshake.extensions.early_data import EarlyDataIndication
+from python_tls_implementation.tls.handshake.server_messages import NewSessionTicket
+from python_tls_implementation.tls.key_schedule import KeySchedule, hkdf_expand_label
+from python_tls_implementation.tls.protection import CIPHER_SUITES, CipherSuite
+
+
+# Implementation based on RFC8446
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.6.1
+# https://datatracker.ietf.org/doc/html/rfc8446#section-4.2.11
+
+MAX_TICKET_LIFETIME = NewSessionTicket.MAX_TICKET_LIFETIME
+
+
+def resumption_psk(cipher_suite: CipherSuite, resumption_master_secret: bytes, ticket_nonce: bytes) -> bytes:
+    hash_name = CIPHER_SUITES[cipher_suite].hash_name
+    return hkdf_expand_label(hash_name, resumption_master_secret, b'resumption', ticket_nonce,
+                             hashlib.new(hash_name).digest_size)
+
+
+def compute_binder(cipher_suite: CipherSuite, psk: bytes, truncated_client_hello: bytes | memoryview,
+                   external: bool = False) -> bytes:
+    """PSK binder over the ClientHello truncated before the binders list."""
+    key_schedule = KeySchedule(cipher_suite, psk)
+    transcript_hash = hashlib.new(key_schedule.hash_name, truncated_client_hello).digest()
+    return key_schedule.finished_verify_data(key_schedule.binder_key(external), transcript_hash)
+
+
+def build_pre_shared_key(identities: list[tuple[bytes, int]], binder_length: int) -> bytes:
+    """OfferedPsks extension_data with zeroed binders, to be patched once binders are known."""
+    identities_bytes = b''.join(
+        struct.pack('!H', len(identity)) + identity + struct.pack('!I', obfuscated_age)
+        for identity, obfuscated_age in identities
+    )
+    binders_bytes = (bytes((binder_length,)) + bytes(binder_length)) * len(identities)
+    return (struct.pack('!H', len(identities_bytes)) + identities_bytes
+            + struct.pack('!H', len(binders_bytes)) + binders_bytes)
+
+
+def parse_offered_psks(data: bytes | memoryview) -> tuple[list[tuple[bytes, int]], list[bytes]]:
+    if len(data) < 2:
+        raise ValueError("pre_shared_key extension too short")
+    identities_end = 2 + struct.unpack_from('!H', data)[0]
+    offset = 2
+    identities = []
+    while offset < identities_end:
+        length = struct.unpack_from('!H', data, offset)[0]
+        identity = bytes(data[offset + 2:offset + 2 + length])
+        offset += 2 + length
+        identities.append((identity, struct.unpack_from('!I', data, offset)[0]))
+        offset += 4
+
+    binders_end = identities_end + 2 + struct.unpack_from('!H', data, identities_end)[0]
+    if binders_end > len(data):
+        raise ValueError("pre_shared_key binders exceed extension length")
+    offset = identities_end + 2
+    binders = []
+    while offset < binders_end:
+        length = data[offset]
+        binders.append(bytes(data[offset + 1:offset + 1 + length]))
+        offset += 1 + length
+    if len(binders) != len(identities):
+        raise ValueError("pre_shared_key must carry one binder per identity")
+    return identities, binders
+
+
+class SessionTicket:
+    """Client-side view of a ticket received in NewSessionTicket, with its derived PSK."""
+    __slots__ = ('ticket', 'psk', 'cipher_suite', 'lifetime', 'age_add', 'received_at', 'max_early_data_size')
+
+    def __init__(self, ticket: bytes, psk: bytes, cipher_suite: CipherSuite, lifetime: int, age_add: int,
+                 received_at: float, max_early_data_size: int = 0):
+        self.ticket = ticket
+        self.psk = psk
+        self.cipher_suite = cipher_suite
+        self.lifetime = lifetime
+        self.age_add = age_add
+        self.received_at = received_at
+        self.max_early_data_size = max_early_data_size
+
+    def expired(self, now: float) -> bool:
+        return now - self.received_at >= self.lifetime
+
+    def obfuscated_age(self, now: float) -> int:
+        age_ms = int((now - self.received_at) * 1000)
+        return (age_ms + self.age_add) & 0xFFFFFFFF
+
+
+class ClientSessionCache:
+    """Tickets kept per (host, port, server_name), used at most once each.
+
+    Keys are evicted least-recently-used beyond ``max_entries``; each key
+    expires with the lifetime of its newest ticket, and individual tickets are
+    checked against their own lifetime when taken.
+    """
+
+    def __init__(self, max_entries: int = 1024, tickets_per_entry: int = 4, clock: Callable[[], float] = time.time):
+        self.tickets_per_entry = tickets_per_entry
+        self.clock = clock
+        self._cache: LRUCache[tuple[str, int, str | None], list[SessionTicket]] = LRUCache(max_entries, clock=clock)
+
+    def add(self, host: str, port: int, server_name: str | None, ticket: SessionTicket) -> None:
+        key = (host, port, server_name)
+        tickets = self._cache.peek(key) or []
+        tickets.append(ticket)
+        del tickets[:-self.tickets_per_entry]
+        self._cache.put(key, tickets, ttl=ticket.lifetime)
+
+    def add_message(self, host: str, port: int, server_name: str | None, message: NewSessionTicket,
+                    cipher_suite: CipherSuite, resumption_master_secret: bytes) -> SessionTicket:
+        early_data = EarlyDataIndication.find(message.extensions)
+        max_early_data_size = (early_data.max_early_data_size or 0) if early_data is not None else 0
+        ticket = SessionTicket(
+            ticket=message.ticket,
+            psk=resumption_psk(cipher_suite, resumption_master_secret, message.ticket_nonce),
+            cipher_suite=cipher_suite,
+            lifetime=min(message.ticket_lifetime, MAX_TICKET_LIFETIME),
+            age_add=message.ticket_age_add,
+            received_at=self.clock(),
+            max_early_data_size=max_early_data_size,
+        )
+        if ticket.lifetime > 0:
+            self.add(host, port, server_name, ticket)
+        return ticket
+
+    def take(self, host: str, port: int, server_name: str | None) -> SessionTicket | None:
+        """Remove and return the newest usable ticket for the endpoint."""
+        key = (host, port, server_name)
+        tickets = self._cache.get(key)
+        if not tickets:
+            return None
+        now = self.clock()
+        usable = None
+        while tickets and usable is None:
+            ticket = tickets.pop()
+            if not ticket.expired(now):
+                usable = ticket
+        if not tickets:
+            self._cache.discard(key)
+        return usable
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+class TicketState:
+    """Server-side state a ticket stands for; everything needed to resume without certificates."""
+    __slots__ = ('psk', 'cipher_suite', 'issued_at', 'lifetime', 'age_add', 'max_early_data_size', 'server_name')
+
+    _FIXED = struct.Struct('!HdIIIB')
+
+    def __init__(self, psk: bytes, cipher_suite: CipherSuite, issued_at: float, lifetime: int, age_add: int,
+                 max_early_data_size: int = 0, server_name: str | None = None):
+        self.psk = psk
+        self.cipher_suite = cipher_suite
+        self.issued_at = issued_at
+        self.lifetime = lifetime
+        self.age_add = age_add
+        self.max_early_data_size = max_early_data_size
+        self.server_name = server_name
+
+    def to_bytes(self) -> bytes:
+        server_name = (self.server_name or '').encode('ascii')
+        return (self._FIXED.pack(self.cipher_suite, self.issued_at, self.lifetime, self.age_add,
+                                 self.max_early_data_size, len(self.psk))
+                + self.psk + server_name)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> TicketState:
+        cipher_suite, issued_at, lifetime, age_add, max_early_data_size, psk_length = cls._FIXED.unpack_from(data)
+        offset = cls._FIXED.size
+        psk = data[offset:offset + psk_length]
+        server_name = data[offset + psk_length:].decode('ascii') or None
+        return cls(psk, CipherSuite(cipher_suite), issued_at, lifetime, age_add, max_early_data_size, server_name)
+
+    def client_ticket_age_ms(self, obfuscated_ticket_age: int) -> int:
+        return (obfuscated_ticket_age - self.age_add) & 0xFFFFFFFF
+
+
+class StatelessTicketCodec:
+    """Encrypts the ticket state into the ticket itself, so the server stores nothing per session.
+
+    Tickets are sealed with the newest key; older keys are kept for opening
+    until they are rotated out.
+    """
+
+    KEY_NAME_LENGTH = 8
+    NONCE_LENGTH = 12
+
+    def __init__(self, key: bytes | None = None, max_keys: int = 2):
+        self.max_keys = max_keys
+        self._keys: list[tuple[bytes, AESGCM]] = []
+        self.rotate(key)
+
+    def rotate(self, key: bytes | None = None) -> None:
+        key = key or AESGCM.generate_key(bit_length=128)
+        name = hashlib.sha256(key).digest()[:self.KEY_NAME_LENGTH]
+        self._keys.insert(0, (name, AESGCM(key)))
+        del self._keys[self.max_keys:]
+
+    def seal(self, state: TicketState) -> bytes:
+        name, aead = self._keys[0]
+        nonce = os.urandom(self.NONCE_LENGTH)
+        return name + nonce + aead.encrypt(nonce, state.to_bytes(), name)
+
+    def open(self, ticket: bytes) -> TicketState | None:
+        name = ticket[:self.KEY_NAME_LENGTH]
+        for key_name, aead in self._keys:
+            if key_name == name:
+                nonce_end = self.KEY_NAME_LENGTH + self.NONCE_LENGTH
+                try:
+                    return TicketState.from_bytes(aead.decrypt(ticket[self.KEY_NAME_LENGTH:nonce_end], ticket[nonce_end:], name))
+                except (InvalidTag, ValueError, struct.error):
+                    return None
+        return None
+
+
+class TicketStore:
+    """Bounded in-memory ticket store; tickets are opaque random ids and can be redeemed once."""
+
+    ID_LENGTH = 32
+
+    def __init__(self, max_entries: int = 100_000, ttl: float = MAX_TICKET_LIFETIME,
+                 clock: Callable[[], float] = time.monotonic):
+        self._cache: LRUCache[bytes, TicketState] = LRUCache(max_entries, ttl=ttl, clock=clock)
+
+    def seal(self, state: TicketState) -> bytes:
+        ticket = os.urandom(self.ID_LENGTH)
+        self._cache.put(ticket, state, ttl=state.lifetime)
+        return ticket
+
+    def open(self, ticket: bytes) -> TicketState | None:
+        return self._cache.pop(ticket)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+class ServerTicketIssuer:
+    """Issues NewSessionTicket messages and redeems the tickets clients offer back."""
+
+    def __init__(self, backend: StatelessTicketCodec | TicketStore | None = None, lifetime: int = 7200,
+                 max_early_data_size: int = 0, clock: Callable[[], float] = time.time):
+        if not 0 < lifetime <= MAX_TICKET_LIFETIME:
+            raise ValueError(f"Ticket lifetime must be between 1 and {MAX_TICKET_LIFETIME} seconds")
+        self.backend = backend or StatelessTicketCodec()
+        self.lifetime = lifetime
+        self.max_early_data_size = max_early_data_size
+        self.clock = clock
+        self._nonce_counter: int = 0
+        self.issued: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def issue(self, cipher_suite: CipherSuite, resumption_master_secret: bytes,
+              server_name: str | None = None) -> NewSessionTicket:
+        ticket_nonce = self._nonce_counter.to_bytes(8, 'big')
+        self._nonce_counter += 1
+        age_add = int.from_bytes(os.urandom(4), 'big')
+        state = TicketState(
+            psk=resumption_psk(cipher_suite, resumption_master_secret, ticket_nonce),
+            cipher_suite=cipher_suite,
+            issued_at=self.clock(),
+            lifetime=self.lifetime,
+            age_add=age_add,
+            max_early_data_size=self.max_early_data_size,
+            server_name=server_name,
+        )
+        extensions = []
+        if self.max_early_data_size > 0:
+            extensions.append(EarlyDataIndication(max_early_data_size=self.max_early_data_size))
+        self.issued += 1
+        return NewSessionTicket(
+            ticket_lifetime=self.lifetime,
+            ticket_age_add=age_add,
+            ticket_nonce=ticket_nonce,
+            ticket=self.backend.seal(state),
+            extensions=extensions,
+        )
+
+    def accept(self, identity: bytes, cipher_suite: CipherSuite | None = None,
+               server_name: str | None = None) -> TicketState | None:
+        """Ticket state for a still-valid ticket matching the connection, or None for a full handshake."""
+        state = self.backend.open(identity)
+        if (state is None
+                or self.clock() - state.issued_at >= state.lifetime
+                or (cipher_suite is not None
+                    and CIPHER_SUITES[state.cipher_suite].hash_name != CIPHER_SUITES[cipher_suite].hash_name)
+                or (state.server_name is not None and state.server_name != server_name)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return state
+
+    def stats(self) -> dict[str, int]:
+        return {'issued': self.issued, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import ClassVar, Type
+
+from python_tls_implementation.tls.record import (
+    CONTENT_TYPE_BYTES,
+    ContentType,
+    ProtocolVersion,
+    TLSCiphertext,
+    TLSInnerPlaintext,
+    TLSPlaintext,
+    pack_record_header,
+    split_inner_plaintext,
+    zero_padding,
+)
+
+# Slotted, validation-free counterparts of the pydantic record models.
+# They are what the record layer passes around internally; ``to_model`` converts
+# to the validated models at the API boundary (or when a caller asks for strict mode).
+
+
+class PlaintextRecord:
+    __slots__ = ('type', 'legacy_record_version', 'fragment')
+
+    MAX_FRAGMENT_LENGTH: ClassVar[int] = TLSPlaintext.MAX_FRAGMENT_LENGTH
+
+    def __init__(self, type: ContentType, legacy_record_version: ProtocolVersion = ProtocolVersion.TLS_1_2,
+                 fragment: bytes | memoryview = b''):
+        self.type = type
+        self.legacy_record_version = legacy_record_version
+        self.fragment = fragment
+
+    @property
+    def length(self) -> int:
+        return len(self.fragment)
+
+    def header_bytes(self) -> bytes:
+        return pack_record_header(self.type, self.legacy_record_version, len(self.fragment))
+
+    def to_bytes(self) -> bytes:
+        return self.header_bytes() + self.fragment
+
+    def to_model(self) -> TLSPlaintext:
+        return TLSPlaintext(type=self.type, legacy_record_version=self.legacy_record_version,
+                            fragment=bytes(self.fragment))
+
+    @classmethod
+    def from_model(cls, record: TLSPlaintext) -> PlaintextRecord:
+        return cls(record.type, record.legacy_record_version, record.fragment)
+
+    def __repr__(self) -> str:
+        return f"PlaintextRecord(type={self.type}, legacy_record_version={self.legacy_record_version}, length={self.length})"
+
+
+class CiphertextRecord:
+    __slots__ = ('opaque_type', 'legacy_record_version', 'encrypted_record')
+
+    MAX_FRAGMENT_LENGTH: ClassVar[int] = TLSCiphertext.MAX_FRAGMENT_LENGTH
+
+    def __init__(self, opaque_type: ContentType = ContentType.application_data,
+                 legacy_record_version: ProtocolVersion = ProtocolVersion.TLS_1_2,
+                 encrypted_record: bytes | memoryview = b''):
+        self.opaque_type = opaque_type
+        self.legacy_record_version = legacy_record_version
+        self.encrypted_record = encrypted_record
+
+    @property
+    def length(self) -> int:
+        return len(self.encrypted_record)
+
+    def header_bytes(self) -> bytes:
+        return pack_record_header(self.opaque_type, self.legacy_record_version, len(self.encrypted_record))
+
+    def to_bytes(self) -> bytes:
+        return self.header_bytes() + self.encrypted_record
+
+    def to_model(self) -> TLSCiphertext:
+        return TLSCiphertext(opaque_type=self.opaque_type, legacy_record_version=self.legacy_record_version,
+                             encrypted_record=bytes(self.encrypted_record))
+
+    @classmethod
+    def from_model(cls, record: TLSCiphertext) -> CiphertextRecord:
+        return cls(record.opaque_type, record.legacy_record_version, record.encrypted_record)
+
+    def __repr__(self) -> str:
+        return (f"CiphertextRecord(opaque_type={self.opaque_type}, "
+                f"legacy_record_version={self.legacy_record_version}, length={self.length})")
+
+
+class InnerPlaintext:
+    __slots__ = ('content', 'type', 'zeros_padding_length')
+
+    def __init__(self, content: bytes | memoryview, type: ContentType, zeros_padding_length: int = 0):
+        self.content = content
+        self.type = type
+        self.zeros_padding_length = zeros_padding_length
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> InnerPlaintext:
+        if not data:
+            raise ValueError("Empty data provided to InnerPlaintext.from_bytes")
+
+        index, content_type = split_inner_plaintext(data)
+        return cls(data[:index], content_type, len(data) - index - 1)
+
+    @property
+    def length(self) -> int:
+        return len(self.content) + 1 + self.zeros_padding_length
+
+    def to_bytes(self) -> bytes:
+        return b''.join((self.content, CONTENT_TYPE_BYTES[self.type.value], zero_padding(self.zeros_padding_length)))
+
+    def to_model(self) -> TLSInnerPlaintext:
+        return TLSInnerPlaintext(content=bytes(self.content), type=self.type,
+                                 zeros_padding_length=self.zeros_padding_length)
+
+    @classmethod
+    def from_model(cls, inner: TLSInnerPlaintext) -> InnerPlaintext:
+        return cls(inner.content, inner.type, inner.zeros_padding_length)
+
+    def __repr__(self) -> str:
+        return (f"InnerPlaintext(type={self.type}, length={len(self.content)}, "
+                f"zeros_padding_length={self.zeros_padding_length})")
+
+
+WIRE_TYPES: dict[type, Type[PlaintextRecord] | Type[CiphertextRecord]] = {
+    TLSPlaintext: PlaintextRecord,
+    TLSCiphertext: CiphertextRecord,
+    PlaintextRecord: PlaintextRecord,
+    CiphertextRecord: CiphertextRecord,
+}
@@ -0,0 +1,16 @@
+import pytest
+
+
+class FakeClock:
+    """Stands in for time.monotonic; tests move time by setting ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from python_tls_implementation.tcp.async_client import AsyncTCPClient, open_record_connection
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+from python_tls_implementation.tcp.streams import RecordProtocol
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSPlaintext
+
+
+async def _echo(record_type, payloads):
+    server = AsyncTCPServer(port=0, record_type=record_type, idle_timeout=None)
+    await server.start()
+    try:
+        reader, writer = await open_record_connection(server.host, server.port, record_type=record_type)
+        for payload in payloads:
+            writer.write_record(ContentType.application_data, payload)
+        await writer.drain()
+        records = [await asyncio.wait_for(reader.read_record(), 5) for _ in payloads]
+        writer.close()
+        await writer.wait_closed()
+        return records
+    finally:
+        await server.shutdown(1.0)
+
+
+def test_echo_plaintext_records():
+    records = asyncio.run(_echo(TLSPlaintext, [b'hello', b'x' * 2 ** 14]))
+    assert [(record.type, bytes(record.fragment)) for record in records] == [
+        (ContentType.application_data, b'hello'),
+        (ContentType.application_data, b'x' * 2 ** 14),
+    ]
+
+
+def test_echo_ciphertext_records():
+    # Ciphertext records may be up to 2^14 + 256 bytes
+    payloads = [b'\x17' * 40, b'\xaa' * (2 ** 14 + 256)]
+    records = asyncio.run(_echo(TLSCiphertext, payloads))
+    assert [(record.opaque_type, bytes(record.encrypted_record)) for record in records] == [
+        (ContentType.application_data, payload) for payload in payloads
+    ]
+
+
+def test_client_send_and_receive():
+    async def run():
+        server = AsyncTCPServer(port=0, idle_timeout=None)
+        await server.start()
+        client = AsyncTCPClient()
+        try:
+            assert await client.connect(server.host, server.port, timeout=5)
+            # A write larger than one record is split into maximum-size records
+            assert await client.send_data(b'y' * (2 ** 14 + 10))
+            first = await client.receive_record(timeout=5)
+            second = await client.receive_record(timeout=5)
+            await client.close()
+            return first, second
+        finally:
+            await server.shutdown(1.0)
+
+    first, second = asyncio.run(run())
+    assert (first.length, second.length) == (2 ** 14, 10)
+
+
+def test_oversized_record_is_rejected():
+    async def run():
+        server = AsyncTCPServer(port=0, idle_timeout=None)
+        await server.start()
+        try:
+            reader, writer = await open_record_connection(server.host, server.port)
+            with pytest.raises(ValueError):
+                writer.write_record(ContentType.application_data, b'z' * (TLSCiphertext.MAX_FRAGMENT_LENGTH + 1))
+            writer.close()
+        finally:
+            await server.shutdown(1.0)
+
+    asyncio.run(run())
+
+
+def test_record_protocol_needs_a_running_loop():
+    with pytest.raises(RuntimeError):
+        RecordProtocol()
+
+    async def build():
+        return RecordProtocol()._loop is asyncio.get_running_loop()
+
+    assert asyncio.run(build())
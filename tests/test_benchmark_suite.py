@@ -0,0 +1,55 @@
+import json
+
+from benchmarks import corpus, suite
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+
+
+def test_vector_prefixes_length():
+    assert corpus.vector(b'abc') == b'\x00\x03abc'
+    assert corpus.vector(b'\x03\x04', 1) == b'\x02\x03\x04'
+
+
+def test_corpus_hellos_round_trip():
+    for name, hello in corpus.client_hellos().items():
+        body = hello._body_bytes()
+        assert ClientHello.parse(body)._body_bytes() == body, name
+        assert ClientHelloView(body).extension_types == [int(ext.extension_type) for ext in hello.extensions]
+
+
+def _result(ops: float, peak: float) -> dict[str, float]:
+    return {'ops_per_sec': ops, 'peak_bytes_per_op': peak, 'retained_bytes_per_op': 0.0}
+
+
+def test_compare_flags_speed_and_allocation_regressions():
+    baseline = {'case': _result(1000.0, 1000.0)}
+    assert suite.compare({'case': _result(950.0, 1000.0)}, baseline, 0.10) == []
+    assert len(suite.compare({'case': _result(800.0, 1000.0)}, baseline, 0.10)) == 1
+    assert len(suite.compare({'case': _result(1000.0, 2000.0)}, baseline, 0.10)) == 1
+    # Cases missing from the baseline are not compared
+    assert suite.compare({'other': _result(1.0, 1e9)}, baseline, 0.10) == []
+
+
+def test_compare_skips_timings_from_another_host():
+    baseline = {'case': _result(28000.0, 1000.0)}
+    assert suite.compare({'case': _result(7800.0, 1000.0)}, baseline, 0.10, timings=False) == []
+    assert len(suite.compare({'case': _result(7800.0, 5000.0)}, baseline, 0.10, timings=False)) == 1
+
+
+def test_host_info_describes_this_host():
+    host = suite.host_info()
+    assert set(host) == {'python', 'implementation', 'machine', 'cpu', 'cpus'}
+    assert host == suite.host_info()
+
+
+def test_same_host_treats_missing_keys_as_unknown():
+    host = suite.host_info()
+    assert suite.same_host(host, host)
+    assert suite.same_host({'python': host['python'], 'machine': host['machine']}, host)
+    assert not suite.same_host({**host, 'cpus': host['cpus'] + 1}, host)
+
+
+def test_committed_baseline_matches_this_suite():
+    baseline = json.loads(suite.DEFAULT_BASELINE.read_text())
+    assert set(suite.host_info()) <= set(baseline)
+    assert set(baseline['results']) == set(suite.cases())
@@ -0,0 +1,165 @@
+import asyncio
+import socket
+
+import pytest
+
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+from python_tls_implementation.tcp.server import TCPServer
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tcp.streams import RecordProtocol
+from python_tls_implementation.tls.buffer_pool import RECORD_BUFFER_SIZE, BufferPool
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+from python_tls_implementation.tls.record_reader import RecordReader
+
+
+def record(size: int) -> bytes:
+    return TLSPlaintext(type=ContentType.application_data, fragment=b'r' * size).to_bytes()
+
+
+@pytest.fixture
+def pool():
+    # Four buffers: pressure at three, recovery at one
+    return BufferPool(max_bytes=4 * RECORD_BUFFER_SIZE)
+
+
+def test_watermarks_notify_listeners(pool):
+    events = []
+    pool.add_listener(events.append)
+    buffers = [pool.acquire() for _ in range(3)]
+    assert events == [True] and pool.under_pressure
+    pool.release(buffers.pop())
+    assert events == [True]
+    pool.release(buffers.pop())
+    assert events == [True, False] and not pool.under_pressure
+    pool.remove_listener(events.append)
+    pool.release(buffers.pop())
+    assert pool.stats()['pressure_events'] == 1 and pool.in_use == 0
+
+
+def test_hard_cap_and_reuse(pool):
+    buffers = [pool.acquire() for _ in range(4)]
+    with pytest.raises(MemoryError):
+        pool.acquire()
+    for buffer in buffers:
+        pool.release(buffer)
+    # Only low_water buffers are kept for reuse
+    assert pool.free == 1
+    assert pool.acquire() is buffers[0]
+    assert pool.stats()['refused'] == 1 and pool.stats()['allocated'] == 4
+
+
+def test_release_rejects_foreign_buffer(pool):
+    with pytest.raises(ValueError):
+        pool.release(bytearray(10))
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        BufferPool(buffer_size=1024)
+    with pytest.raises(ValueError):
+        BufferPool(max_bytes=RECORD_BUFFER_SIZE - 1)
+    with pytest.raises(ValueError):
+        BufferPool(max_bytes=4 * RECORD_BUFFER_SIZE, high_water=RECORD_BUFFER_SIZE, low_water=RECORD_BUFFER_SIZE)
+
+
+def test_record_reader_holds_a_buffer_only_while_a_record_is_incomplete(pool):
+    reader = RecordReader(pool=pool)
+    assert not reader.holds_buffer and reader.capacity == 0
+    data = record(1000) + record(2000)
+    for chunk in (data[:3], data[3:1500]):
+        buffer = reader.get_buffer()
+        buffer[:len(chunk)] = chunk
+        reader.buffer_updated(len(chunk))
+    assert [len(r.fragment) for r in reader.records()] == [1000]
+    reader.release()
+    assert reader.holds_buffer and pool.in_use == 1
+    reader.feed(data[1500:])
+    assert [len(r.fragment) for r in reader.records()] == [2000]
+    reader.release()
+    assert not reader.holds_buffer and pool.in_use == 0
+
+
+def test_record_reader_force_release(pool):
+    reader = RecordReader(pool=pool)
+    reader.feed(record(100)[:50])
+    reader.release()
+    assert pool.in_use == 1
+    reader.release(force=True)
+    assert pool.in_use == 0 and reader.pending == 0
+
+
+def test_servers_use_private_buffers_by_default():
+    async def main():
+        return RecordProtocol()._record_reader.holds_buffer
+
+    assert asyncio.run(main())
+    assert AsyncTCPServer().buffer_pool is None
+
+
+def test_pooled_server_returns_buffers(pool):
+    data = record(4096)
+
+    async def main():
+        server = AsyncTCPServer(port=0, buffer_pool=pool, idle_timeout=None)
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(data)
+        assert await reader.readexactly(len(data)) == data
+        # Leave one connection in the middle of a record at shutdown
+        partial = socket.create_connection((server.host, server.port))
+        partial.sendall(data[:100])
+        await asyncio.sleep(0.1)
+        assert pool.in_use == 1
+        await server.shutdown(0.1)
+        writer.close()
+        partial.close()
+
+    asyncio.run(main())
+    assert pool.in_use == 0 and pool.peak_in_use >= 1
+
+
+def test_tcp_server_run_reads_through_its_pool(monkeypatch, pool):
+    data = record(4096)
+
+    class OneConnection(AsyncTCPServer):
+        async def serve_forever(self):
+            await self.start()
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(data)
+            assert await reader.readexactly(len(data)) == data
+            writer.close()
+            await self.shutdown(0.1)
+
+    monkeypatch.setattr('python_tls_implementation.tcp.server.AsyncTCPServer', OneConnection)
+    TCPServer(port=0, buffer_pool=pool).run(idle_timeout=None)
+    assert pool.peak_in_use == 1 and pool.in_use == 0
+
+
+def test_tcp_server_readers_return_buffers_on_close(pool):
+    server = TCPServer(port=0, buffer_pool=pool)
+    server.start()
+    client = socket.create_connection(server.socket.getsockname())
+    try:
+        client_socket, _ = server.accept_connection()
+        data = record(2000)
+        client.sendall(data + data[:10])
+        received = server.receive_record(client_socket)
+        assert received.length == 2000 and pool.in_use == 1
+        server.close()
+        assert pool.in_use == 0 and not server.connections
+    finally:
+        client.close()
+
+
+def test_socket_reader_gives_buffer_back_when_drained_and_at_eof(pool):
+    server_side, client = socket.socketpair()
+    with server_side, client:
+        reader = BufferedSocketReader(server_side, pool=pool)
+        client.sendall(record(500))
+        assert reader.read_record().length == 500
+        assert reader.holds_buffer
+        client.sendall(record(10))
+        assert reader.read_record().length == 10
+        client.shutdown(socket.SHUT_WR)
+        assert reader.read_record() is None
+        assert not reader.holds_buffer and pool.in_use == 0
@@ -0,0 +1,46 @@
+import pytest
+
+from python_tls_implementation.tls.cache import LRUCache
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert 'b' not in cache and cache.peek('a') == 1 and cache.peek('c') == 3
+    assert cache.stats() == {'size': 2, 'hits': 1, 'misses': 0, 'evictions': 1, 'expirations': 0}
+
+
+def test_peek_does_not_refresh_recency():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.peek('a')
+    cache.put('c', 3)
+    assert 'a' not in cache
+
+
+def test_entries_expire(clock):
+    cache = LRUCache(10, ttl=5.0, clock=clock)
+    cache.put('default', 1)
+    cache.put('short', 2, ttl=1.0)
+    clock.now = 1.0
+    assert cache.get('short') is None and cache.get('default') == 1
+    clock.now = 5.0
+    assert cache.purge_expired() == 1 and len(cache) == 0
+    assert cache.expirations == 2 and cache.misses == 1
+
+
+def test_pop_is_single_use():
+    cache = LRUCache(4)
+    cache.put('ticket', 'state')
+    assert cache.pop('ticket') == 'state'
+    assert cache.pop('ticket', 'gone') == 'gone'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUCache(0)
@@ -0,0 +1,205 @@
+import os
+import struct
+import types
+
+import pytest
+
+from python_tls_implementation.tls.handshake import certificate
+from python_tls_implementation.tls.handshake.certificate import (
+    AVAILABLE_ALGORITHMS,
+    CachedCertificateChain,
+    Certificate,
+    CertificateCache,
+    CertificateEntry,
+    CompressedCertificate,
+    compress_certificate,
+    decompress_certificate,
+)
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionRegistry, ExtensionType
+from python_tls_implementation.tls.handshake.extensions.compress_certificate import (
+    CertificateCompressionAlgorithm,
+    CompressCertificate,
+)
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.server_handshake import ServerHandshake
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.key_share import KeyShareKeyPair, NamedGroup
+
+# Stand-ins for DER certificates: repetitive enough to compress like real ones
+LEAF = b'\x30\x82' + b'leaf certificate ' * 80
+INTERMEDIATE = b'\x30\x82' + b'intermediate certificate ' * 60
+
+zlib = CertificateCompressionAlgorithm.zlib
+
+
+def certificate_body(*certificates: bytes) -> bytes:
+    return Certificate(certificate_list=[CertificateEntry(cert_data=cert) for cert in certificates])._body_bytes()
+
+
+def test_certificate_parse_round_trip():
+    body = certificate_body(LEAF, INTERMEDIATE)
+    parsed = Certificate.parse(body)
+    assert parsed.certificate_request_context == b''
+    assert [entry.cert_data for entry in parsed.certificate_list] == [LEAF, INTERMEDIATE]
+    assert parsed._body_bytes() == body
+
+
+def test_certificate_parse_rejects_bad_list_length():
+    body = certificate_body(LEAF)
+    with pytest.raises(ValueError, match="length does not match"):
+        Certificate.parse(body + b'\x00')
+
+
+@pytest.mark.parametrize('algorithm', AVAILABLE_ALGORITHMS)
+def test_compress_certificate_round_trip(algorithm):
+    body = certificate_body(LEAF, INTERMEDIATE)
+    compressed = compress_certificate(body, algorithm)
+    assert len(compressed) < len(body)
+    assert decompress_certificate(compressed, algorithm, len(body)) == body
+
+
+def test_decompress_certificate_rejects_wrong_length():
+    body = certificate_body(LEAF)
+    compressed = compress_certificate(body, zlib)
+    with pytest.raises(ValueError, match="bad_certificate: decompressed to"):
+        decompress_certificate(compressed, zlib, len(body) + 1)
+    # Longer than announced is caught without inflating the whole message
+    with pytest.raises(ValueError, match="bad_certificate: decompressed to"):
+        decompress_certificate(compressed, zlib, len(body) - 1)
+
+
+@pytest.mark.parametrize('uncompressed_length', [0, 2 ** 24])
+def test_decompress_certificate_rejects_invalid_uncompressed_length(uncompressed_length):
+    with pytest.raises(ValueError, match="bad_certificate: invalid uncompressed_length"):
+        decompress_certificate(b'\x78\x9c', zlib, uncompressed_length)
+
+
+def test_decompress_certificate_rejects_unknown_algorithm_and_garbage():
+    with pytest.raises(ValueError, match="bad_certificate: unsupported"):
+        decompress_certificate(b'data', 0x1234, 4)
+    with pytest.raises(ValueError, match="bad_certificate: certificate decompression failed"):
+        decompress_certificate(b'not zlib data', zlib, 100)
+
+
+@pytest.mark.parametrize('algorithm', AVAILABLE_ALGORITHMS)
+def test_decompress_certificate_stops_at_uncompressed_length(algorithm):
+    # A small message that inflates far past what it announces is cut off, not inflated whole
+    bomb = compress_certificate(bytes(2 ** 24), algorithm)
+    with pytest.raises(ValueError, match="bad_certificate: decompressed to 1001 bytes, expected 1000"):
+        decompress_certificate(bomb, algorithm, 1000)
+
+
+@pytest.mark.parametrize('algorithm', AVAILABLE_ALGORITHMS)
+def test_decompress_certificate_rejects_garbage(algorithm):
+    with pytest.raises(ValueError, match="bad_certificate"):
+        decompress_certificate(b'not compressed at all', algorithm, 100)
+
+
+@pytest.mark.parametrize('module, algorithm', [
+    ('brotli', CertificateCompressionAlgorithm.brotli),
+    ('zstandard', CertificateCompressionAlgorithm.zstd),
+])
+def test_optional_codecs_round_trip_when_installed(module, algorithm):
+    pytest.importorskip(module)
+    if algorithm == CertificateCompressionAlgorithm.brotli and not certificate._brotli_limits_output():
+        pytest.skip("brotli before 1.2 cannot bound its output")
+    assert algorithm in AVAILABLE_ALGORITHMS
+    chain = CachedCertificateChain([LEAF, INTERMEDIATE], algorithms=[algorithm])
+    frame = chain.frame_for([algorithm])
+    assert frame.msg_type == HandshakeType.compressed_certificate
+    assert CompressedCertificate.parse(frame.body).decompress()._body_bytes() == chain.frame.body
+
+
+def test_brotli_without_output_limit_is_not_used(monkeypatch):
+    class OldDecompressor:
+        def process(self, data):
+            return data
+
+    monkeypatch.setattr(certificate, 'brotli', types.SimpleNamespace(Decompressor=OldDecompressor))
+    assert not certificate._brotli_limits_output()
+
+
+def test_compressed_certificate_message_round_trip():
+    body = certificate_body(LEAF, INTERMEDIATE)
+    message = CompressedCertificate.compress(body, zlib)
+    parsed = CompressedCertificate.parse(message._body_bytes())
+    assert (parsed.algorithm, parsed.uncompressed_length) == (zlib, len(body))
+    assert [entry.cert_data for entry in parsed.decompress().certificate_list] == [LEAF, INTERMEDIATE]
+    with pytest.raises(ValueError, match="length does not match"):
+        CompressedCertificate.parse(message._body_bytes()[:-1])
+
+
+def test_cached_chain_frame_for_peer_algorithms():
+    chain = CachedCertificateChain([LEAF, INTERMEDIATE])
+    assert chain.frame.msg_type == HandshakeType.certificate
+    assert chain.frame.body == certificate_body(LEAF, INTERMEDIATE)
+    assert set(chain.compressed) == set(AVAILABLE_ALGORITHMS)
+
+    assert chain.frame_for() is chain.frame
+    assert chain.frame_for([0x1234]) is chain.frame
+    frame = chain.frame_for([0x1234, zlib])
+    assert frame.msg_type == HandshakeType.compressed_certificate
+    assert frame.length < chain.frame.length
+    assert CompressedCertificate.parse(frame.body).decompress()._body_bytes() == chain.frame.body
+
+
+def test_cached_chain_skips_algorithms_that_do_not_shrink():
+    chain = CachedCertificateChain([os.urandom(64)])
+    assert chain.compressed == {}
+    assert chain.frame_for([zlib]) is chain.frame
+
+
+def test_cached_chain_rejects_bad_input():
+    with pytest.raises(ValueError, match="must not be empty"):
+        CachedCertificateChain([])
+    with pytest.raises(ValueError, match="one extensions list per certificate"):
+        CachedCertificateChain([LEAF, INTERMEDIATE], extensions=[[]])
+
+
+def test_certificate_cache_builds_each_chain_once():
+    cache = CertificateCache(max_size=1)
+    chain = cache.get([LEAF, INTERMEDIATE])
+    assert cache.get((LEAF, INTERMEDIATE)) is chain
+    assert cache.get([LEAF]) is not chain
+    assert cache.stats() == {'chains': 1, 'hits': 1, 'misses': 2, 'evictions': 1}
+
+
+def test_compress_certificate_extension_round_trip():
+    extension = CompressCertificate(algorithms=[zlib, 0x1234])
+    parsed = ExtensionRegistry.parse_all(extension.to_bytes())
+    assert parsed == [extension]
+    assert parsed[0].algorithms == [zlib, 0x1234]
+
+
+@pytest.mark.parametrize('data', [b'', b'\x02\x00', b'\x03\x00\x01\x00', b'\x02\x00\x01\x00'])
+def test_compress_certificate_extension_rejects_malformed(data):
+    with pytest.raises(ValueError, match="decode_error"):
+        CompressCertificate.parse_from_bytes(data)
+
+
+def _client_hello(compress_certificate: bytes | None) -> HandshakeFrame:
+    key_pair = KeyShareKeyPair.generate(NamedGroup.x25519)
+    key_share = struct.pack('!HH', NamedGroup.x25519, len(key_pair.public_bytes)) + key_pair.public_bytes
+    extensions = [
+        Extension(extension_type=ExtensionType.supported_versions, data=b'\x02\x03\x04'),
+        Extension(extension_type=ExtensionType.key_share, data=struct.pack('!H', len(key_share)) + key_share),
+    ]
+    if compress_certificate is not None:
+        extensions.append(Extension(extension_type=ExtensionType.compress_certificate, data=compress_certificate))
+    hello = ClientHello(random_value=os.urandom(32), cipher_suites=[0x1301], extensions=extensions)
+    return HandshakeFrame.from_message(hello)
+
+
+@pytest.mark.parametrize('offered, msg_type', [
+    (None, HandshakeType.certificate),
+    (b'\x02\x00\x01', HandshakeType.compressed_certificate),
+    (b'\x02\x12\x34', HandshakeType.certificate),
+])
+def test_server_handshake_sends_cached_certificate(offered, msg_type):
+    chain = CachedCertificateChain([LEAF, INTERMEDIATE])
+    handshake = ServerHandshake(certificate_chain=chain)
+    handshake.resume(handshake.receive_client_hello(_client_hello(offered)).run())
+    frame = handshake.certificate_frame()
+    assert frame.msg_type == msg_type
+    assert frame is chain.frame_for([zlib] if msg_type == HandshakeType.compressed_certificate else [])
@@ -0,0 +1,80 @@
+import struct
+
+import pytest
+
+from benchmarks import corpus
+from python_tls_implementation.tls.handshake.client_hello_template import ClientHelloTemplate
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+
+
+def psk_extension(identity: bytes, age: int, binder: bytes) -> bytes:
+    return (corpus.vector(corpus.vector(identity) + struct.pack('!I', age))
+            + corpus.vector(corpus.vector(binder, 1)))
+
+
+def test_build_matches_serializing_the_same_hello():
+    hello = corpus.firefox_client_hello(resumed=True)
+    template = ClientHelloTemplate(hello)
+    assert template.build(hello.random_value) == hello.to_bytes()
+
+    random_value, session_id = b'\x11' * 32, b'\x22' * 32
+    x25519, binder = b'\x33' * 32, b'\x44' * 32
+    identity = ClientHelloView(hello._body_bytes()).extension_data(ExtensionType.pre_shared_key)[4:196]
+    built = template.build(random_value, session_id, {corpus.X25519: x25519}, [0xdeadbeef], [binder])
+
+    shares = ClientHelloView(hello._body_bytes()).key_shares
+    shares[corpus.X25519] = x25519
+    key_share = corpus.vector(b''.join(struct.pack('!HH', group, len(share)) + share for group, share in shares.items()))
+    replaced = {
+        ExtensionType.key_share: key_share,
+        ExtensionType.pre_shared_key: psk_extension(bytes(identity), 0xdeadbeef, binder),
+    }
+    extensions = [
+        Extension(extension_type=ext.extension_type, data=replaced[ext.extension_type])
+        if ext.extension_type in replaced else ext
+        for ext in hello.extensions
+    ]
+    expected = hello.model_copy(update={'random_value': random_value, 'legacy_session_id': session_id,
+                                        'extensions': extensions})
+    assert built == expected.to_bytes()
+    assert ClientHello.parse(bytes(built[4:])).to_bytes() == built
+
+
+def test_binders_offset_truncates_before_binders():
+    hello = corpus.firefox_client_hello(resumed=True)
+    template = ClientHelloTemplate(hello)
+    built = template.build(hello.random_value)
+    (offset, length), = template.binders
+    assert length == 32 and template.binders_offset == offset - 3
+    template.patch_binders(built, [b'\x55' * 32])
+    assert built[offset:] == b'\x55' * 32
+
+
+def test_template_without_psk():
+    template = ClientHelloTemplate(corpus.chrome_client_hello())
+    assert template.binders_offset is None and template.ticket_ages == []
+    assert set(template.key_shares) == {corpus.GREASE[2], corpus.X25519MLKEM768, corpus.X25519}
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({'random_value': b'short'}, 'Random'),
+    ({'legacy_session_id': b'\x00'}, 'Session id'),
+    ({'key_shares': {corpus.GREASE[0]: b'\x00'}}, 'no key share'),
+    ({'key_shares': {corpus.X25519: b'\x00' * 31}}, 'Key share'),
+    ({'obfuscated_ticket_ages': [1, 2]}, 'PSK identities'),
+    ({'binders': []}, 'PSK binders'),
+])
+def test_build_rejects_mismatched_values(kwargs, message):
+    template = ClientHelloTemplate(corpus.firefox_client_hello(resumed=True))
+    kwargs.setdefault('random_value', b'\x00' * 32)
+    with pytest.raises(ValueError, match=message):
+        template.build(**kwargs)
+
+
+def test_psk_must_be_last():
+    hello = corpus.firefox_client_hello(resumed=True)
+    hello.extensions.append(hello.extensions.pop(0))
+    with pytest.raises(ValueError, match='last extension'):
+        ClientHelloTemplate(hello)
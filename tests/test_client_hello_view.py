@@ -0,0 +1,77 @@
+import struct
+
+import pytest
+
+from benchmarks import corpus
+from python_tls_implementation.tls.handshake.client_hello_view import ClientHelloView
+from python_tls_implementation.tls.handshake.extensions.base import ExtensionType
+
+
+@pytest.fixture
+def chrome():
+    return corpus.chrome_client_hello('example.org')
+
+
+def test_fields_match_the_model(chrome):
+    view = ClientHelloView.from_message(chrome.to_bytes())
+    assert view.legacy_version is chrome.legacy_version
+    assert view.random_value == chrome.random_value
+    assert view.legacy_session_id == chrome.legacy_session_id
+    assert list(view.cipher_suites) == chrome.cipher_suites
+    assert view.legacy_compression_methods == [0]
+    assert view.extension_types == [int(ext.extension_type) for ext in chrome.extensions]
+    # Bytes, not models: registered extensions parse into their own classes
+    assert view.to_client_hello().to_bytes() == chrome.to_bytes()
+
+
+def test_common_extensions(chrome):
+    view = ClientHelloView(chrome._body_bytes())
+    assert view.server_name == 'example.org'
+    assert view.alpn_protocols == [b'h2', b'http/1.1']
+    assert view.supported_versions == (corpus.GREASE[3], 0x0304, 0x0303)
+    assert view.compress_certificate_algorithms == (2,)
+    assert {group: len(share) for group, share in view.key_shares.items()} == {
+        corpus.GREASE[2]: 1, corpus.X25519MLKEM768: 1216, corpus.X25519: 32}
+
+
+def test_missing_extensions():
+    hello = corpus.chrome_client_hello()
+    hello.extensions = []
+    view = ClientHelloView(hello._body_bytes())
+    assert view.server_name is None and view.alpn_protocols == [] and view.key_shares == {}
+    assert view.supported_versions == () and view.extension(ExtensionType.server_name) is None
+
+
+def test_extensions_are_decoded_once(chrome):
+    view = ClientHelloView(chrome._body_bytes())
+    assert view.has_extension(ExtensionType.compress_certificate)
+    offset, length = view.extension_location(ExtensionType.compress_certificate)
+    assert bytes(view.extension_data(ExtensionType.compress_certificate)) == chrome._body_bytes()[offset:offset + length]
+    extension = view.extension(ExtensionType.compress_certificate)
+    assert view.extension(ExtensionType.compress_certificate) is extension
+
+
+def test_hello_without_extensions_block(chrome):
+    body = chrome._body_bytes()
+    view = ClientHelloView(body)
+    offset, _ = view.extension_location(view.extension_types[0])
+    # Cut the hello right after the compression methods
+    assert ClientHelloView(body[:offset - 6]).extension_types == []
+
+
+def test_malformed_hellos(chrome):
+    body = chrome._body_bytes()
+    view = ClientHelloView(body)
+    offset, _ = view.extension_location(view.extension_types[0])
+    extensions_start = offset - 6
+    duplicate = body[:extensions_start] + struct.pack('!H', 8) + b'\x00\x17\x00\x00' * 2
+    with pytest.raises(ValueError, match='Duplicate'):
+        ClientHelloView(duplicate)
+    with pytest.raises(ValueError):
+        ClientHelloView(body[:-1])
+    with pytest.raises(ValueError):
+        ClientHelloView(body[:37])
+    with pytest.raises(ValueError, match='Not a ClientHello'):
+        ClientHelloView.from_message(b'\x02' + chrome.to_bytes()[1:])
+    with pytest.raises(ValueError, match='Incomplete'):
+        ClientHelloView.from_message(chrome.to_bytes()[:-1])
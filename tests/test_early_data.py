@@ -0,0 +1,91 @@
+import pytest
+
+from python_tls_implementation.tls.early_data import AntiReplayWindow, BloomFilter, EarlyDataAcceptor, EarlyDataBudget
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionRegistry, ExtensionType
+from python_tls_implementation.tls.handshake.extensions.early_data import EarlyDataIndication
+from python_tls_implementation.tls.protection import CipherSuite
+from python_tls_implementation.tls.resumption import TicketState
+
+
+def test_budget_take_and_consume():
+    budget = EarlyDataBudget(10)
+    assert bytes(budget.take(b'x' * 6)) == b'x' * 6
+    assert bytes(budget.take(b'y' * 6)) == b'y' * 4 and budget.remaining == 0
+    budget = EarlyDataBudget(10)
+    budget.consume(10)
+    with pytest.raises(ValueError, match='unexpected_message'):
+        budget.consume(1)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(1000, 1e-4)
+    digests = [i.to_bytes(16, 'little') for i in range(1, 1001)]
+    for digest in digests:
+        bloom.add(digest)
+    assert all(digest in bloom for digest in digests)
+    bloom.clear()
+    assert not any(digest in bloom for digest in digests)
+
+
+def test_replays_are_caught_within_the_window(clock):
+    window = AntiReplayWindow(window=10.0, capacity=1000, buckets=6, clock=clock)
+    assert window.check_and_record(b'binder')
+    clock.now = 9.9
+    assert not window.check_and_record(b'binder')
+    assert window.check_and_record(b'other')
+    assert window.stats()['recorded'] == 2 and window.stats()['replays'] == 1
+
+
+def test_old_entries_age_out(clock):
+    window = AntiReplayWindow(window=10.0, capacity=1000, buckets=6, clock=clock)
+    window.check_and_record(b'binder')
+    memory = window.memory
+    clock.now = 12.1
+    assert window.check_and_record(b'binder')
+    # Jumping far ahead clears every bucket without growing
+    clock.now = 1e6
+    assert window.check_and_record(b'binder') and window.memory == memory
+
+
+def test_window_needs_two_buckets():
+    with pytest.raises(ValueError):
+        AntiReplayWindow(buckets=1)
+
+
+def acceptor_and_state(clock, ticket_limit=2048):
+    acceptor = EarlyDataAcceptor(1024, AntiReplayWindow(window=10.0, clock=clock), clock=clock)
+    state = TicketState(b'psk', CipherSuite.TLS_AES_128_GCM_SHA256, 100.0, 3600, 1000, ticket_limit)
+    return acceptor, state
+
+
+def test_acceptor_grants_the_smaller_limit_once(clock):
+    acceptor, state = acceptor_and_state(clock)
+    clock.now = 102.0
+    budget = acceptor.accept(state, 2000 + state.age_add, b'binder')
+    assert budget is not None and budget.limit == 1024
+    assert acceptor.accept(state, 2000 + state.age_add, b'binder') is None
+    assert acceptor.stats()['accepted'] == 1 and acceptor.stats()['rejected'] == 1
+
+
+@pytest.mark.parametrize('client_age_ms, identity, ticket_limit', [
+    (2000 + 11_000, 0, 2048),  # ticket age skew beyond the window
+    (2000, 1, 2048),           # not the first identity
+    (2000, 0, 0),              # ticket does not allow early data
+])
+def test_acceptor_rejects(clock, client_age_ms, identity, ticket_limit):
+    acceptor, state = acceptor_and_state(clock, ticket_limit)
+    clock.now = 102.0
+    assert acceptor.accept(state, client_age_ms + state.age_add, b'binder', identity) is None
+    assert acceptor.skip_budget().limit == 1024
+
+
+def test_early_data_extension():
+    assert EarlyDataIndication().to_bytes() == b'\x00\x2a\x00\x00'
+    ticket_extension = EarlyDataIndication(max_early_data_size=16384)
+    parsed, = ExtensionRegistry.parse_all(ticket_extension.to_bytes())
+    assert parsed == ticket_extension
+    opaque = Extension(extension_type=ExtensionType.early_data, data=b'\x00\x00\x01\x00')
+    assert EarlyDataIndication.find([opaque]).max_early_data_size == 256
+    assert EarlyDataIndication.find([]) is None
+    with pytest.raises(ValueError):
+        EarlyDataIndication.parse_from_bytes(b'\x00')
@@ -0,0 +1,82 @@
+import struct
+
+import pytest
+from pydantic import ValidationError
+
+from python_tls_implementation.tls.handshake.extensions.base import (
+    Extension,
+    ExtensionRegistry,
+    ExtensionType,
+    GREASE_VALUES,
+    is_grease,
+)
+from python_tls_implementation.tls.handshake.extensions.early_data import EarlyDataIndication
+
+
+def block(*extensions: tuple[int, bytes]) -> bytes:
+    return b''.join(struct.pack('!HH', extension_type, len(data)) + data for extension_type, data in extensions)
+
+
+def test_grease_values():
+    assert len(GREASE_VALUES) == 16
+    assert is_grease(0x0a0a) and is_grease(0xfafa)
+    assert not is_grease(0x0a1a) and not is_grease(ExtensionType.key_share)
+
+
+def test_parse_all_keeps_grease_and_unknown_types():
+    extensions = ExtensionRegistry.parse_all(block(
+        (0x0a0a, b''),
+        (ExtensionType.server_name, b'\x00\x00'),
+        (0x1234, b'opaque'),
+        (ExtensionType.early_data, b''),
+        (0xfafa, b'\x00'),
+    ))
+    assert [ext.extension_type for ext in extensions] == [
+        0x0a0a, ExtensionType.server_name, 0x1234, ExtensionType.early_data, 0xfafa]
+    assert type(extensions[0].extension_type) is int
+    assert type(extensions[1].extension_type) is ExtensionType
+    assert extensions[2].data == b'opaque'
+    # Registered types are decoded by their handler
+    assert isinstance(extensions[3], EarlyDataIndication)
+
+
+def test_parse_all_round_trips():
+    data = block((0x2a2a, b'grease'), (ExtensionType.supported_versions, b'\x02\x03\x04'), (0xfe0d, b'ech'))
+    assert b''.join(ext.to_bytes() for ext in ExtensionRegistry.parse_all(data)) == data
+
+
+@pytest.mark.parametrize('data, message', [
+    (block((ExtensionType.server_name, b''), (ExtensionType.server_name, b'')), "Duplicate"),
+    (block((0x0a0a, b''), (0x0a0a, b'\x01')), "Duplicate"),
+    (block((ExtensionType.padding, b'\x00' * 4))[:-1], "exceeds"),
+    (block((ExtensionType.padding, b'')) + b'\x00', "Trailing"),
+])
+def test_parse_all_rejects_malformed_blocks(data, message):
+    with pytest.raises(ValueError, match=message):
+        ExtensionRegistry.parse_all(data)
+
+
+def test_parse_all_of_empty_block():
+    assert ExtensionRegistry.parse_all(b'') == []
+
+
+def test_parse_returns_none_for_truncated_extension():
+    data = block((ExtensionType.padding, b'\x00' * 8))
+    assert ExtensionRegistry.parse(data[:6]) == (None, data[:6])
+    extension, rest = ExtensionRegistry.parse(data + b'more')
+    assert extension.data == b'\x00' * 8 and bytes(rest) == b'more'
+
+
+def test_decode_unknown_type_is_validated_extension():
+    extension = ExtensionRegistry.decode(0x7777, b'abc')
+    assert type(extension) is Extension
+    assert extension.model_fields_set == {'extension_type', 'data'}
+    assert extension == Extension(extension_type=0x7777, data=b'abc')
+
+
+def test_extension_type_normalisation():
+    assert Extension(extension_type=51).extension_type is ExtensionType.key_share
+    assert Extension(extension_type=ExtensionType.key_share).extension_type is ExtensionType.key_share
+    assert type(Extension(extension_type=0x3a3a).extension_type) is int
+    with pytest.raises(ValidationError):
+        Extension(extension_type=2 ** 16)
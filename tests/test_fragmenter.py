@@ -0,0 +1,81 @@
+import pytest
+
+from python_tls_implementation.tls.fragmenter import (
+    MAX_INNER_CONTENT_LENGTH,
+    BlockPadding,
+    FixedSizePadding,
+    RecordFragmenter,
+)
+from python_tls_implementation.tls.record import ContentType, find_content_type_index
+from python_tls_implementation.tls.record_writer import RecordWriter
+from python_tls_implementation.tls.wire import InnerPlaintext
+
+DATA = bytes(range(256)) * 300
+
+
+@pytest.mark.parametrize('data, index', [
+    (b'', -1), (b'\x00' * 5000, -1), (b'\x17', 0), (b'ab\x16', 2),
+    (b'ab\x16' + b'\x00' * 255, 2), (b'\x17' + b'\x00' * 20000, 0),
+])
+def test_find_content_type_index(data, index):
+    assert find_content_type_index(data) == index
+    assert find_content_type_index(memoryview(data)) == index
+
+
+def test_plaintext_records_are_views_of_the_input():
+    fragmenter = RecordFragmenter()
+    records = list(fragmenter.plaintext_records(ContentType.application_data, DATA))
+    assert [record.length for record in records] == [2 ** 14] * 4 + [len(DATA) - 4 * 2 ** 14]
+    assert all(isinstance(record.fragment, memoryview) for record in records)
+    assert b''.join(record.fragment for record in records) == DATA
+
+
+def test_write_queues_records():
+    writer = RecordWriter()
+    assert RecordFragmenter(max_fragment_length=1000).write(writer, ContentType.application_data, DATA) == 77
+    assert writer.pending == len(DATA) + 77 * 5
+
+
+@pytest.mark.parametrize('block_size', [1, 16, 255, 4096, MAX_INNER_CONTENT_LENGTH])
+def test_block_padding_fits_record_limit(block_size):
+    fragmenter = RecordFragmenter(BlockPadding(block_size))
+    inners = list(fragmenter.inner_plaintexts(ContentType.application_data, DATA))
+    assert b''.join(bytes(inner.content) for inner in inners) == DATA
+    for inner in inners:
+        assert inner.length % block_size == 0
+        assert inner.length <= MAX_INNER_CONTENT_LENGTH + 1
+        decoded = InnerPlaintext.from_bytes(inner.to_bytes())
+        assert decoded.type is ContentType.application_data and bytes(decoded.content) == bytes(inner.content)
+
+
+def test_fixed_size_padding_hides_write_sizes():
+    fragmenter = RecordFragmenter(FixedSizePadding(1000))
+    inners = list(fragmenter.inner_plaintexts(ContentType.application_data, b'x' * 2500))
+    assert [len(inner.content) for inner in inners] == [1000, 1000, 500]
+    assert {inner.length for inner in inners} == {1001}
+
+
+def test_empty_write_produces_nothing():
+    assert list(RecordFragmenter().plaintext_records(ContentType.application_data, b'')) == []
+
+
+@pytest.mark.parametrize('make', [
+    lambda: BlockPadding(0), lambda: FixedSizePadding(MAX_INNER_CONTENT_LENGTH + 1),
+    lambda: RecordFragmenter(max_fragment_length=0),
+])
+def test_invalid_sizes(make):
+    with pytest.raises(ValueError):
+        make()
+
+
+@pytest.mark.parametrize('padding', [BlockPadding(1024), FixedSizePadding(1024)])
+def test_padding_larger_than_fragment_limit_is_rejected(padding):
+    with pytest.raises(ValueError, match="do not fit"):
+        RecordFragmenter(padding, max_fragment_length=512)
+
+
+def test_fixed_size_padding_within_fragment_limit():
+    fragmenter = RecordFragmenter(FixedSizePadding(512), max_fragment_length=512)
+    inners = list(fragmenter.inner_plaintexts(ContentType.application_data, b'x' * 1200))
+    assert [len(inner.content) for inner in inners] == [512, 512, 176]
+    assert {inner.length for inner in inners} == {513}
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import struct
+
+import pytest
+
+from python_tls_implementation.tcp.handshake_executor import AdmissionPolicy, HandshakeExecutor, handshake_handler
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.server_handshake import ServerHandshake, ServerHandshakeState
+from python_tls_implementation.tls.handshake.server_messages import ServerHello
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.key_share import GroupPoolConfig, KeyShareKeyPair, KeySharePool, NamedGroup
+
+
+def client_hello(group: NamedGroup = NamedGroup.x25519) -> tuple[HandshakeFrame, KeyShareKeyPair]:
+    key_pair = KeyShareKeyPair.generate(group)
+    key_share = struct.pack('!HH', group, len(key_pair.public_bytes)) + key_pair.public_bytes
+    hello = ClientHello(
+        random_value=os.urandom(32),
+        cipher_suites=[0x1301],
+        extensions=[
+            Extension(extension_type=ExtensionType.supported_versions, data=b'\x02\x03\x04'),
+            Extension(extension_type=ExtensionType.key_share, data=struct.pack('!H', len(key_share)) + key_share),
+        ],
+    )
+    return HandshakeFrame.from_message(hello), key_pair
+
+
+def _shared_secret(server_hello: ServerHello, key_pair: KeyShareKeyPair) -> bytes:
+    key_share = next(ext for ext in server_hello.extensions if ext.extension_type == ExtensionType.key_share)
+    return key_pair.exchange(key_share.data[4:])
+
+
+def test_thread_executor_runs_the_key_exchange():
+    async def run():
+        executor = HandshakeExecutor(max_workers=2)
+        try:
+            frame, key_pair = client_hello()
+            handshake = ServerHandshake()
+            frames = await executor.handshake(handshake, frame)
+            return handshake, frames, key_pair, executor.stats()
+        finally:
+            executor.shutdown()
+
+    handshake, frames, key_pair, stats = asyncio.run(run())
+    assert [frame.msg_type for frame in frames] == [HandshakeType.server_hello]
+    assert handshake.state == ServerHandshakeState.server_hello_sent
+    server_hello = frames[0].to_message()
+    assert server_hello.cipher_suite == 0x1301
+    assert _shared_secret(server_hello, key_pair)
+    assert stats['tasks_run'] == 1
+
+
+def test_thread_executor_uses_the_key_share_pool():
+    async def run(pool):
+        executor = HandshakeExecutor(max_workers=1)
+        try:
+            frame, _ = client_hello()
+            await executor.handshake(ServerHandshake(key_shares=pool), frame)
+        finally:
+            executor.shutdown()
+
+    pool = KeySharePool({NamedGroup.x25519: GroupPoolConfig(2)})
+    asyncio.run(run(pool))
+    assert pool.stats()['x25519']['taken'] == 1
+
+
+def test_process_executor_rejects_key_share_pool():
+    executor = HandshakeExecutor(max_workers=1, processes=True)
+    pool = KeySharePool({NamedGroup.x25519: GroupPoolConfig(2)})
+    try:
+        with pytest.raises(ValueError, match="KeySharePool"):
+            handshake_handler(executor, handshake_factory=lambda: ServerHandshake(key_shares=pool))
+        frame, _ = client_hello()
+        with pytest.raises(ValueError, match="KeySharePool"):
+            asyncio.run(executor.handshake(ServerHandshake(key_shares=pool), frame))
+        # Nothing was taken from the pool for the rejected handshake
+        assert pool.stats()['x25519']['taken'] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_shed_policy_refuses_when_saturated():
+    async def run():
+        executor = HandshakeExecutor(max_workers=1, max_handshakes=1)
+        try:
+            assert await executor.admit()
+            assert executor.saturated
+            assert not await executor.admit()
+            executor.finish()
+            assert await executor.admit()
+            return executor.stats()
+        finally:
+            executor.shutdown()
+
+    stats = asyncio.run(run())
+    assert (stats['admitted'], stats['shed']) == (2, 1)
+
+
+def test_delay_policy_waits_for_a_slot():
+    async def run():
+        executor = HandshakeExecutor(max_workers=1, max_handshakes=1, policy=AdmissionPolicy.delay,
+                                     admission_timeout=0.05)
+        try:
+            assert await executor.admit()
+            assert not await executor.admit()
+            asyncio.get_running_loop().call_later(0.01, executor.finish)
+            executor.admission_timeout = 1.0
+            assert await executor.admit()
+            return executor.stats()
+        finally:
+            executor.shutdown()
+
+    stats = asyncio.run(run())
+    assert (stats['delayed'], stats['shed']) == (2, 1)
+
+
+def test_client_hello_without_supported_group_is_rejected():
+    frame, _ = client_hello(NamedGroup.secp384r1)
+    with pytest.raises(ValueError, match="handshake_failure"):
+        ServerHandshake().receive_client_hello(frame)
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+from python_tls_implementation.tls.instrumentation import (
+    COUNTERS,
+    HandshakePhase,
+    Instrumentation,
+    InstrumentationHook,
+    MetricsCollector,
+    default_instrumentation,
+)
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+
+
+class Recorder(InstrumentationHook):
+    def __init__(self):
+        self.events = []
+
+    def connection_opened(self, metrics):
+        self.events.append(('opened', metrics.peer))
+
+    def connection_closed(self, metrics):
+        self.events.append(('closed', metrics.peer))
+
+    def phase(self, metrics, phase, elapsed):
+        self.events.append((phase, elapsed >= 0))
+
+
+def test_no_metrics_without_hooks():
+    instrumentation = Instrumentation()
+    assert instrumentation.connection_opened('peer') is None
+    hook = Recorder()
+    instrumentation.add_hook(hook)
+    metrics = instrumentation.connection_opened('peer')
+    metrics.mark(HandshakePhase.client_hello_received)
+    metrics.close()
+    instrumentation.remove_hook(hook)
+    assert instrumentation.connection_opened('peer') is None
+    assert hook.events == [('opened', 'peer'), (HandshakePhase.client_hello_received, True), ('closed', 'peer')]
+    assert HandshakePhase.client_hello_received in metrics.phases
+
+
+def test_collector_totals_and_exports():
+    instrumentation = Instrumentation()
+    collector = MetricsCollector(buckets=(0.001, 1.0))
+    instrumentation.add_hook(collector)
+    closed, active = instrumentation.connection_opened(), instrumentation.connection_opened()
+    closed.bytes_in, active.bytes_in = 10, 5
+    collector.phase(closed, HandshakePhase.finished, 0.5)
+    collector.phase(closed, HandshakePhase.finished, 5.0)
+    closed.close()
+    closed.close()
+
+    report = collector.to_json()
+    assert report['connections_opened'] == 2 and report['connections_closed'] == 1
+    assert report['connections_active'] == 1 and report['bytes_in'] == 15
+    assert report['handshake_phases']['finished']['buckets'] == {'0.001': 0, '1.0': 1, '+Inf': 1}
+    assert json.loads(collector.to_json_text()) == report
+
+    text = collector.to_prometheus()
+    assert 'tls_bytes_in_total 15\n' in text
+    assert 'tls_handshake_phase_seconds_bucket{phase="finished",le="1.0"} 1\n' in text
+    assert 'tls_handshake_phase_seconds_bucket{phase="finished",le="+Inf"} 2\n' in text
+    assert 'tls_handshake_phase_seconds_count{phase="finished"} 2\n' in text
+
+
+@pytest.fixture
+def collector():
+    collector = MetricsCollector()
+    default_instrumentation.add_hook(collector)
+    yield collector
+    default_instrumentation.remove_hook(collector)
+
+
+def test_server_connections_report_record_counters(collector):
+    data = TLSPlaintext(type=ContentType.application_data, fragment=b'm' * 1000).to_bytes()
+
+    async def main():
+        server = AsyncTCPServer(port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(data * 3)
+        await reader.readexactly(len(data) * 3)
+        writer.close()
+        await server.shutdown(1.0)
+
+    asyncio.run(main())
+    totals = collector.totals()
+    assert set(totals) == set(COUNTERS)
+    assert totals['records_in'] == totals['records_out'] == 3
+    assert totals['bytes_in'] == totals['bytes_out'] == len(data) * 3
+    assert collector.opened == collector.closed == 1
@@ -0,0 +1,109 @@
+import hashlib
+
+import pytest
+
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.server_messages import NewSessionTicket
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.key_schedule import KeySchedule, TranscriptHash
+from python_tls_implementation.tls.protection import CipherSuite
+
+# RFC 8448, section 3 (Simple 1-RTT Handshake), TLS_AES_128_GCM_SHA256
+ECDHE_SHARED_SECRET = bytes.fromhex('8bd4054fb55b9d63fdfbacf9f04b9f0d35e6d63f537563efd46272900f89492d')
+EARLY_SECRET = bytes.fromhex('33ad0a1c607ec03b09e6cd9893680ce210adf300aa1f2660e1b22e10f170f92a')
+DERIVED_SECRET = bytes.fromhex('6f2615a108c702c5678f54fc9dbab69716c076189c48250cebeac3576c3611ba')
+HANDSHAKE_SECRET = bytes.fromhex('1dc826e93606aa6fdc0aadc12f741b01046aa6b99f691ed221a9f0ca043fbeac')
+MASTER_SECRET = bytes.fromhex('18df06843d13a08bf2a449844c5f8a478001bc4d4c627984d5a41da8d0402919')
+
+# Traffic secret -> (write key, write iv, finished key)
+TRAFFIC_SECRETS = {
+    'server handshake': (
+        'b67b7d690cc16c4e75e54213cb2d37b4e9c912bcded9105d42befd59d391ad38',
+        '3fce516009c21727d0f2e4e86ee403bc', '5d313eb2671276ee13000b30',
+        '008d3b66f816ea559f96b537e885c31fc068bf492c652f01f288a1d8cdc19fc8',
+    ),
+    'client handshake': (
+        'b3eddb126e067f35a780b3abf45e2d8f3b1a950738f52e9600746a0e27a55a21',
+        'dbfaa693d1762c5b666af5d950258d01', '5bd3c71b836e0b76bb73265f',
+        'b80ad01015fb2f0bd65ff7d4da5d6bf83f84821d1f87fdc7d3c75b5a7b42d9c4',
+    ),
+    'server application': (
+        'a11af9f05531f856ad47116b45a950328204b4f44bfb6b3a4b4f1f3fcb631643',
+        '9f02283b6c9c07efc26bb9f2ac92e356', 'cf782b88dd83549aadf1e984', None,
+    ),
+    'client application': (
+        '9e40646ce79a7f9dc05af8889bce6552875afa0b06df0087f792ebb7c17504a5',
+        '17422dda596ed5d9acd890e3c63f5051', '5b78923dee08579033e523d9', None,
+    ),
+}
+RESUMPTION_MASTER_SECRET = bytes.fromhex('7df235f2031d2a051287d02b0241b0bfdaf86cc856231f2d5aba46c434ec196c')
+RESUMPTION_PSK = bytes.fromhex('4ecd0eb6ec3b4d87f5d6028f922ca4c5851a277fd41311c9e62d2c9492e1c4f3')
+
+
+@pytest.fixture
+def schedule():
+    return KeySchedule(CipherSuite.TLS_AES_128_GCM_SHA256)
+
+
+def test_rfc8448_secrets(schedule):
+    assert schedule.early_secret == EARLY_SECRET
+    assert schedule.derive_secret(EARLY_SECRET, b'derived', hashlib.sha256().digest()) == DERIVED_SECRET
+    schedule.derive_handshake_secrets(ECDHE_SHARED_SECRET)
+    assert schedule.handshake_secret == HANDSHAKE_SECRET
+    schedule.derive_application_secrets()
+    assert schedule.master_secret == MASTER_SECRET
+
+
+@pytest.mark.parametrize('name', list(TRAFFIC_SECRETS))
+def test_rfc8448_traffic_keys(schedule, name):
+    secret, key, iv, finished_key = TRAFFIC_SECRETS[name]
+    secret = bytes.fromhex(secret)
+    assert schedule.traffic_keys(secret) == (bytes.fromhex(key), bytes.fromhex(iv))
+    if finished_key is not None:
+        assert schedule.expand_label(secret, b'finished', b'', 32) == bytes.fromhex(finished_key)
+
+
+def test_rfc8448_resumption_psk(schedule):
+    assert schedule.resumption_psk(RESUMPTION_MASTER_SECRET, b'\x00\x00') == RESUMPTION_PSK
+
+
+def test_expand_label_is_memoized(schedule):
+    first = schedule.expand_label(EARLY_SECRET, b'key', b'', 16)
+    assert schedule.expand_label(EARLY_SECRET, b'key', b'', 16) is first
+
+
+def test_secrets_need_earlier_stages(schedule):
+    with pytest.raises(ValueError):
+        schedule.derive_application_secrets()
+    with pytest.raises(ValueError):
+        schedule.resumption_master_secret()
+
+
+def test_transcript_reads_do_not_consume_the_hash():
+    ticket = NewSessionTicket(ticket_lifetime=60, ticket_age_add=1, ticket=b't')
+    transcript = TranscriptHash('sha256')
+    transcript.add_message(ticket)
+    first = transcript.digest()
+    transcript.add_message(HandshakeFrame.from_message(ticket))
+    assert first == hashlib.sha256(ticket.to_bytes()).digest()
+    assert transcript.digest() == hashlib.sha256(ticket.to_bytes() * 2).digest()
+
+
+def test_snapshots_follow_the_transcript(schedule):
+    schedule.transcript.update(b'client hello')
+    schedule.derive_handshake_secrets(ECDHE_SHARED_SECRET)
+    schedule.transcript.update(b'server finished')
+    schedule.derive_application_secrets()
+    assert schedule.snapshots == {
+        'server_hello': hashlib.sha256(b'client hello').digest(),
+        'server_finished': hashlib.sha256(b'client helloserver finished').digest(),
+    }
+
+
+def test_hello_retry_transcript():
+    transcript = TranscriptHash('sha256')
+    transcript.update(b'client hello 1')
+    transcript.restart_after_hello_retry()
+    digest = hashlib.sha256(b'client hello 1').digest()
+    expected = bytes((HandshakeType.message_hash.value, 0, 0, 32)) + digest
+    assert transcript.digest() == hashlib.sha256(expected).digest()
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from python_tls_implementation.tls.key_share import GroupPoolConfig, KeyShareKeyPair, KeySharePool, NamedGroup
+
+PUBLIC_LENGTHS = {
+    NamedGroup.secp256r1: 65, NamedGroup.secp384r1: 97, NamedGroup.secp521r1: 133,
+    NamedGroup.x25519: 32, NamedGroup.x448: 56,
+}
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.mark.parametrize('group', list(NamedGroup))
+def test_key_exchange(group):
+    client, server = KeyShareKeyPair.generate(group), KeyShareKeyPair.generate(group)
+    assert len(client.public_bytes) == PUBLIC_LENGTHS[group]
+    assert client.exchange(server.public_bytes) == server.exchange(client.public_bytes)
+
+
+def test_key_pair_is_single_use():
+    key_pair = KeyShareKeyPair.generate(NamedGroup.x25519)
+    key_pair.exchange(KeyShareKeyPair.generate(NamedGroup.x25519).public_bytes)
+    with pytest.raises(ValueError, match='already been used'):
+        key_pair.exchange(b'\x09' * 32)
+
+
+def test_pool_fills_and_refills_below_low_water():
+    with KeySharePool({NamedGroup.x25519: GroupPoolConfig(8, low_water=4)}) as pool:
+        assert wait_for(lambda: pool.available(NamedGroup.x25519) == 8)
+        pairs = [pool.take(NamedGroup.x25519) for _ in range(4)]
+        assert len({pair.public_bytes for pair in pairs}) == 4
+        # Still at low water: no refill yet
+        time.sleep(0.05)
+        assert pool.stats()['x25519']['generated'] == 8
+        pool.take(NamedGroup.x25519)
+        assert wait_for(lambda: pool.available(NamedGroup.x25519) == 8)
+        stats = pool.stats()['x25519']
+    assert stats == {'available': 8, 'taken': 5, 'starved': 0, 'generated': 13}
+
+
+def test_empty_pool_generates_inline():
+    pool = KeySharePool({NamedGroup.secp256r1: GroupPoolConfig(2)})
+    key_pair = pool.take(NamedGroup.secp256r1)
+    assert key_pair.group is NamedGroup.secp256r1
+    assert pool.stats()['secp256r1']['starved'] == 1
+    with pytest.raises(ValueError, match='not configured'):
+        pool.take(NamedGroup.x448)
+
+
+def test_stop_interrupts_the_initial_fill():
+    pool = KeySharePool({NamedGroup.secp521r1: GroupPoolConfig(10_000)})
+    pool.start()
+    pool.stop()
+    assert pool.available(NamedGroup.secp521r1) < 10_000
+
+
+def test_config_validation():
+    with pytest.raises(ValueError):
+        GroupPoolConfig(0)
+    assert GroupPoolConfig(10).low_water == 5
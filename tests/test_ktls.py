@@ -0,0 +1,87 @@
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from python_tls_implementation.tcp import ktls
+from python_tls_implementation.tls.protection import CIPHER_SUITES, CipherSuite
+from python_tls_implementation.tls.record import ContentType
+
+KEY = bytes(range(32))
+IV = bytes(range(40, 52))
+
+
+def keys(cipher_suite: CipherSuite, sequence_number: int = 0) -> tuple[bytes, bytes, int]:
+    return KEY[:CIPHER_SUITES[cipher_suite].key_length], IV, sequence_number
+
+
+def test_crypto_info_layout():
+    info = ktls.crypto_info(CipherSuite.TLS_AES_128_GCM_SHA256, KEY[:16], IV, 7)
+    assert info == b''.join((
+        ktls.TLS_1_3_VERSION.to_bytes(2, 'little'), (51).to_bytes(2, 'little'),
+        IV[4:], KEY[:16], IV[:4], (7).to_bytes(8, 'big'),
+    ))
+    chacha = ktls.crypto_info(CipherSuite.TLS_CHACHA20_POLY1305_SHA256, KEY, IV)
+    assert chacha[4:16] == IV and chacha[16:48] == KEY and len(chacha) == 56
+
+
+def read_all(reader) -> list[tuple[ContentType, bytes]]:
+    records = []
+    while (inner := reader.read()) is not None:
+        records.append((inner.type, bytes(inner.content)))
+    return records
+
+
+@pytest.mark.parametrize('cipher_suite', list(CipherSuite))
+def test_python_fallback_round_trip(cipher_suite):
+    data = bytes(range(256)) * 2000
+    left, right = socket.socketpair()
+    with left, right, tempfile.TemporaryFile() as file:
+        file.write(data)
+        _, writer = ktls.protected_streams(left, cipher_suite, keys(cipher_suite, 5), keys(cipher_suite), kernel=False)
+        reader, _ = ktls.protected_streams(right, cipher_suite, keys(cipher_suite), keys(cipher_suite, 5), kernel=False)
+        assert isinstance(writer, ktls.PythonTLSWriter) and isinstance(reader, ktls.PythonTLSReader)
+
+        def send():
+            writer.write(b'hello')
+            writer.write(b'\x01\x00', ContentType.alert)
+            assert writer.sendfile(file, offset=100, count=300_000) == 300_000
+            assert file.tell() == 300_100
+            left.shutdown(socket.SHUT_WR)
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        records = read_all(reader)
+        thread.join()
+
+    assert records[:2] == [(ContentType.application_data, b'hello'), (ContentType.alert, b'\x01\x00')]
+    assert b''.join(content for _, content in records[2:]) == data[100:300_100]
+    assert all(len(content) <= 2 ** 14 for _, content in records)
+
+
+def test_wrong_sequence_number_fails_authentication():
+    cipher_suite = CipherSuite.TLS_AES_128_GCM_SHA256
+    left, right = socket.socketpair()
+    with left, right:
+        _, writer = ktls.protected_streams(left, cipher_suite, keys(cipher_suite, 1), keys(cipher_suite), kernel=False)
+        reader, _ = ktls.protected_streams(right, cipher_suite, keys(cipher_suite), keys(cipher_suite, 2), kernel=False)
+        writer.write(b'data')
+        with pytest.raises(ValueError, match='bad_record_mac'):
+            reader.read()
+
+
+@pytest.mark.skipif(not ktls.kernel_tls_available(), reason="kernel TLS is not available")
+def test_kernel_writer_interoperates_with_python_reader():
+    cipher_suite = CipherSuite.TLS_AES_128_GCM_SHA256
+    with socket.create_server(('127.0.0.1', 0)) as server, \
+            socket.create_connection(server.getsockname()) as client:
+        accepted, _ = server.accept()
+        with accepted:
+            reader, _ = ktls.protected_streams(accepted, cipher_suite, keys(cipher_suite), keys(cipher_suite),
+                                               kernel=False)
+            _, writer = ktls.protected_streams(client, cipher_suite, keys(cipher_suite), keys(cipher_suite))
+            assert isinstance(writer, ktls.KernelTLSWriter)
+            writer.write(b'from the kernel')
+            client.shutdown(socket.SHUT_WR)
+            assert read_all(reader) == [(ContentType.application_data, b'from the kernel')]
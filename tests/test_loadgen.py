@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+
+from benchmarks import loadgen
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+
+
+@pytest.mark.parametrize('seconds', [0.0, 0.000_05, 0.001, 0.0123, 1.5, 3600.0])
+def test_histogram_relative_error(seconds):
+    histogram = loadgen.LatencyHistogram()
+    histogram.record(seconds)
+    histogram.record(10 * 3600.0)
+    value = histogram.percentile(50)
+    assert seconds <= value <= seconds * 1.016 + 1e-6
+
+
+def test_histogram_percentiles_and_merge():
+    first, second = loadgen.LatencyHistogram(), loadgen.LatencyHistogram()
+    for ms in range(1, 101):
+        (first if ms % 2 else second).record(ms / 1000)
+    first.merge(second)
+    summary = first.summary()
+    assert summary['count'] == 100 and summary['max'] == 0.1
+    assert 0.050 <= summary['p50'] <= 0.051
+    assert 0.099 <= summary['p99'] <= 0.1
+    assert loadgen.LatencyHistogram().percentile(99) == 0.0
+
+
+def test_parse_payloads():
+    assert loadgen.parse_payloads('64:0.9,65536:0.1') == [(64, 0.9), (65536, 0.1)]
+    assert loadgen.parse_payloads('1024') == [(1024, 1.0)]
+
+
+def test_results_merge():
+    first, second = loadgen.LoadResults(), loadgen.LoadResults()
+    first.requests, second.requests = 3, 4
+    second.error(ConnectionResetError())
+    first.elapsed, second.elapsed = 1.0, 2.0
+    first.merge(second)
+    report = first.to_dict()
+    assert report['requests'] == 7 and report['requests_per_sec'] == 3.5
+    assert report['errors'] == {'ConnectionResetError': 1}
+
+
+def served(run):
+    """Run ``run(port)`` against an echo server on its own event loop thread."""
+    loop = asyncio.new_event_loop()
+    server = AsyncTCPServer(port=0)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        return run(server.port)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.shutdown(0.1), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def config(port: int, **kwargs) -> loadgen.LoadConfig:
+    return loadgen.LoadConfig('127.0.0.1', port, connections=2, duration=0.3,
+                              payloads=[(100, 1.0), (20000, 1.0)], **kwargs)
+
+
+@pytest.mark.parametrize('runner', [lambda c: asyncio.run(loadgen.run_async(c)), loadgen.run_threads])
+def test_closed_loop_run(runner):
+    results = served(lambda port: runner(config(port, requests_per_connection=5)))
+    assert results.errors == {}
+    assert results.requests >= 10
+    assert results.bytes_sent == results.bytes_received
+    assert results.latency['response'].total == results.requests
+    # A new connection every five requests
+    assert results.latency['connect'].total >= results.requests / 5
+
+
+def test_open_loop_run_keeps_the_rate():
+    results = served(lambda port: asyncio.run(loadgen.run_async(config(port, rate=40.0))))
+    assert results.errors == {}
+    # 40 requests/s for 0.3 s, give or take the last scheduled send
+    assert 10 <= results.requests <= 14
@@ -0,0 +1,116 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+from python_tls_implementation.tcp.pool import AsyncConnectionPool, ConnectionPool
+
+
+@pytest.fixture
+def listener():
+    # Connections complete in the listen backlog, which is all the pool needs
+    with socket.create_server(('127.0.0.1', 0), backlog=64) as server:
+        yield server.getsockname()
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_released_connection_is_reused(listener):
+    host, port = listener
+    pool = ConnectionPool()
+    client = pool.acquire(host, port)
+    pool.release(client)
+    assert pool.acquire(host, port) is client
+    assert pool.acquire(host, port, 'other.example') is not client
+    assert pool.stats()['hits'] == 1
+    pool.close()
+
+
+def test_idle_connections_expire(listener):
+    host, port = listener
+    now = [0.0]
+    pool = ConnectionPool(idle_timeout=5.0, clock=lambda: now[0])
+    client = pool.acquire(host, port)
+    pool.release(client)
+    now[0] = 10.0
+    assert pool.acquire(host, port) is not client
+    assert pool.stats()['expired'] == 1
+    pool.close()
+
+
+def test_acquire_times_out_when_full(listener):
+    host, port = listener
+    pool = ConnectionPool(max_per_key=1, max_total=1)
+    pool.acquire(host, port)
+    with pytest.raises(TimeoutError):
+        pool.acquire(host, port, timeout=0.05)
+    assert pool.stats()['timeouts'] == 1
+    pool.close()
+
+
+def test_release_wakes_the_waiter_that_can_proceed(listener):
+    # C waits on k1 (per-key limit), D on k3 (total limit). Releasing k2 must
+    # let D evict the idle k2 connection even though C has waited longer.
+    host, port = listener
+    pool = ConnectionPool(max_per_key=1, max_total=2)
+    pool.acquire(host, port, 'k1')
+    k2 = pool.acquire(host, port, 'k2')
+    finished: dict[str, float] = {}
+
+    def waiter(name: str, server_name: str, timeout: float) -> None:
+        start = time.monotonic()
+        try:
+            pool.acquire(host, port, server_name, timeout=timeout)
+        except TimeoutError:
+            pass
+        finished[name] = time.monotonic() - start
+
+    c = threading.Thread(target=waiter, args=('C', 'k1', 1.0))
+    c.start()
+    _wait_for(lambda: pool.stats()['waits'] == 1)
+    d = threading.Thread(target=waiter, args=('D', 'k3', 2.0))
+    d.start()
+    _wait_for(lambda: pool.stats()['waits'] == 2)
+
+    pool.release(k2)
+    d.join(3.0)
+    assert finished['D'] < 0.5
+    c.join(3.0)
+    assert pool.stats()['timeouts'] == 1
+    pool.close()
+
+
+def test_async_release_wakes_the_waiter_that_can_proceed():
+    async def run():
+        server = AsyncTCPServer(port=0, idle_timeout=None)
+        await server.start()
+        pool = AsyncConnectionPool(max_per_key=1, max_total=2)
+        try:
+            await pool.acquire(server.host, server.port, 'k1')
+            k2 = await pool.acquire(server.host, server.port, 'k2')
+            c = asyncio.create_task(pool.acquire(server.host, server.port, 'k1', timeout=1.0))
+            await asyncio.sleep(0.05)
+            d = asyncio.create_task(pool.acquire(server.host, server.port, 'k3', timeout=2.0))
+            await asyncio.sleep(0.05)
+            assert pool.stats()['waits'] == 2
+
+            start = time.monotonic()
+            await pool.release(k2)
+            await asyncio.wait_for(d, 0.5)
+            elapsed = time.monotonic() - start
+            with pytest.raises(TimeoutError):
+                await c
+            return elapsed
+        finally:
+            await pool.close()
+            await server.shutdown(1.0)
+
+    assert asyncio.run(run()) < 0.5
@@ -0,0 +1,88 @@
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from python_tls_implementation.tls.protection import (
+    CIPHER_SUITES,
+    TAG_LENGTH,
+    CipherSuite,
+    ConnectionProtection,
+    RecordProtection,
+)
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSInnerPlaintext
+from python_tls_implementation.tls.wire import CiphertextRecord, InnerPlaintext
+
+KEY = bytes(range(32))
+IV = bytes(range(100, 112))
+
+
+def pair(cipher_suite: CipherSuite) -> tuple[RecordProtection, RecordProtection]:
+    key = KEY[:CIPHER_SUITES[cipher_suite].key_length]
+    return RecordProtection(cipher_suite, key, IV), RecordProtection(cipher_suite, key, IV)
+
+
+@pytest.mark.parametrize('cipher_suite', list(CipherSuite))
+def test_seal_open_round_trip(cipher_suite):
+    sender, receiver = pair(cipher_suite)
+    inners = [InnerPlaintext(b'message %d' % n, ContentType.application_data, n) for n in range(5)]
+    records = sender.seal_many(inners)
+    assert all(record.opaque_type is ContentType.application_data for record in records)
+    opened = receiver.open_many(CiphertextRecord.from_model(r.to_model()) for r in records)
+    assert [(bytes(i.content), i.type, i.zeros_padding_length) for i in opened] == [
+        (b'message %d' % n, ContentType.application_data, n) for n in range(5)]
+    assert sender.sequence_number == receiver.sequence_number == 5
+
+
+def test_nonce_is_sequence_number_xor_iv():
+    sender, _ = pair(CipherSuite.TLS_AES_128_GCM_SHA256)
+    sender.sequence_number = 0x0102030405060708
+    record = sender.seal(TLSInnerPlaintext(content=b'hi', type=ContentType.handshake))
+    nonce = bytes(a ^ b for a, b in zip(IV, bytes(4) + bytes.fromhex('0102030405060708')))
+    aad = b'\x17\x03\x03' + (3 + TAG_LENGTH).to_bytes(2, 'big')
+    assert AESGCM(KEY[:16]).decrypt(nonce, record.encrypted_record, aad) == b'hi\x16'
+
+
+@pytest.mark.parametrize('tamper', ['payload', 'header', 'sequence'])
+def test_tampering_is_bad_record_mac(tamper):
+    sender, receiver = pair(CipherSuite.TLS_CHACHA20_POLY1305_SHA256)
+    record = sender.seal(InnerPlaintext(b'secret', ContentType.application_data))
+    if tamper == 'payload':
+        record.encrypted_record = b'\x00' + record.encrypted_record[1:]
+    elif tamper == 'header':
+        record.opaque_type = ContentType.handshake
+    else:
+        receiver.sequence_number = 1
+    with pytest.raises(ValueError, match='bad_record_mac'):
+        receiver.open(record)
+
+
+def test_update_keys_restarts_sequence():
+    sender, receiver = pair(CipherSuite.TLS_AES_256_GCM_SHA384)
+    sender.seal(InnerPlaintext(b'one', ContentType.application_data))
+    new_key = bytes(32)
+    sender.update_keys(new_key, IV)
+    receiver.update_keys(new_key, IV)
+    assert sender.sequence_number == 0
+    record = sender.seal(InnerPlaintext(b'two', ContentType.application_data))
+    assert bytes(receiver.open(record).content) == b'two'
+
+
+def test_limits():
+    sender, receiver = pair(CipherSuite.TLS_AES_128_GCM_SHA256)
+    with pytest.raises(ValueError, match='Key must be'):
+        RecordProtection(CipherSuite.TLS_AES_128_GCM_SHA256, KEY, IV)
+    with pytest.raises(ValueError, match='IV must be'):
+        RecordProtection(CipherSuite.TLS_AES_128_GCM_SHA256, KEY[:16], IV[:8])
+    with pytest.raises(ValueError, match='Encrypted record length'):
+        sender.seal(InnerPlaintext(bytes(TLSCiphertext.MAX_FRAGMENT_LENGTH), ContentType.application_data))
+    with pytest.raises(ValueError, match='too short'):
+        receiver.open(CiphertextRecord(encrypted_record=bytes(TAG_LENGTH)))
+    sender.sequence_number = 2 ** 64
+    with pytest.raises(ValueError, match='exhausted'):
+        sender.seal(InnerPlaintext(b'', ContentType.application_data))
+
+
+def test_connection_protection_directions():
+    client = ConnectionProtection(CipherSuite.TLS_AES_128_GCM_SHA256, KEY[:16], IV, KEY[16:], IV)
+    server = ConnectionProtection(CipherSuite.TLS_AES_128_GCM_SHA256, KEY[16:], IV, KEY[:16], IV)
+    record = client.write.seal(InnerPlaintext(b'ping', ContentType.application_data))
+    assert bytes(server.read.open(record).content) == b'ping'
@@ -0,0 +1,67 @@
+import hashlib
+
+import pytest
+
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.reassembler import HandshakeReassembler
+from python_tls_implementation.tls.handshake.server_messages import NewSessionTicket
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.key_schedule import TranscriptHash
+
+FRAMES = [
+    HandshakeFrame(HandshakeType.finished, b'\x01' * 32),
+    HandshakeFrame(HandshakeType.end_of_early_data, b''),
+    HandshakeFrame(HandshakeType.certificate, bytes(range(256)) * 100),
+    HandshakeFrame(HandshakeType.finished, b'\x02' * 48),
+]
+STREAM = b''.join(frame.to_bytes() for frame in FRAMES)
+
+
+def received(reassembler: HandshakeReassembler, fragments) -> list[tuple[HandshakeType, bytes]]:
+    return [(frame.msg_type, bytes(frame.body)) for fragment in fragments for frame in reassembler.feed(fragment)]
+
+
+def test_byte_by_byte():
+    reassembler = HandshakeReassembler()
+    fragments = [STREAM[index:index + 1] for index in range(len(STREAM))]
+    assert received(reassembler, fragments) == [(frame.msg_type, frame.body) for frame in FRAMES]
+    assert not reassembler.in_progress
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 5, 17, 1000, 2 ** 14])
+def test_record_sized_fragments(size):
+    reassembler = HandshakeReassembler()
+    fragments = [memoryview(STREAM)[offset:offset + size] for offset in range(0, len(STREAM), size)]
+    assert received(reassembler, fragments) == [(frame.msg_type, frame.body) for frame in FRAMES]
+
+
+def test_in_progress_while_split():
+    reassembler = HandshakeReassembler()
+    assert reassembler.feed(STREAM[:2]) == [] and reassembler.in_progress
+    assert len(reassembler.feed(STREAM[2:38])) == 1 and reassembler.in_progress
+    reassembler.feed(STREAM[38:])
+    assert not reassembler.in_progress
+
+
+def test_completed_messages_go_into_the_transcript():
+    transcript = TranscriptHash('sha256')
+    reassembler = HandshakeReassembler(transcript=transcript)
+    for offset in range(0, len(STREAM), 7):
+        reassembler.feed(STREAM[offset:offset + 7])
+    assert transcript.digest() == hashlib.sha256(STREAM).digest()
+
+
+def test_feed_messages_parses_frames():
+    ticket = NewSessionTicket(ticket_lifetime=60, ticket_age_add=9, ticket=b'ticket')
+    data = ticket.to_bytes()
+    reassembler = HandshakeReassembler()
+    assert reassembler.feed_messages(data[:5]) == []
+    assert reassembler.feed_messages(data[5:]) == [ticket]
+
+
+@pytest.mark.parametrize('header', [b'\xee\x00\x00\x01', b'\x0b\x02\x00\x01'])
+def test_rejects_bad_headers_even_when_split(header):
+    reassembler = HandshakeReassembler()
+    reassembler.feed(header[:3])
+    with pytest.raises(ValueError):
+        reassembler.feed(header[3:])
@@ -0,0 +1,86 @@
+import pytest
+
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSPlaintext
+from python_tls_implementation.tls.record_reader import RecordReader
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
+SIZES = (0, 1, 300, 5000, TLSPlaintext.MAX_FRAGMENT_LENGTH)
+
+
+def plaintext_stream() -> tuple[list[bytes], bytes]:
+    fragments = [bytes([index]) * size for index, size in enumerate(SIZES)]
+    stream = b''.join(TLSPlaintext(type=ContentType.application_data, fragment=f).to_bytes() for f in fragments)
+    return fragments, stream
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 5, 7, 1000, 2 ** 16])
+def test_records_from_small_chunks(chunk_size):
+    fragments, stream = plaintext_stream()
+    reader = RecordReader(buffer_size=64)
+    received = []
+    for offset in range(0, len(stream), chunk_size):
+        reader.feed(stream[offset:offset + chunk_size])
+        # Copy out: fragments are only valid until the next feed
+        received.extend(bytes(record.fragment) for record in reader)
+    assert received == fragments
+    assert reader.pending == 0
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 999])
+def test_records_through_get_buffer(chunk_size):
+    fragments, stream = plaintext_stream()
+    reader = RecordReader()
+    received = []
+    for offset in range(0, len(stream), chunk_size):
+        chunk = stream[offset:offset + chunk_size]
+        buffer = reader.get_buffer()
+        assert len(buffer) >= 5 + TLSPlaintext.MAX_FRAGMENT_LENGTH - reader.pending
+        buffer[:len(chunk)] = chunk
+        reader.buffer_updated(len(chunk))
+        received.extend(bytes(record.fragment) for record in reader)
+    assert received == fragments
+
+
+def test_fragments_are_views_until_next_feed():
+    reader = RecordReader()
+    reader.feed(TLSPlaintext(type=ContentType.handshake, fragment=b'hello').to_bytes())
+    record, = reader.records()
+    assert isinstance(record, PlaintextRecord) and isinstance(record.fragment, memoryview)
+    assert record.type is ContentType.handshake and record.fragment == b'hello'
+
+
+def test_partial_record_stays_buffered():
+    data = TLSPlaintext(type=ContentType.alert, fragment=b'\x02\x28').to_bytes()
+    reader = RecordReader()
+    reader.feed(data[:6])
+    assert list(reader) == [] and reader.pending == 6
+    reader.feed(data[6:])
+    assert [bytes(r.fragment) for r in reader] == [b'\x02\x28']
+
+
+def test_strict_mode_yields_models():
+    reader = RecordReader(strict=True)
+    reader.feed(TLSPlaintext(type=ContentType.application_data, fragment=b'x').to_bytes())
+    record, = reader
+    assert isinstance(record, TLSPlaintext) and record.fragment == b'x'
+
+
+def test_ciphertext_records():
+    encrypted = CiphertextRecord(encrypted_record=b'e' * TLSCiphertext.MAX_FRAGMENT_LENGTH).to_bytes()
+    reader = RecordReader(TLSCiphertext)
+    for offset in range(0, len(encrypted), 4096):
+        reader.feed(encrypted[offset:offset + 4096])
+    record, = reader
+    assert isinstance(record, CiphertextRecord) and record.length == TLSCiphertext.MAX_FRAGMENT_LENGTH
+
+
+def test_oversized_record_is_rejected():
+    reader = RecordReader()
+    reader.feed(b'\x17\x03\x03' + (TLSPlaintext.MAX_FRAGMENT_LENGTH + 1).to_bytes(2, 'big'))
+    with pytest.raises(ValueError, match='exceeds'):
+        list(reader)
+
+
+def test_buffer_size_must_be_positive():
+    with pytest.raises(ValueError):
+        RecordReader(buffer_size=0)
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from python_tls_implementation.tcp.async_client import open_record_connection
+from python_tls_implementation.tcp.async_server import AsyncTCPServer
+from python_tls_implementation.tls.fragmenter import BlockPadding, FixedSizePadding, RecordFragmenter, RecordSizer
+from python_tls_implementation.tls.handshake.extensions.base import ExtensionRegistry
+from python_tls_implementation.tls.handshake.extensions.record_size import (
+    MaxFragmentLength,
+    RecordSizeLimit,
+    peer_fragment_limit,
+)
+from python_tls_implementation.tls.record import ContentType
+
+
+def test_small_records_until_boost_bytes(clock):
+    sizer = RecordSizer(small_size=1000, boost_bytes=3000, boost_after=None, clock=clock)
+    fragmenter = RecordFragmenter(sizer=sizer)
+    sizes = [record.length for record in fragmenter.plaintext_records(ContentType.application_data, bytes(40000))]
+    assert sizes == [1000, 1000, 1000, 16384, 16384, 40000 - 3000 - 2 * 16384]
+    assert sizer.stats()['boosted'] == 1
+
+
+def test_boost_after_time_and_reset_when_idle(clock):
+    sizer = RecordSizer(small_size=1000, boost_bytes=10 ** 9, boost_after=1.0, idle_timeout=0.5, clock=clock)
+    assert sizer.record_size() == 1000
+    for step in range(1, 5):
+        clock.now = step * 0.3
+        sizer.sent(1000)
+        size = sizer.record_size()
+    assert size == 16384 and sizer.boosted
+    clock.now += 0.5
+    assert sizer.record_size() == 1000 and sizer.resets == 1
+
+
+def test_peer_limit_caps_both_sizes():
+    sizer = RecordSizer(small_size=1200)
+    sizer.limit(None)
+    assert sizer.max_size == 16384
+    sizer.limit(511)
+    assert (sizer.small_size, sizer.max_size) == (511, 511)
+    with pytest.raises(ValueError):
+        RecordSizer(small_size=2000, max_size=1000)
+
+
+def test_padded_records_fit_the_sized_limit(clock):
+    sizer = RecordSizer(small_size=1000, boost_bytes=10 ** 9, boost_after=None, clock=clock)
+    fragmenter = RecordFragmenter(BlockPadding(256), sizer=sizer)
+    inners = list(fragmenter.inner_plaintexts(ContentType.application_data, bytes(5000)))
+    assert all(inner.length == 768 for inner in inners[:-1])
+
+
+def test_padding_never_exceeds_the_peer_limit(clock):
+    sizer = RecordSizer(small_size=100, boost_bytes=10 ** 9, boost_after=None, clock=clock)
+    sizer.limit(1023)
+    fragmenter = RecordFragmenter(BlockPadding(512), sizer=sizer)
+    inners = list(fragmenter.inner_plaintexts(ContentType.application_data, bytes(5000)))
+    assert b''.join(bytes(inner.content) for inner in inners) == bytes(5000)
+    # record_size_limit counts the content type octet, so 1023 allows two blocks
+    assert all(inner.length % 512 == 0 and inner.length <= 1024 for inner in inners)
+    assert inners[-1].length == 1024
+
+
+@pytest.mark.parametrize('padding, limit', [(BlockPadding(256), 63), (FixedSizePadding(1024), 1000)])
+def test_padding_that_cannot_fit_the_peer_limit_is_rejected(clock, padding, limit):
+    sizer = RecordSizer(clock=clock)
+    sizer.limit(limit)
+    fragmenter = RecordFragmenter(padding, sizer=sizer)
+    with pytest.raises(ValueError, match="record size limit"):
+        list(fragmenter.inner_plaintexts(ContentType.application_data, bytes(5000)))
+
+
+@pytest.mark.parametrize('extension, limit', [
+    (RecordSizeLimit(record_size_limit=16385), 16384),
+    (RecordSizeLimit(record_size_limit=64), 63),
+    (MaxFragmentLength(code=1), 512),
+    (MaxFragmentLength(code=4), 4096),
+])
+def test_extensions_round_trip_and_limit(extension, limit):
+    parsed, = ExtensionRegistry.parse_all(extension.to_bytes())
+    assert type(parsed) is type(extension) and parsed == extension
+    assert peer_fragment_limit([parsed]) == limit
+
+
+def test_record_size_limit_wins_over_max_fragment_length():
+    extensions = [MaxFragmentLength(code=1), RecordSizeLimit(record_size_limit=2000)]
+    assert peer_fragment_limit(extensions) == 1999
+    assert peer_fragment_limit(extensions[:1]) == 512
+    assert peer_fragment_limit([]) is None
+
+
+@pytest.mark.parametrize('make', [
+    lambda: RecordSizeLimit.parse_from_bytes(b'\x00\x3f'),
+    lambda: RecordSizeLimit.parse_from_bytes(b'\x40'),
+    lambda: MaxFragmentLength.parse_from_bytes(b'\x05'),
+    lambda: MaxFragmentLength.parse_from_bytes(b''),
+])
+def test_invalid_extensions(make):
+    with pytest.raises(ValueError):
+        make()
+
+
+def test_server_writes_sized_records():
+    def sizer() -> RecordSizer:
+        sizer = RecordSizer(small_size=1000, boost_bytes=2000, boost_after=None)
+        sizer.limit(peer_fragment_limit([MaxFragmentLength(code=3)]))
+        return sizer
+
+    async def handler(reader, writer):
+        async for record in reader:
+            writer.write(bytes(record.fragment) * 5)
+            await writer.drain()
+
+    async def main():
+        server = AsyncTCPServer(port=0, handler=handler, record_sizer=sizer)
+        await server.start()
+        reader, writer = await open_record_connection(server.host, server.port)
+        writer.write(bytes(2000))
+        await writer.drain()
+        sizes = []
+        while sum(sizes) < 10000:
+            sizes.append((await reader.read_record()).length)
+        writer.close()
+        await server.shutdown(0.5)
+        return sizes
+
+    assert asyncio.run(main()) == [1000, 1000, 2048, 2048, 2048, 1856]
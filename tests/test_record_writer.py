@@ -0,0 +1,96 @@
+import socket
+
+import pytest
+
+from python_tls_implementation.tls.instrumentation import ConnectionMetrics, Instrumentation
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSPlaintext
+from python_tls_implementation.tls.record_reader import RecordReader
+from python_tls_implementation.tls.record_writer import RecordWriter
+from python_tls_implementation.tls.wire import CiphertextRecord, PlaintextRecord
+
+
+class ShortWriteSocket:
+    """Accepts at most ``limit`` bytes per sendmsg and refuses every ``block_every``-th call."""
+
+    def __init__(self, limit: int, block_every: int = 0):
+        self.limit = limit
+        self.block_every = block_every
+        self.calls = 0
+        self.data = bytearray()
+
+    def sendmsg(self, buffers):
+        self.calls += 1
+        if self.block_every and self.calls % self.block_every == 0:
+            raise BlockingIOError
+        sent = b''.join(bytes(buffer) for buffer in buffers)[:self.limit]
+        self.data += sent
+        return len(sent)
+
+
+def queue(writer: RecordWriter, count: int = 10) -> bytes:
+    expected = b''
+    for index in range(count):
+        payload = bytes([index]) * (index * 37)
+        writer.write_record(ContentType.application_data, payload)
+        expected += TLSPlaintext(type=ContentType.application_data, fragment=payload).to_bytes()
+    return expected
+
+
+@pytest.mark.parametrize('limit', [1, 3, 5, 6, 100, 10 ** 6])
+def test_partial_writes_are_resumed(limit):
+    writer = RecordWriter()
+    expected = queue(writer)
+    sock = ShortWriteSocket(limit)
+    assert writer.flush(sock) == len(expected)
+    assert bytes(sock.data) == expected and writer.pending == 0
+
+
+def test_would_block_keeps_the_remainder_queued():
+    writer = RecordWriter()
+    writer.metrics = ConnectionMetrics(Instrumentation())
+    expected = queue(writer)
+    sock = ShortWriteSocket(7, block_every=4)
+    sent = writer.flush(sock)
+    assert sent == 21 and writer.pending == len(expected) - 21
+    while writer.pending:
+        writer.flush(sock)
+    assert bytes(sock.data) == expected
+    metrics = writer.metrics
+    assert metrics.bytes_out == len(expected) and metrics.write_calls == -(-len(expected) // 7)
+    # Every send but the last is cut short
+    assert metrics.partial_writes >= metrics.write_calls - 1
+
+
+def test_header_area_grows_without_corrupting_queued_headers():
+    writer = RecordWriter(header_slots=2)
+    expected = queue(writer, count=9)
+    sock = ShortWriteSocket(10 ** 6)
+    writer.flush(sock)
+    assert bytes(sock.data) == expected
+
+
+def test_flush_over_socketpair():
+    writer = RecordWriter()
+    reader = RecordReader(TLSCiphertext)
+    writer.write(PlaintextRecord(ContentType.handshake, fragment=b'hello'))
+    writer.write(CiphertextRecord(encrypted_record=b'c' * TLSCiphertext.MAX_FRAGMENT_LENGTH))
+    writer.write(TLSPlaintext(type=ContentType.alert, fragment=b'\x01\x00'))
+    left, right = socket.socketpair()
+    with left, right:
+        total = writer.pending
+        assert writer.flush(left) == total
+        left.close()
+        while chunk := right.recv(65536):
+            reader.feed(chunk)
+    assert [(r.opaque_type, r.length) for r in reader] == [
+        (ContentType.handshake, 5), (ContentType.application_data, TLSCiphertext.MAX_FRAGMENT_LENGTH),
+        (ContentType.alert, 2)]
+
+
+def test_oversized_payload_and_clear():
+    writer = RecordWriter()
+    with pytest.raises(ValueError):
+        writer.write_record(ContentType.application_data, bytes(TLSCiphertext.MAX_FRAGMENT_LENGTH + 1))
+    writer.write_record(ContentType.application_data, b'dropped')
+    writer.clear()
+    assert writer.pending == 0 and writer.flush(ShortWriteSocket(100)) == 0
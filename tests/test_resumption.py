@@ -0,0 +1,122 @@
+import pytest
+
+from python_tls_implementation.tls.handshake.client_hello_template import ClientHelloTemplate
+from python_tls_implementation.tls.handshake.client_messages import ClientHello
+from python_tls_implementation.tls.handshake.extensions.base import Extension, ExtensionType
+from python_tls_implementation.tls.handshake.extensions.early_data import EarlyDataIndication
+from python_tls_implementation.tls.key_schedule import KeySchedule
+from python_tls_implementation.tls.protection import CipherSuite
+from python_tls_implementation.tls.resumption import (
+    ClientSessionCache,
+    ServerTicketIssuer,
+    SessionTicket,
+    StatelessTicketCodec,
+    TicketState,
+    TicketStore,
+    build_pre_shared_key,
+    compute_binder,
+    parse_offered_psks,
+    resumption_psk,
+)
+
+SUITE = CipherSuite.TLS_AES_128_GCM_SHA256
+MASTER = bytes(range(32))
+
+
+def ticket(received_at: float = 0.0, lifetime: int = 60, name: bytes = b't') -> SessionTicket:
+    return SessionTicket(name, b'psk', SUITE, lifetime, 10, received_at)
+
+
+def test_resumption_psk_matches_key_schedule():
+    assert resumption_psk(SUITE, MASTER, b'\x01') == KeySchedule(SUITE).resumption_psk(MASTER, b'\x01')
+
+
+def test_offered_psks_round_trip():
+    identities = [(b'first', 1), (b'second', 0xffffffff)]
+    data = build_pre_shared_key(identities, 32)
+    assert parse_offered_psks(data) == (identities, [bytes(32)] * 2)
+    with pytest.raises(ValueError):
+        parse_offered_psks(data[:-1])
+
+
+def test_binder_verifies_the_truncated_hello():
+    psk = resumption_psk(SUITE, MASTER, b'\x00')
+    hello = ClientHello(random_value=bytes(32), cipher_suites=[SUITE], extensions=[
+        Extension(extension_type=ExtensionType.pre_shared_key, data=build_pre_shared_key([(b'id', 7)], 32))])
+    template = ClientHelloTemplate(hello)
+    message = template.build(bytes(32))
+    binder = compute_binder(SUITE, psk, message[:template.binders_offset])
+    template.patch_binders(message, [binder])
+    _, (received,) = parse_offered_psks(ClientHello.parse(bytes(message[4:])).extensions[0].data)
+    assert received == binder
+    assert compute_binder(SUITE, psk, message[:template.binders_offset], external=True) != binder
+
+
+def test_client_cache_hands_out_each_ticket_once(clock):
+    cache = ClientSessionCache(tickets_per_entry=2, clock=clock)
+    for name in (b'1', b'2', b'3'):
+        cache.add('host', 443, 'sni', ticket(name=name))
+    assert cache.take('host', 443, 'sni').ticket == b'3'
+    assert cache.take('host', 443, 'sni').ticket == b'2'
+    assert cache.take('host', 443, 'sni') is None
+    assert cache.take('host', 443, 'other') is None
+
+
+def test_client_cache_skips_expired_tickets(clock):
+    cache = ClientSessionCache(clock=clock)
+    cache.add('host', 443, None, ticket(lifetime=10, name=b'short'))
+    cache.add('host', 443, None, ticket(lifetime=100, name=b'long'))
+    clock.now = 50
+    assert cache.take('host', 443, None).ticket == b'long'
+    assert cache.take('host', 443, None) is None and len(cache) == 0
+
+
+def test_client_cache_reads_new_session_ticket(clock):
+    issuer = ServerTicketIssuer(max_early_data_size=1024, clock=clock)
+    message = issuer.issue(SUITE, MASTER)
+    cache = ClientSessionCache(clock=clock)
+    session = cache.add_message('host', 443, None, message, SUITE, MASTER)
+    assert session.max_early_data_size == 1024 and len(cache) == 1
+    assert EarlyDataIndication.find(message.extensions).max_early_data_size == 1024
+    assert session.obfuscated_age(1.5) == (1500 + message.ticket_age_add) & 0xFFFFFFFF
+    state = issuer.accept(message.ticket)
+    assert state.psk == session.psk and state.client_ticket_age_ms(session.obfuscated_age(1.5)) == 1500
+
+
+def test_ticket_state_round_trip():
+    state = TicketState(b'p' * 32, CipherSuite.TLS_AES_256_GCM_SHA384, 12.5, 3600, 99, 4096, 'example.com')
+    decoded = TicketState.from_bytes(state.to_bytes())
+    assert [getattr(decoded, name) for name in TicketState.__slots__] == [
+        getattr(state, name) for name in TicketState.__slots__]
+
+
+def test_stateless_codec_rotation():
+    codec = StatelessTicketCodec(max_keys=2)
+    state = TicketState(b'psk', SUITE, 0.0, 60, 1)
+    first = codec.seal(state)
+    codec.rotate()
+    assert codec.open(first).psk == b'psk'
+    codec.rotate()
+    assert codec.open(first) is None
+    second = codec.seal(state)
+    assert codec.open(second[:-1] + bytes((second[-1] ^ 1,))) is None
+
+
+def test_ticket_store_tickets_are_single_use(clock):
+    store = TicketStore(clock=clock)
+    identity = store.seal(TicketState(b'psk', SUITE, 0.0, 60, 1))
+    assert store.open(identity).psk == b'psk'
+    assert store.open(identity) is None
+
+
+def test_issuer_rejects_mismatched_tickets(clock):
+    issuer = ServerTicketIssuer(TicketStore(clock=clock), lifetime=60, clock=clock)
+    assert issuer.accept(issuer.issue(SUITE, MASTER, 'a.example').ticket, server_name='b.example') is None
+    assert issuer.accept(issuer.issue(SUITE, MASTER).ticket, CipherSuite.TLS_AES_256_GCM_SHA384) is None
+    expired = issuer.issue(SUITE, MASTER).ticket
+    clock.now = 60
+    assert issuer.accept(expired) is None
+    assert issuer.accept(issuer.issue(SUITE, MASTER).ticket, CipherSuite.TLS_CHACHA20_POLY1305_SHA256) is not None
+    assert issuer.stats() == {'issued': 4, 'hits': 1, 'misses': 3}
+    with pytest.raises(ValueError):
+        ServerTicketIssuer(lifetime=0)
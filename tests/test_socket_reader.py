@@ -0,0 +1,94 @@
+import socket
+import threading
+
+import pytest
+
+from python_tls_implementation.tcp.socket_reader import BufferedSocketReader
+from python_tls_implementation.tls.record import ContentType, TLSCiphertext, TLSPlaintext
+from python_tls_implementation.tls.wire import CiphertextRecord
+
+
+@pytest.fixture
+def pair():
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+def send_later(sock: socket.socket, chunks: list[bytes]) -> threading.Thread:
+    def run():
+        for chunk in chunks:
+            sock.sendall(chunk)
+        sock.shutdown(socket.SHUT_WR)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_one_recv_per_record(pair):
+    left, right = pair
+    records = [TLSPlaintext(type=ContentType.application_data, fragment=bytes([n]) * 4000) for n in range(5)]
+    left.sendall(b''.join(record.to_bytes() for record in records))
+    left.shutdown(socket.SHUT_WR)
+    reader = BufferedSocketReader(right)
+    assert [bytes(reader.read_record().fragment) for _ in records] == [record.fragment for record in records]
+    assert reader.read_record() is None and reader.at_eof
+    assert reader.read_calls == 2
+
+
+def test_records_split_across_sends(pair):
+    left, right = pair
+    data = TLSPlaintext(type=ContentType.handshake, fragment=b'h' * TLSPlaintext.MAX_FRAGMENT_LENGTH).to_bytes()
+    thread = send_later(left, [data[index:index + 1000] for index in range(0, len(data), 1000)] + [data[:3]])
+    reader = BufferedSocketReader(right, read_size=512)
+    record = reader.read_record()
+    assert record.type is ContentType.handshake and record.length == TLSPlaintext.MAX_FRAGMENT_LENGTH
+    with pytest.raises(EOFError, match='record header'):
+        reader.read_record()
+    thread.join()
+
+
+def test_exact_some_and_peek(pair):
+    left, right = pair
+    left.sendall(b'0123456789')
+    left.shutdown(socket.SHUT_WR)
+    reader = BufferedSocketReader(right)
+    assert bytes(reader.peek(3)) == b'012' and reader.buffered == 10
+    assert bytes(reader.read_exact(4)) == b'0123'
+    assert bytes(reader.read_some(2)) == b'45'
+    assert bytes(reader.read_some()) == b'6789'
+    assert bytes(reader.read_some()) == b'' and reader.at_eof
+    with pytest.raises(EOFError):
+        reader.read_exact(1)
+
+
+def test_views_stay_valid_when_the_buffer_grows(pair):
+    left, right = pair
+    thread = send_later(left, [b'a' * 100, b'b' * 200_000])
+    reader = BufferedSocketReader(right, read_size=64)
+    first = reader.read_exact(50)
+    second = reader.read_exact(150_000)
+    assert bytes(first) == b'a' * 50 and bytes(second[-10:]) == b'b' * 10
+    thread.join()
+
+
+def test_ciphertext_records_and_limits(pair):
+    left, right = pair
+    left.sendall(CiphertextRecord(encrypted_record=b'c' * TLSCiphertext.MAX_FRAGMENT_LENGTH).to_bytes())
+    left.sendall(b'\x17\x03\x03\xff\xff')
+    reader = BufferedSocketReader(right, record_type=TLSCiphertext)
+    assert reader.read_record().length == TLSCiphertext.MAX_FRAGMENT_LENGTH
+    with pytest.raises(ValueError, match='exceeds'):
+        reader.read_record()
+    with pytest.raises(ValueError):
+        BufferedSocketReader(right, read_size=0)
+
+
+def test_eof_inside_a_record(pair):
+    left, right = pair
+    left.sendall(TLSPlaintext(type=ContentType.alert, fragment=b'\x01\x00').to_bytes()[:6])
+    left.shutdown(socket.SHUT_WR)
+    with pytest.raises(EOFError, match='middle of a 2 byte record'):
+        BufferedSocketReader(right).read_record()
@@ -0,0 +1,71 @@
+import pytest
+
+from python_tls_implementation.tls.handshake.messages import HandshakeType
+from python_tls_implementation.tls.handshake.server_messages import NewSessionTicket
+from python_tls_implementation.tls.handshake.wire import HandshakeFrame
+from python_tls_implementation.tls.record import (
+    ContentType,
+    ProtocolVersion,
+    TLSCiphertext,
+    TLSInnerPlaintext,
+    TLSPlaintext,
+)
+from python_tls_implementation.tls.wire import WIRE_TYPES, CiphertextRecord, InnerPlaintext, PlaintextRecord
+
+
+def test_plaintext_record_matches_model():
+    model = TLSPlaintext(type=ContentType.handshake, legacy_record_version=ProtocolVersion.TLS_1_0, fragment=b'abc')
+    record = PlaintextRecord.from_model(model)
+    assert record.to_bytes() == model.to_bytes()
+    assert record.to_model() == model
+    assert record.length == 3
+
+
+def test_ciphertext_record_matches_model():
+    model = TLSCiphertext(opaque_type=ContentType.application_data, encrypted_record=b'\x01' * 40)
+    record = CiphertextRecord.from_model(model)
+    assert record.to_bytes() == model.to_bytes()
+    assert record.to_model() == model
+
+
+def test_records_accept_memoryview_fragments():
+    data = memoryview(b'--payload--')[2:9]
+    record = PlaintextRecord(ContentType.application_data, fragment=data)
+    assert record.to_bytes() == TLSPlaintext(type=ContentType.application_data, fragment=b'payload').to_bytes()
+    assert isinstance(record.to_model().fragment, bytes)
+
+
+def test_wire_types_table():
+    assert WIRE_TYPES[TLSPlaintext] is PlaintextRecord and WIRE_TYPES[CiphertextRecord] is CiphertextRecord
+
+
+@pytest.mark.parametrize('padding', [0, 1, 300, 20000])
+def test_inner_plaintext_round_trip(padding):
+    model = TLSInnerPlaintext(content=b'data\x00', type=ContentType.application_data, zeros_padding_length=padding)
+    inner = InnerPlaintext.from_bytes(model.to_bytes())
+    assert bytes(inner.content) == b'data\x00'
+    assert inner.type is ContentType.application_data and inner.zeros_padding_length == padding
+    assert inner.to_bytes() == model.to_bytes() and inner.to_model() == model
+    assert inner.length == len(model.to_bytes())
+
+
+@pytest.mark.parametrize('data', [b'', b'\x00' * 10, b'abc\xff\x00'])
+def test_inner_plaintext_rejects_missing_or_unknown_type(data):
+    with pytest.raises(ValueError):
+        InnerPlaintext.from_bytes(data)
+
+
+def test_handshake_frame_round_trip():
+    ticket = NewSessionTicket(ticket_lifetime=3600, ticket_age_add=7, ticket_nonce=b'\x00', ticket=b'ticket')
+    frame = HandshakeFrame.from_message(ticket)
+    data = frame.to_bytes() + b'next'
+    parsed, rest = HandshakeFrame.from_bytes(memoryview(data))
+    assert parsed.msg_type is HandshakeType.new_session_ticket and parsed.length == len(ticket._body_bytes())
+    assert bytes(rest) == b'next'
+    assert parsed.to_message() == ticket
+
+
+@pytest.mark.parametrize('data', [b'\x04\x00', b'\x04\x00\x00\x09short', b'\xee\x00\x00\x00'])
+def test_handshake_frame_rejects_bad_input(data):
+    with pytest.raises(ValueError):
+        HandshakeFrame.from_bytes(data)
@@ -0,0 +1,67 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from python_tls_implementation.tcp.workers import PreforkServer
+from python_tls_implementation.tls.record import ContentType, TLSPlaintext
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'SO_REUSEPORT'), reason="needs SO_REUSEPORT")
+
+
+@pytest.fixture
+def port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def connect(port: int, timeout: float = 5.0) -> socket.socket:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection(('127.0.0.1', port), timeout=timeout)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def echo(port: int) -> bytes:
+    data = TLSPlaintext(type=ContentType.application_data, fragment=b'ping').to_bytes()
+    with connect(port) as client:
+        client.sendall(data)
+        return client.recv(len(data), socket.MSG_WAITALL)
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_workers_serve_publish_stats_and_restart(port):
+    server = PreforkServer(port=port, workers=2, shutdown_timeout=1.0)
+    server.RESTART_BACKOFF = 0.0
+    server.start()
+    supervisor = threading.Thread(target=server.supervise, kwargs={'poll_interval': 0.05})
+    supervisor.start()
+    try:
+        assert echo(port).endswith(b'ping')
+        assert wait_for(lambda: sum(worker['accepted'] for worker in server.stats()) == 1)
+        assert {worker['pid'] for worker in server.stats()} == {process.pid for process in server._processes}
+
+        killed = server._processes[0]
+        killed.kill()
+        assert wait_for(lambda: server.restarts == 1)
+        assert server._processes[0].pid != killed.pid
+        assert echo(port).endswith(b'ping')
+    finally:
+        server._stopping = True
+        supervisor.join()
+        server.stop()
+    assert server._processes == [None, None]